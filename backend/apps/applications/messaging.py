@@ -0,0 +1,603 @@
+"""
+Single write/read path for application chat messages.
+
+TicketMessage is the only message store: REST (/api/applications/{id}/messages/,
+/api/chat/) and the WebSocket consumer all go through
+post_messages(), which in one transaction
+
+- inserts the message(s) (bulk INSERT for batches, post_save still sent
+  per message so chat notifications fire once per message),
+- updates the application's ChatThread summary,
+
+and after commit broadcasts once: a single chat_messages event to the
+WebSocket room and, for non-admin senders, a single admin inbox event.
+
+The admin inbox (admin_chat_threads()) reads ChatThread rows plus one
+grouped unread count instead of aggregating the whole message table.
+
+Read state is a watermark per (user, application) in ChatReadState, plus a
+shared admin inbox watermark on ChatThread. Watermarks are (created_at, id)
+positions, not bare ids: merged legacy messages get new, higher ids but keep
+their original time. Marking a thread read is one upsert, unread counts are
+range counts over (application, created_at) and is_read for a message is
+derived from the watermarks (ReadMarkers).
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, router, transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .models import Application, ChatReadState, ChatThread, TicketMessage
+
+logger = logging.getLogger(__name__)
+
+ADMIN_INBOX_GROUP = 'admin_chat_threads'
+ADMIN_ROLE = 'admin'
+
+
+def is_admin_reader(user) -> bool:
+    return user.role == ADMIN_ROLE or user.is_superuser or user.is_staff
+
+
+def room_group_name(application_id) -> str:
+    return f'chat_{application_id}'
+
+
+def sender_display_name(user) -> str:
+    if user is None:
+        return 'Удалённый пользователь'
+    full_name = f"{user.first_name or ''} {user.last_name or ''}".strip()
+    return full_name or user.email
+
+
+def message_preview(message: TicketMessage) -> str:
+    return message.content[:100] if message.content else '[Файл]'
+
+
+def message_event(message: TicketMessage) -> dict:
+    """WebSocket payload for one message (see ApplicationChatConsumer.chat_message)."""
+    sender = message.sender
+    return {
+        'message_id': message.id,
+        'sender_id': message.sender_id,
+        'sender_email': sender.email if sender else None,
+        'sender_name': sender_display_name(sender) if sender else None,
+        'sender_role': sender.role if sender else None,
+        'text': message.content,
+        'file_url': message.file.url if message.file else None,
+        'created_at': message.created_at.isoformat(),
+    }
+
+
+def _update_thread(application_id: int, messages: list[TicketMessage], sender_role: str) -> None:
+    thread, _ = ChatThread.objects.select_for_update().get_or_create(application_id=application_id)
+    last = messages[-1]
+    thread.last_message = last
+    thread.last_message_at = last.created_at
+    thread.last_sender_role = sender_role
+    update_fields = ['last_message', 'last_message_at', 'last_sender_role', 'message_count']
+    if sender_role != ADMIN_ROLE:
+        thread.last_client_message = last
+        update_fields.append('last_client_message')
+    thread.message_count = F('message_count') + len(messages)
+    thread.save(update_fields=update_fields)
+
+
+def _send_post_save(application_id: int, messages: list[TicketMessage]) -> None:
+    if not post_save.has_listeners(TicketMessage):
+        return
+    # One application fetch for the batch instead of one per receiver call
+    application = Application.objects.select_related(
+        'company', 'company__owner', 'assigned_partner', 'created_by'
+    ).get(id=application_id)
+    using = router.db_for_write(TicketMessage)
+    for message in messages:
+        message.application = application
+        post_save.send(
+            sender=TicketMessage, instance=message, created=True,
+            update_fields=None, raw=False, using=using,
+        )
+
+
+def broadcast_messages(application_id: int, messages: list[TicketMessage], sender_role: str) -> None:
+    """One room event for the batch, plus one admin inbox event for non-admin senders."""
+    try:
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        async_to_sync(channel_layer.group_send)(
+            room_group_name(application_id),
+            {'type': 'chat_messages', 'messages': [message_event(message) for message in messages]},
+        )
+        if sender_role != ADMIN_ROLE:
+            company_name = (
+                Application.objects.filter(pk=application_id).values_list('company__name', flat=True).first()
+                or f'Заявка #{application_id}'
+            )
+            last = messages[-1]
+            async_to_sync(channel_layer.group_send)(
+                ADMIN_INBOX_GROUP,
+                {
+                    'type': 'new_message_notification',
+                    'application_id': application_id,
+                    'company_name': company_name,
+                    'sender_name': sender_display_name(last.sender) if last.sender else '',
+                    'preview': message_preview(last),
+                },
+            )
+    except Exception as exc:
+        # Never fail the write because of the channel layer
+        logger.warning("Chat %s: broadcast failed: %s", application_id, exc)
+
+
+def post_messages(application_id: int, sender, items: list[dict]) -> list[TicketMessage]:
+    """
+    Persist messages from one sender. `items` are TicketMessage field dicts
+    (content, file, is_bank_message). Returns the saved messages.
+    """
+    if not items:
+        return []
+    messages = [TicketMessage(application_id=application_id, sender=sender, **item) for item in items]
+    sender_role = sender.role if sender is not None else ''
+
+    with transaction.atomic():
+        if len(messages) == 1:
+            messages[0].save()
+        else:
+            TicketMessage.objects.bulk_create(messages)
+            _send_post_save(application_id, messages)
+        _update_thread(application_id, messages, sender_role)
+        transaction.on_commit(lambda: broadcast_messages(application_id, messages, sender_role))
+    return messages
+
+
+def post_message(application_id: int, sender, content: str = '', file=None, is_bank_message: bool = False) -> TicketMessage:
+    return post_messages(
+        application_id, sender, [{'content': content, 'file': file, 'is_bank_message': is_bank_message}],
+    )[0]
+
+
+def notify_admin_inbox_changed(application_id: int) -> None:
+    """Ask admin inbox clients to refresh (e.g. after messages were read)."""
+    try:
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        async_to_sync(channel_layer.group_send)(
+            ADMIN_INBOX_GROUP,
+            {
+                'type': 'new_message_notification',
+                'application_id': int(application_id),
+                'company_name': '',
+                'sender_name': '',
+                'preview': '',
+            },
+        )
+    except Exception as exc:
+        logger.warning("Failed to broadcast to %s: %s", ADMIN_INBOX_GROUP, exc)
+
+
+def message_position(message: TicketMessage) -> tuple:
+    """Chat order key: (created_at, id). Ids alone are not chronological (merged legacy rows)."""
+    return (message.created_at, message.id)
+
+
+def after_position(position, prefix: str = '') -> Q:
+    """Messages strictly after a (created_at, id) watermark; everything when position is None."""
+    if position is None:
+        return Q()
+    created_at, message_id = position
+    return Q(**{f'{prefix}created_at__gt': created_at}) | Q(
+        **{f'{prefix}created_at': created_at, f'{prefix}id__gt': message_id}
+    )
+
+
+def _later(first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return max(first, second)
+
+
+def advance_watermark(user_id: int, application_id: int, position, read_at) -> None:
+    """Move the (user, application) watermark forward to `position`; never backwards."""
+    created_at, message_id = position
+    if connection.vendor in ('postgresql', 'sqlite'):
+        qn = connection.ops.quote_name
+        opts = ChatReadState._meta
+        table = qn(opts.db_table)
+        user_col = qn(opts.get_field('user').column)
+        application_col = qn(opts.get_field('application').column)
+        at_field = opts.get_field('last_read_message_at')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({user_col}, {application_col}, last_read_message_at, '
+                f'last_read_message_id, last_read_at) VALUES (%s, %s, %s, %s, %s) '
+                f'ON CONFLICT ({user_col}, {application_col}) DO UPDATE SET '
+                f'last_read_message_at = EXCLUDED.last_read_message_at, '
+                f'last_read_message_id = EXCLUDED.last_read_message_id, last_read_at = EXCLUDED.last_read_at '
+                f'WHERE {table}.last_read_message_at IS NULL OR '
+                f'({table}.last_read_message_at, {table}.last_read_message_id) '
+                f'< (EXCLUDED.last_read_message_at, EXCLUDED.last_read_message_id)',
+                [user_id, application_id,
+                 at_field.get_db_prep_value(created_at, connection), message_id,
+                 opts.get_field('last_read_at').get_db_prep_value(read_at, connection)],
+            )
+        return
+
+    behind = Q(last_read_message_at__isnull=True) | Q(last_read_message_at__lt=created_at) | Q(
+        last_read_message_at=created_at, last_read_message_id__lt=message_id,
+    )
+    updated = ChatReadState.objects.filter(behind, user_id=user_id, application_id=application_id).update(
+        last_read_message_at=created_at, last_read_message_id=message_id, last_read_at=read_at,
+    )
+    if not updated:
+        ChatReadState.objects.get_or_create(
+            user_id=user_id, application_id=application_id,
+            defaults={'last_read_message_at': created_at, 'last_read_message_id': message_id, 'last_read_at': read_at},
+        )
+
+
+def advance_admin_watermark(application_id: int, position) -> None:
+    """Move the shared admin inbox watermark forward to `position`."""
+    created_at, message_id = position
+    ChatThread.objects.filter(
+        Q(admin_read_message_at__isnull=True)
+        | Q(admin_read_message_at__lt=created_at)
+        | Q(admin_read_message_at=created_at, admin_read_message_id__lt=message_id),
+        application_id=application_id,
+    ).update(admin_read_message_at=created_at, admin_read_message_id=message_id)
+
+
+def read_watermark(user, application_id: int):
+    """The user's (created_at, id) watermark in the application, None if nothing is read."""
+    row = ChatReadState.objects.filter(
+        user=user, application_id=application_id, last_read_message_at__isnull=False,
+    ).values_list('last_read_message_at', 'last_read_message_id').first()
+    return tuple(row) if row else None
+
+
+def mark_thread_read(user, application_id: int, up_to_message_id: int | None = None) -> int:
+    """
+    Mark messages of the application read for `user` up to up_to_message_id
+    (the latest message if None). Returns how many messages from other
+    senders became read.
+    """
+    messages = TicketMessage.objects.filter(application_id=application_id)
+    if up_to_message_id is not None:
+        target = messages.filter(id=up_to_message_id)
+    else:
+        target = messages.order_by('-created_at', '-id')
+    target = target.values_list('created_at', 'id').first()
+    if target is None:
+        return 0
+    target = tuple(target)
+    watermark = read_watermark(user, application_id)
+    if watermark is not None and target <= watermark:
+        return 0
+
+    newly_read = (
+        messages.filter(after_position(watermark))
+        .exclude(after_position(target))
+        .filter(~Q(sender_id=user.id))
+        .count()
+    )
+    advance_watermark(user.id, application_id, target, timezone.now())
+    if is_admin_reader(user):
+        advance_admin_watermark(application_id, target)
+    return newly_read
+
+
+def unread_count(user, application_id: int) -> int:
+    """Messages from other senders after the user's watermark (range count)."""
+    return (
+        TicketMessage.objects
+        .filter(after_position(read_watermark(user, application_id)), application_id=application_id)
+        .exclude(sender=user)
+        .count()
+    )
+
+
+def admin_unread_counts(application_ids) -> dict[int, int]:
+    """Non-admin messages after the shared admin watermark, per application."""
+    thread = 'application__chat_thread__'
+    return dict(
+        TicketMessage.objects
+        .filter(application_id__in=application_ids)
+        .filter(
+            Q(**{f'{thread}admin_read_message_at__isnull': True})
+            | Q(created_at__gt=F(f'{thread}admin_read_message_at'))
+            | Q(created_at=F(f'{thread}admin_read_message_at'), id__gt=F(f'{thread}admin_read_message_id'))
+        )
+        .exclude(sender__role=ADMIN_ROLE)
+        .values('application_id')
+        .annotate(count=Count('id'))
+        .values_list('application_id', 'count')
+    )
+
+
+class ReadMarkers:
+    """
+    is_read for messages as seen by one user: another sender's message is
+    read when it is not after the user's watermark (or the admin inbox
+    watermark for admins); the user's own message is read once any other
+    participant's watermark passed it. Watermarks are (created_at, id)
+    positions, loaded per application with two queries.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._marks: dict[int, tuple] = {}
+
+    def prime(self, application_ids) -> None:
+        missing = {int(app_id) for app_id in application_ids} - set(self._marks)
+        if not missing:
+            return
+        mine = {app_id: None for app_id in missing}
+        others = dict(mine)
+        rows = ChatReadState.objects.filter(
+            application_id__in=missing, last_read_message_at__isnull=False,
+        ).values_list('application_id', 'user_id', 'last_read_message_at', 'last_read_message_id')
+        for application_id, user_id, read_at, read_id in rows:
+            if user_id == self.user.id:
+                mine[application_id] = _later(mine[application_id], (read_at, read_id))
+            else:
+                others[application_id] = _later(others[application_id], (read_at, read_id))
+        if is_admin_reader(self.user):
+            team = ChatThread.objects.filter(
+                application_id__in=missing, admin_read_message_at__isnull=False,
+            ).values_list('application_id', 'admin_read_message_at', 'admin_read_message_id')
+            for application_id, read_at, read_id in team:
+                mine[application_id] = _later(mine[application_id], (read_at, read_id))
+        for app_id in missing:
+            self._marks[app_id] = (mine[app_id], others[app_id])
+
+    def watermarks(self, application_id: int) -> tuple:
+        """(user's own watermark, latest watermark of the other participants); None = nothing read."""
+        self.prime([application_id])
+        return self._marks[int(application_id)]
+
+    def is_read(self, message: TicketMessage) -> bool:
+        return self.is_read_at(message.application_id, message.sender_id, message_position(message))
+
+    def is_read_at(self, application_id: int, sender_id, position) -> bool:
+        mine, others = self.watermarks(application_id)
+        watermark = others if self.user.id is not None and sender_id == self.user.id else mine
+        return watermark is not None and position <= watermark
+
+
+def parse_history_params(params) -> dict:
+    """
+    before / after / since message-id cursors (at most one) and limit from
+    query params. Raises ValueError with a user-facing message.
+    """
+    cursors = {}
+    for name in ('before', 'after', 'since'):
+        value = params.get(name)
+        if value in (None, ''):
+            continue
+        try:
+            cursors[name] = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'Параметр {name} должен быть ID сообщения')
+    if len(cursors) > 1:
+        raise ValueError('Укажите только один из параметров before, after или since')
+
+    max_limit = max(1, int(getattr(settings, 'CHAT_HISTORY_MAX_PAGE_SIZE', 200)))
+    limit = params.get('limit')
+    if limit in (None, ''):
+        limit = max_limit if 'since' in cursors else int(getattr(settings, 'CHAT_HISTORY_PAGE_SIZE', 50))
+    else:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError('Параметр limit должен быть числом')
+    return {**cursors, 'limit': max(1, min(limit, max_limit))}
+
+
+def chat_history(queryset, user, application_id: int, *, before=None, after=None, since=None,
+                 limit: int = 50, url_base: str = '') -> dict:
+    """
+    Compact message history for one application.
+
+    - no cursor: the latest `limit` messages
+    - before=<id>: the `limit` messages preceding it (scroll back)
+    - after=<id> / since=<id>: messages following it; `since` is the
+      reconnect gap fill and defaults to the largest page
+
+    Cursors are message ids; pages follow the chat order (created_at, id),
+    so merged legacy messages land where they belong in time.
+    Messages are returned in ascending order with sender ids only; sender
+    details come once per response in `senders`. `queryset` must already be
+    restricted to what the user may see.
+    """
+    messages = queryset.filter(application_id=application_id)
+    forward = after is not None or since is not None
+    cursor = (after if after is not None else since) if forward else before
+    if cursor is not None:
+        anchor = TicketMessage.objects.filter(
+            application_id=application_id, id=cursor,
+        ).values_list('created_at', 'id').first()
+        if anchor is None:
+            # Deleted message: fall back to the id order
+            boundary = Q(id__gt=cursor) if forward else Q(id__lt=cursor)
+        else:
+            boundary = after_position(tuple(anchor))
+            if not forward:
+                boundary = ~boundary & ~Q(id=cursor)
+        messages = messages.filter(boundary)
+    messages = messages.order_by('created_at', 'id') if forward else messages.order_by('-created_at', '-id')
+    rows = list(
+        messages.values('id', 'sender_id', 'content', 'file', 'is_bank_message', 'created_at')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not forward:
+        rows.reverse()
+
+    markers = ReadMarkers(user)
+    storage = TicketMessage._meta.get_field('file').storage
+    sender_ids = {row['sender_id'] for row in rows if row['sender_id'] is not None}
+    User = get_user_model()
+    senders = {
+        str(sender['id']): {
+            'email': sender['email'],
+            'name': f"{sender['first_name'] or ''} {sender['last_name'] or ''}".strip() or sender['email'],
+            'role': sender['role'],
+        }
+        for sender in User.objects.filter(id__in=sender_ids).values('id', 'email', 'first_name', 'last_name', 'role')
+    }
+
+    result = []
+    for row in rows:
+        file_url = None
+        if row['file']:
+            file_url = storage.url(row['file'])
+            if file_url.startswith('/'):
+                file_url = url_base + file_url
+        result.append({
+            'id': row['id'],
+            'sender_id': row['sender_id'],
+            'content': row['content'],
+            'file_url': file_url,
+            'is_bank_message': row['is_bank_message'],
+            'is_read': markers.is_read_at(application_id, row['sender_id'], (row['created_at'], row['id'])),
+            'created_at': row['created_at'],
+        })
+
+    mine, others = markers.watermarks(application_id)
+    return {
+        'messages': result,
+        'senders': senders,
+        'has_more': has_more,
+        'read_state': {
+            'last_read_message_id': mine[1] if mine else 0,
+            'others_read_message_id': others[1] if others else 0,
+        },
+    }
+
+
+def _agent_for(application: Application):
+    created_by = application.created_by
+    if created_by and created_by.role == 'agent':
+        return created_by
+    if created_by and created_by.role == 'client':
+        invited_by = getattr(created_by, 'invited_by', None)
+        if invited_by and invited_by.role == 'agent':
+            return invited_by
+    return None
+
+
+def admin_chat_threads() -> list[dict]:
+    """
+    Threads needing admin attention: unread messages from non-admins, or the
+    last message is not from an admin. Newest activity first.
+    """
+    threads = (
+        ChatThread.objects
+        .filter(last_client_message__isnull=False)
+        .filter(
+            # unread client messages
+            Q(admin_read_message_at__isnull=True)
+            | Q(last_client_message__created_at__gt=F('admin_read_message_at'))
+            | Q(
+                last_client_message__created_at=F('admin_read_message_at'),
+                last_client_message_id__gt=F('admin_read_message_id'),
+            )
+            | ~Q(last_sender_role=ADMIN_ROLE)
+        )
+        .select_related(
+            'application__company',
+            'application__created_by__invited_by',
+            'last_client_message__sender',
+        )
+        .order_by('-last_message_at')
+    )
+    threads = list(threads)
+    unread = admin_unread_counts([thread.application_id for thread in threads])
+
+    result = []
+    for thread in threads:
+        application = thread.application
+        last_msg = thread.last_client_message
+        agent = _agent_for(application)
+        result.append({
+            'application_id': thread.application_id,
+            'company_name': application.company.name if application.company else f'Заявка #{thread.application_id}',
+            'last_sender_email': last_msg.sender.email if last_msg.sender else None,
+            'last_sender_name': sender_display_name(last_msg.sender),
+            'last_message_preview': message_preview(last_msg),
+            'unread_count': unread.get(thread.application_id, 0),
+            'admin_replied': thread.last_sender_role == ADMIN_ROLE,
+            'last_message_at': thread.last_message_at,
+            'agent_name': sender_display_name(agent) if agent else None,
+            'agent_email': agent.email if agent else None,
+            'agent_phone': agent.phone if agent else None,
+        })
+    return result
+
+
+def rebuild_thread_summaries(application_ids) -> int:
+    """Recompute ChatThread rows from the messages (backfill / repair)."""
+    rebuilt = 0
+    for application_id in application_ids:
+        messages = TicketMessage.objects.filter(application_id=application_id).select_related('sender')
+        last = messages.order_by('-created_at', '-id').first()
+        if last is None:
+            ChatThread.objects.filter(application_id=application_id).delete()
+            continue
+        last_client = (
+            messages.exclude(sender__role=ADMIN_ROLE).order_by('-created_at', '-id').first()
+        )
+        ChatThread.objects.update_or_create(
+            application_id=application_id,
+            defaults={
+                'last_message': last,
+                'last_message_at': last.created_at,
+                'last_sender_role': last.sender.role if last.sender else '',
+                'last_client_message': last_client,
+                'message_count': messages.count(),
+            },
+        )
+        rebuilt += 1
+    return rebuilt
+
+
+def advance_legacy_watermarks(application_ids) -> int:
+    """
+    Carry the read flags of merged legacy chat messages into the watermarks:
+    a read non-admin message advances the admin inbox watermark, a read
+    message from anyone else advances the application creator's. Watermarks
+    only move forward. Returns how many watermarks were advanced.
+    """
+    advanced = 0
+    for application_id in application_ids:
+        read = TicketMessage.objects.filter(
+            application_id=application_id, legacy_chat_message_id__isnull=False, is_read=True,
+        ).order_by('-created_at', '-id')
+        latest_client = read.exclude(sender__role=ADMIN_ROLE).values_list('created_at', 'id').first()
+        if latest_client is not None:
+            advance_admin_watermark(application_id, tuple(latest_client))
+            advanced += 1
+        creator_id = Application.objects.filter(pk=application_id).values_list('created_by_id', flat=True).first()
+        if creator_id is None:
+            continue
+        latest_incoming = read.exclude(sender_id=creator_id).values_list('created_at', 'id').first()
+        if latest_incoming is not None:
+            advance_watermark(creator_id, application_id, tuple(latest_incoming), timezone.now())
+            advanced += 1
+    return advanced
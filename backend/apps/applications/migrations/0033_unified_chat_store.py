@@ -0,0 +1,90 @@
+# Generated by Django 5.0.4 on 2026-10-19 02:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_chat_threads(apps, schema_editor):
+    """ChatThread summaries for existing TicketMessage conversations."""
+    TicketMessage = apps.get_model('applications', 'TicketMessage')
+    ChatThread = apps.get_model('applications', 'ChatThread')
+    application_ids = TicketMessage.objects.values_list('application_id', flat=True).distinct()
+    for application_id in application_ids.iterator():
+        messages = TicketMessage.objects.filter(application_id=application_id)
+        last = messages.select_related('sender').order_by('-created_at', '-id').first()
+        ChatThread.objects.update_or_create(
+            application_id=application_id,
+            defaults={
+                'last_message': last,
+                'last_message_at': last.created_at,
+                'last_sender_role': last.sender.role if last.sender else '',
+                'last_client_message': (
+                    messages.exclude(sender__role='admin').order_by('-created_at', '-id').first()
+                ),
+                'message_count': messages.count(),
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0032_admin_table_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatThread',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='chat_thread', serialize=False, to='applications.application', verbose_name='Заявка')),
+                ('last_message_at', models.DateTimeField(blank=True, null=True, verbose_name='Время последнего сообщения')),
+                ('last_sender_role', models.CharField(blank=True, default='', max_length=20, verbose_name='Роль последнего отправителя')),
+                ('message_count', models.PositiveIntegerField(default=0, verbose_name='Количество сообщений')),
+            ],
+            options={
+                'verbose_name': 'Чат заявки',
+                'verbose_name_plural': 'Чаты заявок',
+            },
+        ),
+        migrations.AddField(
+            model_name='ticketmessage',
+            name='is_moderated',
+            field=models.BooleanField(default=False, verbose_name='Модерировано'),
+        ),
+        migrations.AddField(
+            model_name='ticketmessage',
+            name='legacy_chat_message_id',
+            field=models.BigIntegerField(blank=True, editable=False, null=True, unique=True, verbose_name='ID в старом чате'),
+        ),
+        migrations.AddField(
+            model_name='ticketmessage',
+            name='moderated_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата модерации'),
+        ),
+        migrations.AddField(
+            model_name='ticketmessage',
+            name='moderated_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='moderated_ticket_messages', to=settings.AUTH_USER_MODEL, verbose_name='Модератор'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketmessage',
+            index=models.Index(fields=['application', 'created_at'], name='ticket_msg_app_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='chatthread',
+            name='last_client_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='applications.ticketmessage', verbose_name='Последнее сообщение клиента'),
+        ),
+        migrations.AddField(
+            model_name='chatthread',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='applications.ticketmessage', verbose_name='Последнее сообщение'),
+        ),
+        migrations.AddIndex(
+            model_name='chatthread',
+            index=models.Index(fields=['last_sender_role', 'last_message_at'], name='chat_thread_role_last_idx'),
+        ),
+        migrations.RunPython(backfill_chat_threads, migrations.RunPython.noop),
+    ]
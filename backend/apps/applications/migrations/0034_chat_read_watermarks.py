@@ -0,0 +1,85 @@
+# Generated by Django 5.0.4 on 2026-10-19 03:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def backfill_watermarks(apps, schema_editor):
+    """Watermarks from the legacy TicketMessage.is_read / read_by flags."""
+    TicketMessage = apps.get_model('applications', 'TicketMessage')
+    ChatThread = apps.get_model('applications', 'ChatThread')
+    ChatReadState = apps.get_model('applications', 'ChatReadState')
+
+    read = TicketMessage.objects.filter(is_read=True)
+    states = [
+        ChatReadState(
+            user_id=row['read_by'],
+            application_id=row['application'],
+            last_read_message_id=row['last_id'],
+            last_read_at=row['last_at'],
+        )
+        for row in (
+            read.filter(read_by__isnull=False)
+            .values('read_by', 'application')
+            .annotate(last_id=Max('id'), last_at=Max('read_at'))
+        )
+    ]
+    ChatReadState.objects.bulk_create(states, batch_size=1000, ignore_conflicts=True)
+
+    admin_read = (
+        read.exclude(sender__role='admin')
+        .values('application')
+        .annotate(last_id=Max('id'))
+        .values_list('application', 'last_id')
+    )
+    for application_id, last_id in admin_read:
+        ChatThread.objects.filter(application_id=application_id).update(admin_read_message_id=last_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0033_unified_chat_store'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatReadState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_message_id', models.PositiveBigIntegerField(default=0, verbose_name='Последнее прочитанное сообщение')),
+                ('last_read_at', models.DateTimeField(blank=True, null=True, verbose_name='Время прочтения')),
+            ],
+            options={
+                'verbose_name': 'Прочтение чата',
+                'verbose_name_plural': 'Прочтения чатов',
+            },
+        ),
+        migrations.AddField(
+            model_name='chatthread',
+            name='admin_read_message_id',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='Прочитано администратором до ID'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketmessage',
+            index=models.Index(fields=['application', 'id'], name='ticket_msg_app_id_idx'),
+        ),
+        migrations.AddField(
+            model_name='chatreadstate',
+            name='application',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_read_states', to='applications.application', verbose_name='Заявка'),
+        ),
+        migrations.AddField(
+            model_name='chatreadstate',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_read_states', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='chatreadstate',
+            unique_together={('user', 'application')},
+        ),
+        migrations.RunPython(backfill_watermarks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.4 on 2026-10-19 03:34
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_positions(apps, schema_editor):
+    """(created_at, id) of the latest message at or below each id watermark."""
+    TicketMessage = apps.get_model('applications', 'TicketMessage')
+    ChatThread = apps.get_model('applications', 'ChatThread')
+    ChatReadState = apps.get_model('applications', 'ChatReadState')
+
+    def watermark_message(id_field):
+        return TicketMessage.objects.filter(
+            application_id=OuterRef('application_id'), id__lte=OuterRef(id_field),
+        ).order_by('-id')
+
+    ChatReadState.objects.filter(last_read_message_id__gt=0).update(
+        last_read_message_at=Subquery(watermark_message('last_read_message_id').values('created_at')[:1]),
+    )
+    ChatThread.objects.filter(admin_read_message_id__gt=0).update(
+        admin_read_message_at=Subquery(watermark_message('admin_read_message_id').values('created_at')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0034_chat_read_watermarks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatreadstate',
+            name='last_read_message_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Время последнего прочитанного сообщения'),
+        ),
+        migrations.AddField(
+            model_name='chatthread',
+            name='admin_read_message_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Прочитано администратором до'),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-19 04:11
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0036_lead_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ticketmessage',
+            name='ticket_msg_app_id_idx',
+        ),
+    ]
@@ -830,7 +830,7 @@ class TicketMessage(models.Model):
         help_text='True если сообщение получено через вебхук TICKET_CHAT_MESSAGE_URL'
     )
     
-    # Read tracking for admin chat notifications
+    # Legacy read flags; read state now lives in ChatReadState watermarks
     is_read = models.BooleanField(
         'Прочитано',
         default=False,
@@ -850,10 +850,34 @@ class TicketMessage(models.Model):
         blank=True
     )
 
+    # Moderation (Admin)
+    is_moderated = models.BooleanField('Модерировано', default=False)
+    moderated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='moderated_ticket_messages',
+        verbose_name='Модератор'
+    )
+    moderated_at = models.DateTimeField('Дата модерации', null=True, blank=True)
+
+    # Source row in the retired chat.ApplicationMessage table (merge_chat_messages)
+    legacy_chat_message_id = models.BigIntegerField(
+        'ID в старом чате',
+        null=True,
+        blank=True,
+        unique=True,
+        editable=False,
+    )
+
     class Meta:
         verbose_name = 'Сообщение чата'
         verbose_name_plural = 'Сообщения чата'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['application', 'created_at'], name='ticket_msg_app_created_idx'),
+        ]
 
     def __str__(self):
         sender_email = self.sender.email if self.sender else 'удалённый пользователь'
@@ -866,6 +890,103 @@ class TicketMessage(models.Model):
             return self.file.url
         return None
 
+    @property
+    def sender_name(self):
+        """Get sender display name."""
+        if self.sender:
+            return self.sender.get_full_name() or self.sender.email
+        return None
+
+    @property
+    def sender_role(self):
+        """Get sender role."""
+        if self.sender:
+            return self.sender.role
+        return None
+
+
+class ChatThread(models.Model):
+    """
+    Per-application chat summary, maintained by apps.applications.messaging
+    on every message write. Serves the admin thread list without
+    aggregating the message table.
+    """
+    application = models.OneToOneField(
+        Application,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='chat_thread',
+        verbose_name='Заявка'
+    )
+    last_message = models.ForeignKey(
+        TicketMessage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Последнее сообщение'
+    )
+    last_message_at = models.DateTimeField('Время последнего сообщения', null=True, blank=True)
+    last_sender_role = models.CharField('Роль последнего отправителя', max_length=20, blank=True, default='')
+    # Last message not sent by an admin: preview in the admin inbox
+    last_client_message = models.ForeignKey(
+        TicketMessage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Последнее сообщение клиента'
+    )
+    message_count = models.PositiveIntegerField('Количество сообщений', default=0)
+    # Shared admin inbox watermark: non-admin messages at or before
+    # (admin_read_message_at, admin_read_message_id) are read
+    admin_read_message_id = models.PositiveBigIntegerField('Прочитано администратором до ID', default=0)
+    admin_read_message_at = models.DateTimeField('Прочитано администратором до', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Чат заявки'
+        verbose_name_plural = 'Чаты заявок'
+        indexes = [
+            models.Index(fields=['last_sender_role', 'last_message_at'], name='chat_thread_role_last_idx'),
+        ]
+
+    def __str__(self):
+        return f"Чат заявки #{self.application_id}"
+
+
+class ChatReadState(models.Model):
+    """
+    Per-(user, application) read watermark: messages at or before
+    (last_read_message_at, last_read_message_id) in chat order are read by the
+    user. Ids alone are not chronological: merged legacy messages get new ids.
+    Marking a thread read is one upsert
+    (apps.applications.messaging.mark_thread_read) and unread counts are range
+    counts over (application, created_at).
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='chat_read_states',
+        verbose_name='Пользователь'
+    )
+    application = models.ForeignKey(
+        Application,
+        on_delete=models.CASCADE,
+        related_name='chat_read_states',
+        verbose_name='Заявка'
+    )
+    last_read_message_id = models.PositiveBigIntegerField('Последнее прочитанное сообщение', default=0)
+    last_read_message_at = models.DateTimeField('Время последнего прочитанного сообщения', null=True, blank=True)
+    last_read_at = models.DateTimeField('Время прочтения', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Прочтение чата'
+        verbose_name_plural = 'Прочтения чатов'
+        unique_together = ['user', 'application']
+
+    def __str__(self):
+        return f"{self.user_id} → заявка #{self.application_id}: {self.last_read_message_id}"
+
 
 class LeadSource(models.TextChoices):
     """Lead source types - where the lead came from."""
@@ -1059,6 +1180,13 @@ class Lead(models.Model):
         verbose_name = 'Лид'
         verbose_name_plural = 'Лиды'
         ordering = ['-created_at']
+        # Admin table sort / filter columns (see apps.core.tables)
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='lead_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='lead_status_created_idx'),
+            models.Index(fields=['status', 'id'], name='lead_status_id_idx'),
+            models.Index(fields=['full_name', 'id'], name='lead_full_name_idx'),
+        ]
     
     def __str__(self):
         return f"Лид #{self.id} - {self.full_name} - {self.phone}"
@@ -1,135 +1,34 @@
 """
 API Serializers for Applications.
 """
-from functools import lru_cache
-import re
-
-from django.db.models import Q
+from django.db import transaction
 from rest_framework import serializers
-from .models import Application, PartnerDecision, TicketMessage, ProductType, ApplicationStatus, ApplicationStatusDefinition, CalculationSession, Lead, LeadSource, LeadStatus
-
-
-# Cache for ApplicationStatusDefinition lookup (avoids N+1 queries in serializers)
-# Cache is module-level and refreshed on server restart
-@lru_cache(maxsize=512)
-def get_status_name_cached(status_id: int, product_type: str) -> str | None:
-    """
-    Get human-readable status name from ApplicationStatusDefinition.
-    Cached to avoid repeated database queries in list serialization.
-    """
-    try:
-        status_def = ApplicationStatusDefinition.objects.filter(
-            status_id=status_id,
-            product_type=product_type
-        ).first()
-        if status_def:
-            return status_def.name
-    except Exception:
-        pass
-    return None
-
-
-def _normalize_bank_name(name: str) -> str:
-    if not name:
-        return ""
-    normalized = name.strip().lower().replace("ё", "е")
-    normalized = re.sub(r"[^0-9a-zа-я]+", " ", normalized)
-    normalized = re.sub(r"\s+", " ", normalized).strip()
-    return normalized
-
-
-BANK_STOP_WORDS = {
-    "банк",
-    "банка",
-    "пао",
-    "оао",
-    "зао",
-    "ао",
-    "ооо",
-    "пao",
-    "публичное",
-    "акционерное",
-    "общество",
-}
-
-
-def _tokenize_bank_name(name: str) -> list[str]:
-    normalized = _normalize_bank_name(name)
-    if not normalized:
-        return []
-    return [token for token in normalized.split() if token not in BANK_STOP_WORDS]
-
-
-def _token_score(target_tokens: list[str], bank_tokens: list[str]) -> float:
-    if not target_tokens or not bank_tokens:
-        return 0.0
-    target_set = set(target_tokens)
-    bank_set = set(bank_tokens)
-    intersection = len(target_set & bank_set)
-    if intersection == 0:
-        return 0.0
-    return intersection / max(len(target_set), len(bank_set))
+from apps.bank_conditions.resolver import resolve_partner_id, resolve_partner_ids
+from apps.companies.client_snapshots import expand_client_snapshot
+from apps.dictionaries.cache import get_status_name
+from .models import Application, PartnerDecision, TicketMessage, ProductType, ApplicationStatus, CalculationSession, Lead, LeadSource, LeadStatus
 
 
 def _get_partner_for_target_bank(target_bank_name: str):
-    if not target_bank_name:
-        return None
-    cleaned_name = target_bank_name.strip()
-    if not cleaned_name:
+    partner_id = resolve_partner_id(target_bank_name)
+    if partner_id is None:
         return None
 
-    from apps.bank_conditions.models import Bank
+    from apps.users.models import User
 
-    banks_qs = Bank.objects.filter(is_active=True, partner_user__isnull=False)
-    exact_matches = banks_qs.filter(
-        Q(name__iexact=cleaned_name) | Q(short_name__iexact=cleaned_name)
-    )
-
-    if exact_matches.count() == 1:
-        return exact_matches.first().partner_user
-    if exact_matches.count() > 1:
-        return None
-
-    normalized_target = _normalize_bank_name(cleaned_name)
-    if not normalized_target:
-        return None
+    return User.objects.filter(pk=partner_id).first()
 
-    target_tokens = _tokenize_bank_name(cleaned_name)
-    best_match = None
-    best_score = 0.0
-    is_ambiguous = False
 
-    for bank in banks_qs:
-        name_norm = _normalize_bank_name(bank.name)
-        short_norm = _normalize_bank_name(bank.short_name or "")
+def _get_partners_for_target_banks(target_bank_names) -> dict:
+    """Batch variant: {target_bank_name: partner User} for every resolved name."""
+    partner_ids = {name: partner_id for name, partner_id in resolve_partner_ids(target_bank_names).items() if partner_id}
+    if not partner_ids:
+        return {}
 
-        score = 0.0
-        if normalized_target == name_norm or (short_norm and normalized_target == short_norm):
-            score = 1.0
-        elif len(normalized_target) >= 3 and (
-            (name_norm and normalized_target in name_norm) or
-            (short_norm and normalized_target in short_norm)
-        ):
-            score = 0.9
-        else:
-            name_tokens = _tokenize_bank_name(bank.name)
-            short_tokens = _tokenize_bank_name(bank.short_name or "")
-            score = max(_token_score(target_tokens, name_tokens), _token_score(target_tokens, short_tokens))
+    from apps.users.models import User
 
-        if score <= 0:
-            continue
-
-        if score > best_score:
-            best_match = bank
-            best_score = score
-            is_ambiguous = False
-        elif score == best_score:
-            is_ambiguous = True
-
-    if best_match and best_score >= 0.6 and not is_ambiguous:
-        return best_match.partner_user
-
-    return None
+    partners = User.objects.in_bulk(set(partner_ids.values()))
+    return {name: partners[partner_id] for name, partner_id in partner_ids.items() if partner_id in partners}
 
 
 class CalculationSessionSerializer(serializers.ModelSerializer):
@@ -448,8 +347,9 @@ class ApplicationSerializer(serializers.ModelSerializer):
         shown is the data that was actually sent, not current profile data.
         """
         # If we have a saved snapshot from when the application was sent, use it
-        if obj.full_client_data and isinstance(obj.full_client_data, dict) and obj.full_client_data.get('inn'):
-            return obj.full_client_data
+        snapshot = expand_client_snapshot(obj.full_client_data)
+        if snapshot and snapshot.get('inn'):
+            return snapshot
         
         # Otherwise, serialize the live company profile
         if obj.company:
@@ -461,8 +361,8 @@ class ApplicationSerializer(serializers.ModelSerializer):
         """Get human-readable status name from ApplicationStatusDefinition (Appendix A)."""
         if obj.status_id is None:
             return None
-        # Use cached lookup to avoid N+1 queries in list views
-        return get_status_name_cached(obj.status_id, obj.product_type)
+        # Reference-data cache lookup (no query per row)
+        return get_status_name(obj.status_id, obj.product_type)
 
 
 class ApplicationCreateSerializer(serializers.ModelSerializer):
@@ -570,6 +470,75 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         return application
 
 
+class ApplicationBulkCreateSerializer(ApplicationCreateSerializer):
+    """
+    Creates one application per bank from a CalculationSession in a single
+    transaction. Common fields are validated once; target_bank_name is taken
+    from bank_names.
+    """
+    bank_names = serializers.ListField(
+        child=serializers.CharField(max_length=200),
+        allow_empty=False,
+        write_only=True
+    )
+
+    class Meta(ApplicationCreateSerializer.Meta):
+        fields = ApplicationCreateSerializer.Meta.fields + ['bank_names']
+
+    def validate_bank_names(self, value):
+        # Keep request order, drop blanks and duplicates
+        names = list(dict.fromkeys(name.strip() for name in value if name and name.strip()))
+        if not names:
+            raise serializers.ValidationError('Не указаны банки')
+        return names
+
+    def create(self, validated_data):
+        """Bulk-insert applications, their document links and submitted_banks."""
+        bank_names = validated_data.pop('bank_names')
+        document_ids = validated_data.pop('document_ids', [])
+        validated_data.pop('target_bank_name', None)
+        session = validated_data['calculation_session']
+        validated_data['created_by'] = self.context['request'].user
+
+        partners = _get_partners_for_target_banks(bank_names)
+
+        with transaction.atomic():
+            applications = Application.objects.bulk_create([
+                Application(
+                    **validated_data,
+                    target_bank_name=bank_name,
+                    assigned_partner=partners.get(bank_name),
+                )
+                for bank_name in bank_names
+            ])
+
+            if document_ids:
+                through = Application.documents.through
+                through.objects.bulk_create([
+                    through(application_id=application.id, document_id=document_id)
+                    for application in applications
+                    for document_id in set(document_ids)
+                ])
+
+            session = CalculationSession.objects.select_for_update().get(pk=session.pk)
+            session.submitted_banks = list(dict.fromkeys(session.submitted_banks + bank_names))
+            session.save(update_fields=['submitted_banks', 'updated_at'])
+
+            # bulk_create bypasses post_save: send partner notifications explicitly
+            assigned = [application for application in applications if application.assigned_partner_id]
+            if assigned:
+                from apps.notifications.signals import notify_partner_assigned
+
+                def _notify():
+                    for application in assigned:
+                        notify_partner_assigned(application)
+
+                transaction.on_commit(_notify)
+
+        self.session = session
+        return applications
+
+
 class ApplicationUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for updating draft or returned-for-revision applications.
@@ -850,7 +819,28 @@ class PartnerDecisionCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class TicketMessageSerializer(serializers.ModelSerializer):
+class ReadMarkersListSerializer(serializers.ListSerializer):
+    """Loads read watermarks for every application on the page in one go."""
+
+    def to_representation(self, data):
+        markers = self.context.get('read_markers')
+        if markers is not None:
+            data = list(data.all() if hasattr(data, 'all') else data)
+            markers.prime({message.application_id for message in data})
+        return super().to_representation(data)
+
+
+class ReadStateMixin:
+    """is_read relative to the requesting user (context['read_markers'], see messaging.ReadMarkers)."""
+
+    def get_is_read(self, obj):
+        markers = self.context.get('read_markers')
+        if markers is None:
+            return obj.is_read
+        return markers.is_read(obj)
+
+
+class TicketMessageSerializer(ReadStateMixin, serializers.ModelSerializer):
     """
     Serializer for chat messages within applications.
     Supports file attachments via multipart/form-data.
@@ -860,9 +850,11 @@ class TicketMessageSerializer(serializers.ModelSerializer):
     sender_name = serializers.SerializerMethodField()
     sender_role = serializers.SerializerMethodField()
     file_url = serializers.SerializerMethodField()
+    is_read = serializers.SerializerMethodField()
 
     class Meta:
         model = TicketMessage
+        list_serializer_class = ReadMarkersListSerializer
         fields = [
             'id',
             'application',
@@ -112,3 +112,218 @@ class PublicLeadCreateViewTest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('phone', response.data)
+
+
+class CalculationSessionBulkCreateTest(APITestCase):
+    def setUp(self):
+        from apps.bank_conditions.models import Bank
+        from apps.bank_conditions.resolver import bank_name_index
+        from apps.companies.models import CompanyProfile
+        from apps.applications.models import CalculationSession
+
+        self.agent = User.objects.create_user(email='bulk_agent@example.com', password='password123', role=UserRole.AGENT)
+        self.partner = User.objects.create_user(email='bulk_partner@example.com', password='password123', role=UserRole.PARTNER)
+        Bank.objects.create(name='ПАО Сбербанк', short_name='Сбербанк', partner_user=self.partner)
+        bank_name_index.invalidate()
+        self.company = CompanyProfile.objects.create(owner=self.agent, inn='7707083893', name='ООО Ромашка')
+        self.session = CalculationSession.objects.create(
+            created_by=self.agent, company=self.company, product_type='bank_guarantee',
+            submitted_banks=['Альфа-Банк'],
+        )
+        self.client.force_authenticate(self.agent)
+
+    def test_creates_applications_and_updates_submitted_banks(self):
+        from apps.notifications.models import Notification
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/api/applications/calculation-sessions/{self.session.id}/create_applications/',
+                {'amount': '1000000', 'term_months': 12, 'bank_names': ['Сбербанк', 'ВТБ', 'Сбербанк']},
+                format='json',
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        applications = self.session.applications.order_by('id')
+        self.assertEqual([app.target_bank_name for app in applications], ['Сбербанк', 'ВТБ'])
+        self.assertEqual(applications[0].assigned_partner, self.partner)
+        self.assertIsNone(applications[1].assigned_partner)
+        self.assertEqual(response.data['session']['submitted_banks'], ['Альфа-Банк', 'Сбербанк', 'ВТБ'])
+        self.assertEqual(Notification.objects.filter(user=self.partner).count(), 1)
+
+
+class ChatMessageStoreTest(APITestCase):
+    def setUp(self):
+        from apps.applications.models import Application
+        from apps.companies.models import CompanyProfile
+
+        self.agent = User.objects.create_user(email='chat_agent@example.com', password='password123', role=UserRole.AGENT)
+        self.admin = User.objects.create_user(email='chat_admin@example.com', password='password123', role=UserRole.ADMIN)
+        company = CompanyProfile.objects.create(owner=self.agent, inn='7707083893', name='ООО Ромашка')
+        self.application = Application.objects.create(
+            created_by=self.agent, company=company, product_type='bank_guarantee',
+            amount='1000000', term_months=12,
+        )
+
+    def _thread(self):
+        from apps.applications.models import ChatThread
+
+        return ChatThread.objects.get(application=self.application)
+
+    def test_rest_and_chat_api_share_store_and_thread_summary(self):
+        from apps.applications.models import TicketMessage
+
+        self.client.force_authenticate(self.agent)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/api/applications/{self.application.id}/messages/', {'content': 'Первое'},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/chat/', {'application': self.application.id, 'text': 'Второе'},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        self.assertEqual(TicketMessage.objects.filter(application=self.application).count(), 2)
+        history = self.client.get('/api/chat/by_application/', {'application_id': self.application.id})
+        self.assertEqual([item['text'] for item in history.data], ['Первое', 'Второе'])
+
+        thread = self._thread()
+        self.assertEqual(thread.message_count, 2)
+        self.assertEqual(thread.last_sender_role, UserRole.AGENT)
+        self.assertEqual(thread.last_client_message.content, 'Второе')
+
+    def test_admin_threads_follow_summary(self):
+        from apps.applications.messaging import post_message
+
+        post_message(self.application.id, self.agent, content='Нужна помощь')
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/applications/chat-threads/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['unread_count'], 1)
+        self.assertEqual(response.data[0]['last_message_preview'], 'Нужна помощь')
+        self.assertEqual(response.data[0]['agent_email'], self.agent.email)
+
+        self.client.post(f'/api/applications/{self.application.id}/messages/mark_read/')
+        post_message(self.application.id, self.admin, content='Готово')
+        self.assertEqual(self._thread().last_sender_role, UserRole.ADMIN)
+        self.assertEqual(self.client.get('/api/applications/chat-threads/').data, [])
+
+    def test_read_watermarks(self):
+        from apps.applications.messaging import post_message, unread_count
+        from apps.applications.models import ChatReadState, TicketMessage
+
+        first = post_message(self.application.id, self.agent, content='Раз')
+        post_message(self.application.id, self.agent, content='Два')
+        self.client.force_authenticate(self.admin)
+        response = self.client.post('/api/chat/mark_read/', {'message_ids': [first.id]}, format='json')
+        self.assertEqual(response.data, {'updated': 1})
+        self.assertEqual(unread_count(self.admin, self.application.id), 1)
+
+        url = f'/api/applications/{self.application.id}/messages/'
+        self.assertEqual(self.client.post(f'{url}mark_read/').data, {'marked_count': 1})
+        self.assertEqual(self.client.post(f'{url}mark_read/').data, {'marked_count': 0})
+        self.assertEqual(ChatReadState.objects.get(user=self.admin).last_read_message_id,
+                         TicketMessage.objects.latest('id').id)
+        self.assertFalse(TicketMessage.objects.filter(is_read=True).exists())
+
+        post_message(self.application.id, self.admin, content='Ответ')
+        self.client.force_authenticate(self.agent)
+        self.assertEqual(unread_count(self.agent, self.application.id), 1)
+        response = self.client.get(url)
+        items = response.data['results'] if isinstance(response.data, dict) else response.data
+        # Agent's own messages were read by the admin; the reply is not read yet
+        self.assertEqual([item['is_read'] for item in items], [True, True, False])
+
+    def test_merged_legacy_messages_keep_read_state(self):
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+        from apps.applications.messaging import post_message, unread_count
+        from apps.chat.models import ApplicationMessage
+
+        current = post_message(self.application.id, self.agent, content='Новое')
+        self.client.force_authenticate(self.admin)
+        self.client.post(f'/api/applications/{self.application.id}/messages/mark_read/')
+
+        week_ago = timezone.now() - timedelta(days=7)
+        for sender, text in ((self.agent, 'Старый вопрос'), (self.admin, 'Старый ответ')):
+            legacy = ApplicationMessage.objects.create(
+                application=self.application, sender=sender, text=text, is_read=True,
+            )
+            ApplicationMessage.objects.filter(pk=legacy.pk).update(created_at=week_ago)
+            week_ago += timedelta(minutes=1)
+        call_command('merge_chat_messages', stdout=StringIO())
+
+        # Merged rows have higher ids but older times: still read on both sides
+        self.assertEqual(unread_count(self.admin, self.application.id), 0)
+        self.assertEqual(unread_count(self.agent, self.application.id), 0)
+        inbox = self.client.get('/api/applications/chat-threads/').data
+        self.assertEqual([thread['unread_count'] for thread in inbox], [0])
+
+        url = f'/api/applications/{self.application.id}/messages/history/'
+        latest = self.client.get(url, {'limit': 1}).data
+        self.assertEqual([m['id'] for m in latest['messages']], [current.id])
+        older = self.client.get(url, {'before': current.id}).data
+        self.assertEqual([m['content'] for m in older['messages']], ['Старый вопрос', 'Старый ответ'])
+
+    def test_chat_notifications_skip_users_online_in_room(self):
+        from django.core.cache import cache
+        from apps.applications.messaging import post_message
+        from apps.chat import presence
+        from apps.notifications.models import Notification
+
+        cache.clear()
+        presence.touch(presence.chat_room(self.application.id), self.agent.id, 'agent-channel')
+        post_message(self.application.id, self.admin, content='Вы онлайн')
+        self.assertFalse(Notification.objects.filter(user=self.agent).exists())
+        self.assertFalse(Notification.objects.filter(user=self.admin).exists())
+
+        presence.leave(presence.chat_room(self.application.id), self.agent.id, 'agent-channel')
+        post_message(self.application.id, self.admin, content='Вы офлайн')
+        self.assertEqual(Notification.objects.filter(user=self.agent).count(), 1)
+
+    def test_history_cursors(self):
+        from apps.applications.messaging import post_message
+
+        ids = [post_message(self.application.id, self.agent, content=f'm{i}').id for i in range(5)]
+        post_message(self.application.id, self.admin, content='ответ')
+        self.client.force_authenticate(self.agent)
+        url = f'/api/applications/{self.application.id}/messages/history/'
+
+        latest = self.client.get(url, {'limit': 2}).data
+        self.assertEqual([m['content'] for m in latest['messages']], ['m4', 'ответ'])
+        self.assertTrue(latest['has_more'])
+        self.assertEqual(set(latest['senders']), {str(self.agent.id), str(self.admin.id)})
+
+        older = self.client.get(url, {'before': ids[4], 'limit': 10}).data
+        self.assertEqual([m['id'] for m in older['messages']], ids[:4])
+        self.assertFalse(older['has_more'])
+
+        gap = self.client.get('/api/chat/history/', {'application_id': self.application.id, 'since': ids[2]}).data
+        self.assertEqual([m['content'] for m in gap['messages']], ['m3', 'm4', 'ответ'])
+        self.assertEqual(self.client.get(url, {'since': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'before': 1, 'after': 1}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_merge_legacy_chat_messages(self):
+        from datetime import timedelta
+        from io import StringIO
+
+        from django.core.management import call_command
+        from django.utils import timezone
+        from apps.applications.models import TicketMessage
+        from apps.chat.models import ApplicationMessage
+
+        legacy = ApplicationMessage.objects.create(application=self.application, sender=self.agent, text='Старое')
+        sent_at = timezone.now() - timedelta(days=3)
+        ApplicationMessage.objects.filter(pk=legacy.pk).update(created_at=sent_at)
+
+        call_command('merge_chat_messages', batch_size=10, stdout=StringIO())
+        call_command('merge_chat_messages', batch_size=10, stdout=StringIO())
+
+        merged = TicketMessage.objects.get(legacy_chat_message_id=legacy.pk)
+        self.assertEqual(TicketMessage.objects.count(), 1)
+        self.assertEqual(merged.content, 'Старое')
+        self.assertEqual(merged.created_at, sent_at)
+        self.assertEqual(self._thread().message_count, 1)
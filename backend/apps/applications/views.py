@@ -10,12 +10,17 @@ from django.utils import timezone
 from django.db import transaction
 from django.db.models import Q, Count, Case, When, IntegerField
 from django.contrib.auth import get_user_model
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 
 from .models import Application, PartnerDecision, TicketMessage, ApplicationStatus, CalculationSession
+from .messaging import (
+    ReadMarkers, admin_chat_threads, chat_history, mark_thread_read, notify_admin_inbox_changed,
+    parse_history_params, post_message,
+)
 from .serializers import (
     ApplicationSerializer,
     ApplicationCreateSerializer,
+    ApplicationBulkCreateSerializer,
     ApplicationUpdateSerializer,
     ApplicationListSerializer,
     ApplicationAssignSerializer,
@@ -875,6 +880,23 @@ class PartnerDecisionViewSet(viewsets.ReadOnlyModelViewSet):
         ).distinct()
 
 
+CHAT_HISTORY_PARAMETERS = [
+    OpenApiParameter('before', int, description='Сообщения старше этого ID'),
+    OpenApiParameter('after', int, description='Сообщения новее этого ID (страница)'),
+    OpenApiParameter('since', int, description='Все сообщения после этого ID (догрузка после переподключения)'),
+    OpenApiParameter('limit', int, description='Размер страницы'),
+]
+CHAT_HISTORY_RESPONSE = {
+    'type': 'object',
+    'properties': {
+        'messages': {'type': 'array', 'items': {'type': 'object'}},
+        'senders': {'type': 'object', 'additionalProperties': {'type': 'object'}},
+        'has_more': {'type': 'boolean'},
+        'read_state': {'type': 'object'},
+    },
+}
+
+
 @extend_schema(tags=['Chat Messages'])
 class TicketMessageViewSet(viewsets.ModelViewSet):
     """
@@ -921,6 +943,11 @@ class TicketMessageViewSet(viewsets.ModelViewSet):
             return TicketMessageCreateSerializer
         return TicketMessageSerializer
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['read_markers'] = ReadMarkers(self.request.user)
+        return context
+
     def create(self, request, *args, **kwargs):
         """Create a new message in the application."""
         application_id = self.kwargs.get('application_pk')
@@ -943,43 +970,16 @@ class TicketMessageViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Create message with sender and application
-        message = TicketMessage.objects.create(
-            application=application,
-            sender=request.user,
+        # Single write path: insert, thread summary, room + admin inbox broadcast
+        message = post_message(
+            application.id,
+            request.user,
             content=serializer.validated_data.get('content', ''),
             file=serializer.validated_data.get('file'),
         )
         
-        # Broadcast to admin_chat_threads WebSocket group for real-time updates
-        # Only notify if sender is NOT admin (admins don't need to see their own messages)
-        if request.user.role != 'admin':
-            try:
-                from asgiref.sync import async_to_sync
-                from channels.layers import get_channel_layer
-                
-                channel_layer = get_channel_layer()
-                if channel_layer:
-                    company_name = application.company.name if application.company else f'Заявка #{application.id}'
-                    sender_name = request.user.first_name or request.user.email
-                    
-                    async_to_sync(channel_layer.group_send)(
-                        'admin_chat_threads',
-                        {
-                            'type': 'new_message_notification',
-                            'application_id': application.id,
-                            'company_name': company_name,
-                            'sender_name': sender_name,
-                            'preview': message.content[:100] if message.content else '[Файл]',
-                        }
-                    )
-            except Exception as e:
-                # Don't fail the request if WebSocket broadcast fails
-                import logging
-                logging.getLogger(__name__).warning(f'Failed to broadcast to admin_chat_threads: {e}')
-        
         return Response(
-            TicketMessageSerializer(message, context={'request': request}).data,
+            TicketMessageSerializer(message, context=self.get_serializer_context()).data,
             status=status.HTTP_201_CREATED
         )
 
@@ -1003,6 +1003,40 @@ class TicketMessageViewSet(viewsets.ModelViewSet):
             )
         )
 
+    @extend_schema(
+        description='Compact message history with before/after/since message-id cursors',
+        parameters=CHAT_HISTORY_PARAMETERS,
+        responses={200: CHAT_HISTORY_RESPONSE},
+    )
+    @action(detail=False, methods=['get'], url_path='history')
+    def history(self, request, application_pk=None):
+        """
+        Cursor-based history for the chat.
+        GET /api/applications/{id}/messages/history/?before=|after=|since=&limit=
+        """
+        if not application_pk:
+            return Response(
+                {'error': 'Не указана заявка'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            params = parse_history_params(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            self._get_accessible_application(application_pk)
+        except Application.DoesNotExist:
+            return Response(
+                {'error': 'Заявка не найдена или недоступна'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        data = chat_history(
+            TicketMessage.objects.all(), request.user, int(application_pk),
+            url_base=request.build_absolute_uri('/').rstrip('/'), **params,
+        )
+        return Response(data)
+
     @extend_schema(
         description='Mark all unread messages in this application as read (excluding own messages)',
         responses={200: {'type': 'object', 'properties': {'marked_count': {'type': 'integer'}}}},
@@ -1011,10 +1045,8 @@ class TicketMessageViewSet(viewsets.ModelViewSet):
     def mark_read(self, request, application_pk=None):
         """
         Mark all unread messages in this application as read.
-        Only marks messages from other users (not own messages).
+        Only counts messages from other users (not own messages).
         """
-        from django.utils import timezone
-        
         if not application_pk:
             return Response(
                 {'error': 'Не указана заявка'},
@@ -1030,41 +1062,12 @@ class TicketMessageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Mark messages as read (exclude own messages)
-        now = timezone.now()
-        updated = TicketMessage.objects.filter(
-            application_id=application_pk,
-            is_read=False
-        ).exclude(
-            sender=request.user
-        ).update(
-            is_read=True,
-            read_by=request.user,
-            read_at=now
-        )
+        # One watermark upsert instead of updating every message row
+        updated = mark_thread_read(request.user, int(application_pk))
         
         # Broadcast to admin_chat_threads to update the list (if messages were marked)
         if updated > 0:
-            try:
-                from asgiref.sync import async_to_sync
-                from channels.layers import get_channel_layer
-                
-                channel_layer = get_channel_layer()
-                if channel_layer:
-                    # Send signal to refresh admin chat list
-                    async_to_sync(channel_layer.group_send)(
-                        'admin_chat_threads',
-                        {
-                            'type': 'new_message_notification',
-                            'application_id': int(application_pk),
-                            'company_name': '',
-                            'sender_name': '',
-                            'preview': '',
-                        }
-                    )
-            except Exception as e:
-                import logging
-                logging.getLogger(__name__).warning(f'Failed to broadcast mark_read to admin_chat_threads: {e}')
+            notify_admin_inbox_changed(application_pk)
         
         return Response({'marked_count': updated}, status=status.HTTP_200_OK)
 
@@ -1176,12 +1179,52 @@ class CalculationSessionViewSet(viewsets.ModelViewSet):
         
         return Response(CalculationSessionSerializer(session, context={'request': request}).data)
 
+    @extend_schema(
+        request=ApplicationBulkCreateSerializer,
+        responses={201: {'type': 'object', 'properties': {
+            'applications': {'type': 'array', 'items': {'type': 'object'}},
+            'session': {'type': 'object'},
+        }}}
+    )
+    @action(detail=True, methods=['post'])
+    def create_applications(self, request, pk=None):
+        """
+        Create applications for several banks in one request.
+        POST /api/applications/calculation-sessions/{id}/create_applications/
+
+        Body: application fields (as for POST /api/applications/) plus
+        {"bank_names": ["Сбербанк", "ВТБ"]}; company defaults to the session company.
+        """
+        session = self.get_object()
+
+        data = request.data.copy() if hasattr(request.data, 'copy') else dict(request.data)
+        data['calculation_session'] = session.id
+        data.setdefault('company', session.company_id)
+        data.setdefault('product_type', session.product_type)
+
+        serializer = ApplicationBulkCreateSerializer(data=data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        applications = serializer.save()
+
+        return Response(
+            {
+                'applications': ApplicationCreateSerializer(
+                    applications, many=True, context={'request': request}
+                ).data,
+                'session': CalculationSessionSerializer(serializer.session, context={'request': request}).data,
+            },
+            status=status.HTTP_201_CREATED
+        )
+
 
 # =============================================================================
 # PUBLIC LEAD API (No authentication required)
 # =============================================================================
 
 from rest_framework.permissions import AllowAny
+from apps.core.tables import AdminTableMixin
+from apps.core.throttling import FailOpenScopedRateThrottle
+from apps.seo.counters import record_lead
 from .models import Lead
 from .serializers import LeadSerializer, LeadCreateSerializer
 
@@ -1202,6 +1245,9 @@ class PublicLeadCreateView(APIView):
     """
     permission_classes = [AllowAny]
     authentication_classes = []
+    # Per-IP rate limit; counters live in the shared cache (settings.CACHES)
+    throttle_classes = [FailOpenScopedRateThrottle]
+    throttle_scope = 'public_lead'
     
     @extend_schema(
         request=LeadCreateSerializer,
@@ -1213,6 +1259,8 @@ class PublicLeadCreateView(APIView):
         
         if serializer.is_valid():
             lead = serializer.save()
+            # Source attribution: buffered +1 on the SEO page the form was on
+            record_lead(lead.page_url)
             
             # Return created lead data
             return Response(
@@ -1227,7 +1275,7 @@ class PublicLeadCreateView(APIView):
 
 
 @extend_schema(tags=['Admin Leads'])
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(AdminTableMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing leads (Admin only).
     
@@ -1240,7 +1288,14 @@ class LeadViewSet(viewsets.ModelViewSet):
     """
     queryset = Lead.objects.select_related('assigned_to').all()
     permission_classes = [IsAuthenticated, IsAdmin]
-    pagination_class = None  # Frontend expects full list without pagination
+    table_filter_fields = {
+        'status': 'status',
+        'source': 'source',
+        'product_type': 'product_type',
+        'assigned_to': 'assigned_to_id',
+    }
+    table_search_fields = ('full_name', 'phone', 'email', 'inn')
+    table_ordering_fields = {'created_at': 'created_at', 'full_name': 'full_name', 'status': 'status'}
     
     def get_serializer_class(self):
         return LeadSerializer
@@ -1497,7 +1552,8 @@ class ChatThreadViewSet(viewsets.ViewSet):
     ViewSet for admin chat threads list.
     
     Returns applications with unread messages or messages awaiting admin reply.
-    Uses aggregation to return one row per application.
+    Reads the per-application ChatThread summary (maintained on every message
+    write) plus one grouped unread count, see apps.applications.messaging.
     
     Logic:
     - Show applications with unread messages from non-admin users
@@ -1519,127 +1575,7 @@ class ChatThreadViewSet(viewsets.ViewSet):
         - Last message preview and sender info
         - admin_replied: True if admin was the last to send a message
         """
-        from django.db.models import Count, Q, Max, OuterRef, Subquery, CharField
-        
-        # Subquery to get the role of the last message sender for each application
-        last_message_sender_role = Subquery(
-            TicketMessage.objects.filter(
-                application_id=OuterRef('application_id')
-            ).order_by('-created_at').values('sender__role')[:1],
-            output_field=CharField()
-        )
-        
-        # Get applications with chat activity that need attention
-        # Either: has unread messages from non-admins OR last message is not from admin
-        threads_data = list(
-            TicketMessage.objects
-            .values('application_id')
-            .annotate(
-                unread_count=Count(
-                    'id', 
-                    filter=Q(is_read=False) & ~Q(sender__role='admin')
-                ),
-                last_message_at=Max('created_at'),
-                last_sender_role=last_message_sender_role,
-            )
-            .filter(
-                Q(unread_count__gt=0) |  # Has unread messages from non-admins
-                ~Q(last_sender_role='admin')  # Last message is not from admin
-            )
-            .order_by('-last_message_at')
-        )
-        
-        # Build response data
-        result = []
-        application_ids = [t['application_id'] for t in threads_data]
-        
-        if not application_ids:
-            return Response([])
-        
-        # Prefetch applications
-        applications = {
-            app.id: app
-            for app in Application.objects.filter(id__in=application_ids).select_related(
-                'company',
-                'created_by',
-                'created_by__invited_by'
-            )
-        }
-        
-        # Get last non-admin message for each application (for preview)
-        last_messages = {}
-        for app_id in application_ids:
-            last_msg = (
-                TicketMessage.objects
-                .filter(application_id=app_id)
-                .exclude(sender__role='admin')
-                .select_related('sender')
-                .order_by('-created_at')
-                .first()
-            )
-            if last_msg:
-                last_messages[app_id] = last_msg
-        
-        for thread in threads_data:
-            app_id = thread['application_id']
-            app = applications.get(app_id)
-            last_msg = last_messages.get(app_id)
-            
-            if not app or not last_msg:
-                continue
-            
-            # Get sender name
-            sender_name = ''
-            sender_email = None
-            if last_msg.sender:
-                if last_msg.sender.first_name or last_msg.sender.last_name:
-                    sender_name = f"{last_msg.sender.first_name or ''} {last_msg.sender.last_name or ''}".strip()
-                if not sender_name:
-                    sender_name = last_msg.sender.email
-                sender_email = last_msg.sender.email
-            else:
-                sender_name = 'Удалённый пользователь'
-            
-            # Check if admin replied (last message is from admin)
-            admin_replied = thread['last_sender_role'] == 'admin'
-            
-            # Skip if all read AND admin replied
-            if thread['unread_count'] == 0 and admin_replied:
-                continue
-            
-            agent_user = None
-            if app.created_by and app.created_by.role == 'agent':
-                agent_user = app.created_by
-            elif app.created_by and app.created_by.role == 'client':
-                invited_by = getattr(app.created_by, 'invited_by', None)
-                if invited_by and invited_by.role == 'agent':
-                    agent_user = invited_by
-
-            agent_name = None
-            agent_email = None
-            agent_phone = None
-            if agent_user:
-                agent_email = agent_user.email
-                agent_phone = agent_user.phone
-                first = agent_user.first_name or ''
-                last = agent_user.last_name or ''
-                full_name = f"{first} {last}".strip()
-                agent_name = full_name or agent_user.email
-
-            result.append({
-                'application_id': app_id,
-                'company_name': app.company.name if app.company else f'Заявка #{app_id}',
-                'last_sender_email': sender_email,
-                'last_sender_name': sender_name,
-                'last_message_preview': last_msg.content[:100] if last_msg.content else '[Файл]',
-                'unread_count': thread['unread_count'],
-                'admin_replied': admin_replied,
-                'last_message_at': thread['last_message_at'],
-                'agent_name': agent_name,
-                'agent_email': agent_email,
-                'agent_phone': agent_phone,
-            })
-        
+        result = admin_chat_threads()
         serializer = ChatThreadSerializer(result, many=True)
         return Response(serializer.data)
 
@@ -5,3 +5,7 @@ class BankConditionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.bank_conditions'
     verbose_name = 'Условия банков'
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.bank_conditions.signals  # noqa: F401
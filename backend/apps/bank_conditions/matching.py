@@ -0,0 +1,346 @@
+"""
+In-memory bank offer matching engine for calculator requests.
+
+Active conditions are compiled once per process into an interval index over
+the amount axis: all sum_min/sum_max boundaries split the axis into
+elementary segments, and every segment stores the offers covering it. A
+query is one bisect plus a filter over the (few) offers of its segment by
+product, law, guarantee type and term. The index is rebuilt when any bank
+reference table changes (see signals.py).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from decimal import Decimal
+import math
+import re
+
+from apps.core.snapshots import VersionedSnapshot
+
+DAYS_PER_MONTH = 30
+MILLION = 1_000_000
+
+# ProductType code -> keywords (any) that identify it in free-text BankCondition.product
+PRODUCT_KEYWORDS = {
+    'bank_guarantee': ('бг', 'гарант'),
+    'contract_loan': ('кредит на исполнение', 'кик'),
+    'tender_loan': ('тендерн',),
+    'corporate_credit': ('кредит',),
+    'factoring': ('факторинг',),
+    'leasing': ('лизинг',),
+    'rko': ('рко',),
+    'special_account': ('спецсчет', 'спецсчёт', 'спец. счет'),
+}
+
+# IndividualReviewCondition.guarantee_type -> GuaranteeType codes it covers
+INDIVIDUAL_GUARANTEE_TYPES = {
+    'execution': frozenset({'contract_execution', 'advance_return', 'warranty_obligations'}),
+    'application': frozenset({'application_security'}),
+}
+INDIVIDUAL_GUARANTEE_TYPES['execution_application'] = (
+    INDIVIDUAL_GUARANTEE_TYPES['execution'] | INDIVIDUAL_GUARANTEE_TYPES['application']
+)
+
+_LAW_RE = re.compile(r'(\d{2,3})\s*-?\s*(фз|пп)', re.IGNORECASE)
+_FZ_NUMBER_RE = re.compile(r'\d{2,3}')
+_WORD_RE = re.compile(r'[0-9a-zа-яё]+')
+
+
+def _to_float(value, default: float | None = None) -> float | None:
+    if value is None:
+        return default
+    return float(value)
+
+
+def _law_code(number: str, kind: str = 'фз') -> str:
+    if number == '615' or kind.lower() == 'пп':
+        return f'{number}_pp'
+    return f'{number}_fz'
+
+
+def normalize_law(value: str | None) -> str | None:
+    """Accept TenderLaw codes ('44_fz') and human forms ('44-ФЗ', '44')."""
+    if not value:
+        return None
+    value = str(value).strip().lower()
+    if value in ('kbg', 'commercial'):
+        return value
+    match = _FZ_NUMBER_RE.search(value)
+    if not match:
+        return None
+    return _law_code(match.group(0), 'пп' if 'pp' in value or 'пп' in value else 'фз')
+
+
+def parse_product_kinds(product: str) -> frozenset[str]:
+    text = (product or '').lower()
+    words = set(_WORD_RE.findall(text))
+    kinds = set()
+    for kind, keywords in PRODUCT_KEYWORDS.items():
+        for keyword in keywords:
+            # Short keywords ('бг', 'рко') must be whole words, longer ones may be stems
+            if (keyword in words) if len(keyword) <= 3 else (keyword in text):
+                kinds.add(kind)
+                break
+    return frozenset(kinds)
+
+
+def parse_product_laws(product: str) -> frozenset[str]:
+    return frozenset(_law_code(number, kind) for number, kind in _LAW_RE.findall(product or ''))
+
+
+@dataclass(frozen=True)
+class CompiledOffer:
+    condition_id: int
+    bank_id: int
+    bank_name: str
+    bank_short_name: str
+    bank_logo_url: str
+    bank_order: int
+    product: str
+    product_text: str
+    product_kinds: frozenset
+    laws: frozenset  # empty = any law
+    sum_min: float
+    sum_max: float
+    max_term_days: int | None
+    rate_min: float | None
+    rate_type: str
+    service_commission: float | None
+    service_commission_max: float | None
+    additional_conditions: str
+
+    def rank_key(self) -> tuple:
+        return (
+            self.rate_min if self.rate_min is not None else math.inf,
+            self.service_commission if self.service_commission is not None else math.inf,
+            -self.sum_max,
+            self.bank_order,
+            self.bank_name,
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            'condition_id': self.condition_id,
+            'bank': {
+                'id': self.bank_id,
+                'name': self.bank_name,
+                'short_name': self.bank_short_name,
+                'logo_url': self.bank_logo_url,
+            },
+            'product': self.product,
+            'sum_min': self.sum_min,
+            'sum_max': None if math.isinf(self.sum_max) else self.sum_max,
+            'max_term_days': self.max_term_days,
+            'rate_min': self.rate_min,
+            'rate_type': self.rate_type,
+            'service_commission': self.service_commission,
+            'service_commission_max': self.service_commission_max,
+            'additional_conditions': self.additional_conditions,
+        }
+
+
+@dataclass(frozen=True)
+class CompiledIndividualReview:
+    condition_id: int
+    bank_id: int
+    bank_name: str
+    bank_order: int
+    fz_type: str
+    laws: frozenset
+    guarantee_type: str
+    guarantee_types: frozenset | None  # None = all types
+    max_amount: float
+    term: str
+    bank_rate: str
+    service_commission: float | None
+
+    def as_dict(self) -> dict:
+        return {
+            'condition_id': self.condition_id,
+            'bank': {'id': self.bank_id, 'name': self.bank_name},
+            'fz_type': self.fz_type,
+            'guarantee_type': self.guarantee_type,
+            'max_amount': None if math.isinf(self.max_amount) else self.max_amount,
+            'term': self.term,
+            'bank_rate': self.bank_rate,
+            'service_commission': self.service_commission,
+        }
+
+
+@dataclass(frozen=True)
+class MatchQuery:
+    amount: float
+    term_days: int | None = None
+    product: str | None = None
+    law: str | None = None
+    guarantee_type: str | None = None
+
+
+@dataclass
+class MatchingIndex:
+    boundaries: list = field(default_factory=list)
+    segments: list = field(default_factory=list)
+    individual_reviews: tuple = ()
+    stop_factors: tuple = ()
+
+    @classmethod
+    def build(cls, offers: list[CompiledOffer], individual_reviews: list, stop_factors: list) -> 'MatchingIndex':
+        points = sorted(
+            {offer.sum_min for offer in offers}
+            | {offer.sum_max for offer in offers if not math.isinf(offer.sum_max)}
+        )
+        # Segment p holds amounts in [points[p-1], points[p]). Offers are closed
+        # intervals, so each one is also placed in the segment starting at its
+        # sum_max; match() drops the resulting edge candidates with an exact check.
+        segments: list[list[CompiledOffer]] = [[] for _ in range(len(points) + 1)]
+        for offer in offers:
+            start = bisect_right(points, offer.sum_min)
+            end = len(points) if math.isinf(offer.sum_max) else bisect_right(points, offer.sum_max)
+            for position in range(start, end + 1):
+                segments[position].append(offer)
+
+        return cls(
+            boundaries=points,
+            segments=[tuple(sorted(segment, key=CompiledOffer.rank_key)) for segment in segments],
+            individual_reviews=tuple(sorted(individual_reviews, key=lambda item: (item.bank_order, item.bank_name))),
+            stop_factors=tuple(stop_factors),
+        )
+
+    def match(self, query: MatchQuery) -> dict:
+        product = (query.product or '').strip().lower()
+        product_is_kind = product in PRODUCT_KEYWORDS
+        law = normalize_law(query.law)
+
+        offers = []
+        for offer in self.segments[bisect_right(self.boundaries, query.amount)]:
+            if not offer.sum_min <= query.amount <= offer.sum_max:
+                continue
+            if product:
+                if product_is_kind:
+                    if product not in offer.product_kinds:
+                        continue
+                elif product not in offer.product_text:
+                    continue
+            if law and offer.laws and law not in offer.laws:
+                continue
+            if query.term_days and offer.max_term_days is not None and query.term_days > offer.max_term_days:
+                continue
+            offers.append(offer)
+
+        individual = []
+        if not product or product == 'bank_guarantee':
+            for review in self.individual_reviews:
+                if query.amount > review.max_amount:
+                    continue
+                if law and review.laws and law not in review.laws:
+                    continue
+                if (
+                    query.guarantee_type
+                    and review.guarantee_types is not None
+                    and query.guarantee_type not in review.guarantee_types
+                ):
+                    continue
+                individual.append(review)
+
+        return {
+            'count': len(offers),
+            'offers': [offer.as_dict() for offer in offers],
+            'individual_reviews': [review.as_dict() for review in individual],
+            'stop_factors': list(self.stop_factors),
+        }
+
+
+def _compile_offer(condition) -> CompiledOffer:
+    bank = condition.bank
+    if condition.term_days:
+        max_term_days = condition.term_days
+    elif condition.term_months:
+        max_term_days = condition.term_months * DAYS_PER_MONTH
+    else:
+        max_term_days = None
+    return CompiledOffer(
+        condition_id=condition.id,
+        bank_id=bank.id,
+        bank_name=bank.name,
+        bank_short_name=bank.short_name,
+        bank_logo_url=bank.logo_url,
+        bank_order=bank.order,
+        product=condition.product,
+        product_text=(condition.product or '').lower(),
+        product_kinds=parse_product_kinds(condition.product),
+        laws=parse_product_laws(condition.product),
+        sum_min=_to_float(condition.sum_min, 0.0),
+        sum_max=_to_float(condition.sum_max, math.inf),
+        max_term_days=max_term_days,
+        rate_min=_to_float(condition.rate_min),
+        rate_type=condition.rate_type,
+        service_commission=_to_float(condition.service_commission),
+        service_commission_max=_to_float(condition.service_commission_max),
+        additional_conditions=condition.additional_conditions,
+    )
+
+
+def _compile_individual_review(condition) -> CompiledIndividualReview:
+    limits = [
+        value for value in (condition.fz_application_limit, condition.client_limit)
+        if value is not None
+    ]
+    # Limits are stored in millions; the per-application limit wins when present.
+    max_amount = float(limits[0] * MILLION) if limits else math.inf
+    return CompiledIndividualReview(
+        condition_id=condition.id,
+        bank_id=condition.bank.id,
+        bank_name=condition.bank.name,
+        bank_order=condition.bank.order,
+        fz_type=condition.fz_type,
+        laws=frozenset(_law_code(number) for number in _FZ_NUMBER_RE.findall(condition.fz_type or '')),
+        guarantee_type=condition.guarantee_type,
+        guarantee_types=INDIVIDUAL_GUARANTEE_TYPES.get(condition.guarantee_type),
+        max_amount=max_amount,
+        term=condition.term,
+        bank_rate=condition.bank_rate,
+        service_commission=_to_float(condition.service_commission),
+    )
+
+
+def build_matching_index() -> MatchingIndex:
+    from .models import BankCondition, IndividualReviewCondition, StopFactor
+
+    offers = [
+        _compile_offer(condition)
+        for condition in BankCondition.objects.filter(is_active=True, bank__is_active=True).select_related('bank')
+    ]
+    individual_reviews = [
+        _compile_individual_review(condition)
+        for condition in IndividualReviewCondition.objects.filter(
+            is_active=True, bank__is_active=True
+        ).select_related('bank')
+    ]
+    stop_factors = [
+        {'id': item.id, 'description': item.description}
+        for item in StopFactor.objects.filter(is_active=True)
+    ]
+    return MatchingIndex.build(offers, individual_reviews, stop_factors)
+
+
+matching_index = VersionedSnapshot('bank_matching_index', build_matching_index)
+
+
+def match_offers(
+    amount: Decimal | float,
+    term_days: int | None = None,
+    product: str | None = None,
+    law: str | None = None,
+    guarantee_type: str | None = None,
+) -> dict:
+    """Ranked offers for a calculator request (best rate, then commission, then limit)."""
+    query = MatchQuery(
+        amount=float(amount),
+        term_days=term_days,
+        product=product,
+        law=law,
+        guarantee_type=guarantee_type,
+    )
+    return matching_index.current().match(query)
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.4 on 2026-10-19 02:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_conditions', '0003_bank_contact_email_bank_contact_phone_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bank',
+            index=models.Index(fields=['order', 'name'], name='bank_order_name_idx'),
+        ),
+    ]
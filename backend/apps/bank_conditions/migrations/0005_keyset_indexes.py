@@ -0,0 +1,27 @@
+# Generated by Django 5.0.4 on 2026-10-19 04:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_conditions', '0004_admin_table_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bank',
+            index=models.Index(fields=['order', 'id'], name='bank_order_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bank',
+            index=models.Index(fields=['name', 'id'], name='bank_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bank',
+            index=models.Index(fields=['created_at', 'id'], name='bank_created_id_idx'),
+        ),
+    ]
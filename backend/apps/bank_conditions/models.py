@@ -36,6 +36,13 @@ class Bank(models.Model):
         verbose_name = 'Банк-партнёр'
         verbose_name_plural = 'Банки-партнёры'
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['order', 'name'], name='bank_order_name_idx'),
+            # Admin table keyset sorts page on (field, id)
+            models.Index(fields=['order', 'id'], name='bank_order_id_idx'),
+            models.Index(fields=['name', 'id'], name='bank_name_id_idx'),
+            models.Index(fields=['created_at', 'id'], name='bank_created_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
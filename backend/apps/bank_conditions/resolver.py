@@ -0,0 +1,193 @@
+"""
+Bank-name resolver for partner auto-assignment.
+
+Active banks with a linked partner are compiled once per process into:
+- case-insensitive exact name index (name / short_name),
+- normalized-name index and the normalized names themselves (substring matches),
+- token sets and an inverted token index (fuzzy matches).
+
+Resolving a target name only scores the candidate banks found through these
+indexes instead of re-normalizing every bank. Rebuilt on Bank changes
+(see signals.py).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+from typing import Iterable
+
+from apps.core.snapshots import VersionedSnapshot
+
+BANK_STOP_WORDS = {
+    "банк",
+    "банка",
+    "пао",
+    "оао",
+    "зао",
+    "ао",
+    "ооо",
+    "пao",
+    "публичное",
+    "акционерное",
+    "общество",
+}
+
+MIN_MATCH_SCORE = 0.6
+SUBSTRING_SCORE = 0.9
+MIN_SUBSTRING_LENGTH = 3
+
+_NON_WORD_RE = re.compile(r"[^0-9a-zа-я]+")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_bank_name(name: str) -> str:
+    if not name:
+        return ""
+    normalized = name.strip().lower().replace("ё", "е")
+    normalized = _NON_WORD_RE.sub(" ", normalized)
+    normalized = _SPACES_RE.sub(" ", normalized).strip()
+    return normalized
+
+
+def tokenize_bank_name(name: str) -> list[str]:
+    normalized = normalize_bank_name(name)
+    if not normalized:
+        return []
+    return [token for token in normalized.split() if token not in BANK_STOP_WORDS]
+
+
+def token_score(target_tokens: Iterable[str], bank_tokens: Iterable[str]) -> float:
+    target_set = set(target_tokens)
+    bank_set = set(bank_tokens)
+    if not target_set or not bank_set:
+        return 0.0
+    intersection = len(target_set & bank_set)
+    if intersection == 0:
+        return 0.0
+    return intersection / max(len(target_set), len(bank_set))
+
+
+@dataclass(frozen=True)
+class BankNameEntry:
+    bank_id: int
+    partner_user_id: int
+    name_norm: str
+    short_norm: str
+    name_tokens: frozenset
+    short_tokens: frozenset
+
+    def score(self, normalized_target: str, target_tokens: frozenset) -> float:
+        if normalized_target == self.name_norm or (self.short_norm and normalized_target == self.short_norm):
+            return 1.0
+        if len(normalized_target) >= MIN_SUBSTRING_LENGTH and (
+            (self.name_norm and normalized_target in self.name_norm)
+            or (self.short_norm and normalized_target in self.short_norm)
+        ):
+            return SUBSTRING_SCORE
+        return max(
+            token_score(target_tokens, self.name_tokens),
+            token_score(target_tokens, self.short_tokens),
+        )
+
+
+class BankNameIndex:
+    def __init__(self, entries: list[BankNameEntry], exact_index: dict[str, frozenset]):
+        self.entries = tuple(entries)
+        self.exact_index = exact_index
+        token_index: dict[str, set[int]] = {}
+        for position, entry in enumerate(self.entries):
+            for token in entry.name_tokens | entry.short_tokens:
+                token_index.setdefault(token, set()).add(position)
+        self.token_index = {token: frozenset(positions) for token, positions in token_index.items()}
+
+    def _candidates(self, normalized_target: str, target_tokens: frozenset) -> set[int]:
+        candidates: set[int] = set()
+        for token in target_tokens:
+            candidates |= self.token_index.get(token, frozenset())
+        check_substring = len(normalized_target) >= MIN_SUBSTRING_LENGTH
+        for position, entry in enumerate(self.entries):
+            if position in candidates:
+                continue
+            if normalized_target == entry.name_norm or normalized_target == entry.short_norm:
+                candidates.add(position)
+            elif check_substring and (
+                normalized_target in entry.name_norm
+                or (entry.short_norm and normalized_target in entry.short_norm)
+            ):
+                candidates.add(position)
+        return candidates
+
+    def resolve(self, target_bank_name: str) -> int | None:
+        """Partner user id for the bank best matching target_bank_name, or None."""
+        if not target_bank_name:
+            return None
+        cleaned_name = target_bank_name.strip()
+        if not cleaned_name:
+            return None
+
+        exact = self.exact_index.get(cleaned_name.casefold())
+        if exact:
+            if len(exact) == 1:
+                return self.entries[next(iter(exact))].partner_user_id
+            return None
+
+        normalized_target = normalize_bank_name(cleaned_name)
+        if not normalized_target:
+            return None
+        target_tokens = frozenset(tokenize_bank_name(cleaned_name))
+
+        best_entry = None
+        best_score = 0.0
+        is_ambiguous = False
+        for position in self._candidates(normalized_target, target_tokens):
+            entry = self.entries[position]
+            score = entry.score(normalized_target, target_tokens)
+            if score <= 0:
+                continue
+            if score > best_score:
+                best_entry, best_score, is_ambiguous = entry, score, False
+            elif score == best_score:
+                is_ambiguous = True
+
+        if best_entry and best_score >= MIN_MATCH_SCORE and not is_ambiguous:
+            return best_entry.partner_user_id
+        return None
+
+
+def build_bank_name_index() -> BankNameIndex:
+    from .models import Bank
+
+    entries: list[BankNameEntry] = []
+    exact_index: dict[str, set[int]] = {}
+    banks = Bank.objects.filter(is_active=True, partner_user__isnull=False).values_list(
+        'id', 'partner_user_id', 'name', 'short_name'
+    )
+    for bank_id, partner_user_id, name, short_name in banks:
+        position = len(entries)
+        entries.append(BankNameEntry(
+            bank_id=bank_id,
+            partner_user_id=partner_user_id,
+            name_norm=normalize_bank_name(name),
+            short_norm=normalize_bank_name(short_name or ""),
+            name_tokens=frozenset(tokenize_bank_name(name)),
+            short_tokens=frozenset(tokenize_bank_name(short_name or "")),
+        ))
+        for raw in (name, short_name):
+            if raw:
+                exact_index.setdefault(raw.casefold(), set()).add(position)
+
+    return BankNameIndex(entries, {key: frozenset(value) for key, value in exact_index.items()})
+
+
+bank_name_index = VersionedSnapshot('bank_name_index', build_bank_name_index)
+
+
+def resolve_partner_id(target_bank_name: str) -> int | None:
+    return bank_name_index.current().resolve(target_bank_name)
+
+
+def resolve_partner_ids(target_bank_names: Iterable[str]) -> dict[str, int | None]:
+    """Batch variant for flows creating many applications at once (one snapshot read)."""
+    index = bank_name_index.current()
+    return {name: index.resolve(name) for name in set(target_bank_names) if name is not None}
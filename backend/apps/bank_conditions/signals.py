@@ -0,0 +1,14 @@
+"""
+Cache and index invalidation for bank reference data.
+"""
+from apps.core.caching import invalidate_on
+
+from .matching import matching_index
+from .resolver import bank_name_index
+from .models import Bank, BankCondition, IndividualReviewCondition, RKOCondition, StopFactor
+
+for model in (Bank, BankCondition, IndividualReviewCondition, RKOCondition, StopFactor):
+    invalidate_on(model, 'bank_conditions')
+
+matching_index.invalidate_on(Bank, BankCondition, IndividualReviewCondition, StopFactor)
+bank_name_index.invalidate_on(Bank)
@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.bank_conditions.matching import match_offers, matching_index
+from apps.bank_conditions.models import Bank, BankCondition
+from apps.bank_conditions.resolver import bank_name_index, resolve_partner_id, resolve_partner_ids
+from apps.users.models import User
+
+
+class MatchingEngineTest(TestCase):
+    def setUp(self):
+        BankCondition.objects.all().delete()
+        self.bank_a = Bank.objects.create(name='Банк А', order=1)
+        self.bank_b = Bank.objects.create(name='Банк Б', order=2)
+        BankCondition.objects.create(
+            bank=self.bank_a, product='БГ 44-ФЗ', sum_min=Decimal('10000'),
+            sum_max=Decimal('5000000'), term_months=12, rate_min=Decimal('3.0'),
+        )
+        BankCondition.objects.create(
+            bank=self.bank_b, product='БГ', sum_min=Decimal('100000'),
+            sum_max=Decimal('50000000'), term_days=1200, rate_min=Decimal('2.5'),
+        )
+        matching_index.invalidate()
+
+    def _banks(self, **kwargs):
+        return [offer['bank']['name'] for offer in match_offers(**kwargs)['offers']]
+
+    def test_ranked_by_rate_within_sum_interval(self):
+        self.assertEqual(self._banks(amount=1000000, product='bank_guarantee'), ['Банк Б', 'Банк А'])
+        self.assertEqual(self._banks(amount=5000000, product='bank_guarantee'), ['Банк Б', 'Банк А'])
+        self.assertEqual(self._banks(amount=20000, product='bank_guarantee'), ['Банк А'])
+        self.assertEqual(self._banks(amount=60000000, product='bank_guarantee'), [])
+
+    def test_term_and_law_filters(self):
+        self.assertEqual(self._banks(amount=1000000, term_days=720), ['Банк Б'])
+        self.assertEqual(self._banks(amount=1000000, law='223_fz'), ['Банк Б'])
+
+    def test_index_rebuilt_on_change(self):
+        self.assertEqual(self._banks(amount=1000000), ['Банк Б', 'Банк А'])
+        condition = BankCondition.objects.get(bank=self.bank_a)
+        condition.rate_min = Decimal('1.0')
+        with self.captureOnCommitCallbacks(execute=True):
+            condition.save()
+        self.assertEqual(self._banks(amount=1000000), ['Банк А', 'Банк Б'])
+
+
+class BankNameResolverTest(TestCase):
+    def setUp(self):
+        self.partner_sber = User.objects.create_user(email='sber@example.com', password='x', role='partner')
+        self.partner_alfa = User.objects.create_user(email='alfa@example.com', password='x', role='partner')
+        Bank.objects.create(name='ПАО Сбербанк', short_name='Сбер', partner_user=self.partner_sber)
+        self.alfa = Bank.objects.create(name='АО «Альфа-Банк»', short_name='Альфа', partner_user=self.partner_alfa)
+        bank_name_index.invalidate()
+
+    def test_exact_normalized_and_token_matches(self):
+        self.assertEqual(resolve_partner_id('сбер'), self.partner_sber.id)
+        self.assertEqual(resolve_partner_id('Альфа банк'), self.partner_alfa.id)
+        self.assertEqual(resolve_partner_id('Сбербанк России'), None)
+        self.assertIsNone(resolve_partner_id('Неизвестный'))
+        self.assertIsNone(resolve_partner_id('  '))
+
+    def test_batch_and_invalidation(self):
+        self.assertEqual(
+            resolve_partner_ids(['Сбер', 'Альфа']),
+            {'Сбер': self.partner_sber.id, 'Альфа': self.partner_alfa.id},
+        )
+        self.alfa.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.alfa.save()
+        self.assertIsNone(resolve_partner_id('Альфа'))
@@ -2,6 +2,7 @@
 Views for Bank Conditions API.
 """
 import logging
+from decimal import Decimal, InvalidOperation
 
 from django.conf import settings
 from django.db import transaction
@@ -11,6 +12,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema
+from apps.core.caching import get_or_compute, request_key
+from apps.core.json_snapshots import get_json_snapshot, snapshot_response
+from apps.core.tables import AdminTableMixin
+from .matching import DAYS_PER_MONTH, match_offers
 from .models import Bank, BankCondition, IndividualReviewCondition, RKOCondition, StopFactor
 from .serializers import (
     BankSerializer,
@@ -30,6 +35,11 @@ from apps.notifications.email_service import send_reliable_email
 
 logger = logging.getLogger(__name__)
 
+# Shared cache namespace; bumped on any bank/condition change (see signals.py)
+CACHE_NAMESPACE = 'bank_conditions'
+# Snapshot is invalidated explicitly via the namespace version; TTL is only a safety net
+AGGREGATED_SNAPSHOT_TIMEOUT = 24 * 60 * 60
+
 
 class BankViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -39,14 +49,24 @@ class BankViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = BankSerializer
     permission_classes = [IsAuthenticated]
 
+    def list(self, request, *args, **kwargs):
+        data = get_or_compute(
+            CACHE_NAMESPACE,
+            request_key(request),
+            lambda: super(BankViewSet, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
 
-class AdminBankViewSet(viewsets.ModelViewSet):
+class AdminBankViewSet(AdminTableMixin, viewsets.ModelViewSet):
     """
     Admin ViewSet for managing banks.
     """
     serializer_class = AdminBankSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
-    pagination_class = None  # Banks are a small reference table; return all at once
+    table_search_fields = ('name', 'short_name')
+    table_ordering_fields = {'order': 'order', 'name': 'name', 'created_at': 'created_at'}
+    table_default_ordering = 'order'
 
     def get_queryset(self):
         queryset = Bank.objects.all().select_related('partner_user')
@@ -336,6 +356,43 @@ class BankConditionViewSet(viewsets.ReadOnlyModelViewSet):
         
         return queryset
 
+    @action(detail=False, methods=['get'])
+    def match(self, request):
+        """
+        Ranked offers for a calculator request, served from the in-memory index.
+        GET /api/bank-conditions/conditions/match/?amount=1000000&term_days=365&product=bank_guarantee&law=44_fz&guarantee_type=contract_execution
+        """
+        params = request.query_params
+        try:
+            amount = Decimal(str(params.get('amount', '')).replace(' ', '').replace(',', '.'))
+        except InvalidOperation:
+            amount = None
+        if amount is None or not amount.is_finite() or amount <= 0:
+            return Response(
+                {'error': 'Параметр amount обязателен и должен быть положительным числом'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        term_days = None
+        try:
+            if params.get('term_days'):
+                term_days = int(params['term_days'])
+            elif params.get('term_months'):
+                term_days = int(params['term_months']) * DAYS_PER_MONTH
+        except ValueError:
+            return Response(
+                {'error': 'Срок должен быть целым числом'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(match_offers(
+            amount=amount,
+            term_days=term_days,
+            product=params.get('product'),
+            law=params.get('law'),
+            guarantee_type=params.get('guarantee_type'),
+        ))
+
 
 class AdminBankConditionViewSet(viewsets.ModelViewSet):
     """
@@ -438,7 +495,22 @@ class BankConditionsAggregatedViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     
     def list(self, request):
-        """Return all bank conditions data in a single response."""
+        """
+        Return all bank conditions data in a single response.
+
+        Served from a versioned, precompressed JSON snapshot (rebuilt when any
+        bank reference table changes) with a strong ETag, so revalidating
+        clients get 304 without DB or serializer work.
+        """
+        snapshot = get_json_snapshot(
+            CACHE_NAMESPACE, 'aggregated:snapshot', self._aggregate, timeout=AGGREGATED_SNAPSHOT_TIMEOUT
+        )
+        max_age = int(getattr(settings, 'BANK_CONDITIONS_MAX_AGE_SECONDS', 0))
+        return snapshot_response(
+            request, snapshot, cache_control=f'private, max-age={max_age}, must-revalidate'
+        )
+
+    def _aggregate(self):
         data = {
             'banks': Bank.objects.filter(is_active=True),
             'conditions': BankCondition.objects.filter(is_active=True).select_related('bank'),
@@ -448,7 +520,7 @@ class BankConditionsAggregatedViewSet(viewsets.ViewSet):
         }
         
         serializer = BankConditionsAggregatedSerializer(data)
-        return Response(serializer.data)
+        return serializer.data
 
 
 @extend_schema(tags=['Partner Bank Profile'])
@@ -1,17 +1,66 @@
 """
 WebSocket consumers for real-time chat.
 """
+import asyncio
 import json
+import logging
+
+from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.tokens import AccessToken
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from django.conf import settings
+
+from apps.users.authentication import get_user_for_access_token
+from . import presence
+
+logger = logging.getLogger(__name__)
+
+
+def _batch_window_seconds():
+    return max(0, int(getattr(settings, 'CHAT_MESSAGE_BATCH_WINDOW_MS', 20))) / 1000
+
+
+def _batch_max_size():
+    return max(1, int(getattr(settings, 'CHAT_MESSAGE_BATCH_MAX_SIZE', 50)))
+
+
+def _ephemeral_interval_seconds():
+    return max(0, int(getattr(settings, 'CHAT_EPHEMERAL_MIN_INTERVAL_MS', 1000))) / 1000
 
-User = get_user_model()
 
+# Retry delay for an ephemeral event held back by a send in progress
+EPHEMERAL_RETRY_SECONDS = 0.05
+
+
+class PresenceMixin:
+    """Keeps this connection in the presence registry (apps.chat.presence) while it is open."""
+
+    presence_room = None
+    _presence_task = None
+
+    async def presence_join(self, room):
+        self.presence_room = room
+        await sync_to_async(presence.touch)(room, self.user.id, self.channel_name)
+        self._presence_task = asyncio.ensure_future(self._presence_heartbeat())
+
+    async def _presence_heartbeat(self):
+        try:
+            while True:
+                await asyncio.sleep(presence.heartbeat_seconds())
+                await sync_to_async(presence.touch)(self.presence_room, self.user.id, self.channel_name)
+        except asyncio.CancelledError:
+            return
+
+    async def presence_leave(self):
+        if self._presence_task is not None:
+            self._presence_task.cancel()
+            self._presence_task = None
+        if self.presence_room is not None:
+            await sync_to_async(presence.leave)(self.presence_room, self.user.id, self.channel_name)
+            self.presence_room = None
 
-class ApplicationChatConsumer(AsyncWebsocketConsumer):
+
+class ApplicationChatConsumer(PresenceMixin, AsyncWebsocketConsumer):
     """
     WebSocket consumer for per-application chat rooms.
     
@@ -20,12 +69,30 @@ class ApplicationChatConsumer(AsyncWebsocketConsumer):
     Messages are JSON with format:
     - Inbound: {"type": "message", "text": "...", "attachment_url": "..."}
     - Outbound: {"type": "message", "id": ..., "sender": {...}, "text": "...", ...}
+
+    The application id and the access decision are resolved once at connect.
+    Messages arriving within CHAT_MESSAGE_BATCH_WINDOW_MS of each other are
+    inserted together (one thread hop, one bulk INSERT) through
+    apps.applications.messaging, which stores them as TicketMessage rows and
+    broadcasts them to the room in a single group_send.
+
+    Ephemeral events (typing) are throttled per connection: at most one
+    group_send per kind every CHAT_EPHEMERAL_MIN_INTERVAL_MS, carrying the
+    latest state. They never queue behind other sends: while a previous
+    ephemeral send or a message flush is in progress only the latest event is
+    kept and retried shortly after, so the final state (is_typing=false right
+    after a message) always reaches the room.
     """
 
     async def connect(self):
         """Handle WebSocket connection."""
-        self.application_id = self.scope['url_route']['kwargs']['application_id']
+        self.application_id = int(self.scope['url_route']['kwargs']['application_id'])
         self.room_group_name = f'chat_{self.application_id}'
+        self._pending_texts = []
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
+        self._ephemeral = {}
+        self._ephemeral_inflight = False
         
         # Authenticate user via JWT token in query string
         self.user = await self.get_user_from_token()
@@ -47,6 +114,7 @@ class ApplicationChatConsumer(AsyncWebsocketConsumer):
         )
         
         await self.accept()
+        await self.presence_join(self.room_group_name)
         
         # Send connection confirmation
         await self.send(text_data=json.dumps({
@@ -57,6 +125,21 @@ class ApplicationChatConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         """Handle WebSocket disconnect."""
+        await self.presence_leave()
+
+        # Pending ephemeral events are stale once the sender is gone
+        for state in getattr(self, '_ephemeral', {}).values():
+            if state['task'] is not None:
+                state['task'].cancel()
+        self._ephemeral = {}
+
+        # Persist and broadcast whatever is still buffered
+        if getattr(self, '_flush_task', None) is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if getattr(self, '_pending_texts', None):
+            await self.flush_messages()
+
         # Leave room group
         await self.channel_layer.group_discard(
             self.room_group_name,
@@ -99,34 +182,89 @@ class ApplicationChatConsumer(AsyncWebsocketConsumer):
             }))
             return
         
-        # Save message to database
-        message = await self.save_message(text)
-        
-        # Broadcast to room
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'chat_message',
-                'message_id': message.id,
-                'sender_id': self.user.id,
-                'sender_email': self.user.email,
-                'sender_name': self.user.get_full_name() or self.user.email,
-                'sender_role': self.user.role,
-                'text': text,
-                'created_at': message.created_at.isoformat(),
-            }
-        )
+        self._pending_texts.append(text)
+        window = _batch_window_seconds()
+        if not window or len(self._pending_texts) >= _batch_max_size():
+            await self.flush_messages()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_after(window))
+
+    async def _flush_after(self, delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+        self._flush_task = None
+        try:
+            await self.flush_messages()
+        except Exception:
+            logger.exception("Chat %s: failed to flush buffered messages", self.application_id)
+
+    async def flush_messages(self):
+        """Save buffered messages in one batch; the write path broadcasts them with one group_send."""
+        async with self._flush_lock:
+            texts, self._pending_texts = self._pending_texts, []
+            if not texts:
+                return
+            await self.save_messages(texts)
 
     async def handle_typing(self, data):
-        """Handle typing indicator."""
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'typing_indicator',
-                'user_email': self.user.email,
-                'is_typing': data.get('is_typing', True),
-            }
-        )
+        """Handle typing indicator (throttled, see send_ephemeral)."""
+        await self.send_ephemeral('typing', {
+            'type': 'typing_indicator',
+            'user_email': self.user.email,
+            'is_typing': bool(data.get('is_typing', True)),
+        })
+
+    async def send_ephemeral(self, kind, event):
+        """
+        Broadcast an ephemeral event to the room, coalesced per kind: within
+        the interval only the latest event is kept and sent once it elapses.
+        """
+        state = self._ephemeral.setdefault(kind, {'pending': None, 'sent_at': None, 'task': None})
+        state['pending'] = event
+        if state['task'] is not None:
+            # A trailing send is already scheduled and will carry this event
+            return
+        interval = _ephemeral_interval_seconds()
+        now = asyncio.get_running_loop().time()
+        wait = 0 if state['sent_at'] is None else state['sent_at'] + interval - now
+        if wait > 0:
+            state['task'] = asyncio.ensure_future(self._send_ephemeral_later(kind, wait))
+            return
+        await self._dispatch_ephemeral(kind)
+
+    async def _send_ephemeral_later(self, kind, delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+        state = self._ephemeral.get(kind)
+        if state is None:
+            return
+        state['task'] = None
+        await self._dispatch_ephemeral(kind)
+
+    async def _dispatch_ephemeral(self, kind):
+        state = self._ephemeral[kind]
+        if state['pending'] is None:
+            return
+        if self._ephemeral_inflight or self._flush_lock.locked():
+            # Backpressure: keep the latest event and retry instead of waiting behind other sends
+            if state['task'] is None:
+                state['task'] = asyncio.ensure_future(
+                    self._send_ephemeral_later(kind, EPHEMERAL_RETRY_SECONDS)
+                )
+            return
+        event, state['pending'] = state['pending'], None
+        state['sent_at'] = asyncio.get_running_loop().time()
+        self._ephemeral_inflight = True
+        try:
+            await self.channel_layer.group_send(self.room_group_name, event)
+        except Exception as exc:
+            logger.debug("Chat %s: dropped %s event: %s", self.application_id, kind, exc)
+        finally:
+            self._ephemeral_inflight = False
 
     async def handle_read(self, data):
         """Handle message read acknowledgment."""
@@ -146,9 +284,15 @@ class ApplicationChatConsumer(AsyncWebsocketConsumer):
                 'role': event['sender_role'],
             },
             'text': event['text'],
+            'file_url': event.get('file_url'),
             'created_at': event['created_at'],
         }))
 
+    async def chat_messages(self, event):
+        """Send a broadcast batch as individual message frames."""
+        for message in event['messages']:
+            await self.chat_message(message)
+
     async def typing_indicator(self, event):
         """Send typing indicator to WebSocket."""
         # Don't send to the user who is typing
@@ -164,17 +308,8 @@ class ApplicationChatConsumer(AsyncWebsocketConsumer):
         """Extract and validate JWT token from query string."""
         query_string = self.scope.get('query_string', b'').decode()
         params = dict(param.split('=') for param in query_string.split('&') if '=' in param)
-        token_str = params.get('token')
-        
-        if not token_str:
-            return None
-        
-        try:
-            token = AccessToken(token_str)
-            user_id = token.get('user_id')
-            return User.objects.get(id=user_id, is_active=True)
-        except (InvalidToken, TokenError, User.DoesNotExist):
-            return None
+        # Cached principal: no users-table read on reconnect storms
+        return get_user_for_access_token(params.get('token'))
 
     @database_sync_to_async
     def check_application_access(self):
@@ -204,31 +339,28 @@ class ApplicationChatConsumer(AsyncWebsocketConsumer):
         )
 
     @database_sync_to_async
-    def save_message(self, text):
-        """Save message to database."""
-        from apps.applications.models import Application
-        from .models import ApplicationMessage
-        
-        application = Application.objects.get(id=self.application_id)
-        message = ApplicationMessage.objects.create(
-            application=application,
-            sender=self.user,
-            text=text
-        )
-        return message
+    def save_messages(self, texts):
+        """
+        Insert messages through the shared write path (one bulk INSERT for a
+        batch, ChatThread update, one room broadcast after commit).
+        """
+        from apps.applications.messaging import post_messages
+        
+        return post_messages(self.application_id, self.user, [{'content': text} for text in texts])
 
     @database_sync_to_async
     def mark_message_read(self, message_id):
-        """Mark a message as read."""
-        from .models import ApplicationMessage
+        """Mark the room read up to this message (watermark upsert)."""
+        from apps.applications.messaging import mark_thread_read
         
-        ApplicationMessage.objects.filter(
-            id=message_id,
-            application_id=self.application_id
-        ).exclude(sender=self.user).update(is_read=True)
+        try:
+            message_id = int(message_id)
+        except (TypeError, ValueError):
+            return
+        mark_thread_read(self.user, self.application_id, up_to_message_id=message_id)
 
 
-class AdminChatListConsumer(AsyncWebsocketConsumer):
+class AdminChatListConsumer(PresenceMixin, AsyncWebsocketConsumer):
     """
     WebSocket consumer for admin chat list page.
     
@@ -268,6 +400,7 @@ class AdminChatListConsumer(AsyncWebsocketConsumer):
         )
         
         await self.accept()
+        await self.presence_join(self.GROUP_NAME)
         
         # Send initial threads data
         threads = await self.get_chat_threads()
@@ -278,6 +411,7 @@ class AdminChatListConsumer(AsyncWebsocketConsumer):
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnect."""
+        await self.presence_leave()
         await self.channel_layer.group_discard(
             self.GROUP_NAME,
             self.channel_name
@@ -319,17 +453,8 @@ class AdminChatListConsumer(AsyncWebsocketConsumer):
         """Extract and validate JWT token from query string."""
         query_string = self.scope.get('query_string', b'').decode()
         params = dict(param.split('=') for param in query_string.split('&') if '=' in param)
-        token_str = params.get('token')
-        
-        if not token_str:
-            return None
-        
-        try:
-            token = AccessToken(token_str)
-            user_id = token.get('user_id')
-            return User.objects.get(id=user_id, is_active=True)
-        except (InvalidToken, TokenError, User.DoesNotExist):
-            return None
+        # Cached principal: no users-table read on reconnect storms
+        return get_user_for_access_token(params.get('token'))
     
     @database_sync_to_async
     def check_is_admin(self):
@@ -338,99 +463,8 @@ class AdminChatListConsumer(AsyncWebsocketConsumer):
     
     @database_sync_to_async
     def get_chat_threads(self):
-        """Get list of chat threads for admin."""
-        from apps.applications.models import Application, TicketMessage
-        from django.db.models import Count, Q, Max, OuterRef, Subquery, CharField
-        
-        # Subquery to get the role of the last message sender for each application
-        last_message_sender_role = Subquery(
-            TicketMessage.objects.filter(
-                application_id=OuterRef('application_id')
-            ).order_by('-created_at').values('sender__role')[:1],
-            output_field=CharField()
-        )
-        
-        # Get applications with chat activity that need attention
-        threads_data = list(
-            TicketMessage.objects
-            .values('application_id')
-            .annotate(
-                unread_count=Count(
-                    'id', 
-                    filter=Q(is_read=False) & ~Q(sender__role='admin')
-                ),
-                last_message_at=Max('created_at'),
-                last_sender_role=last_message_sender_role,
-            )
-            .filter(
-                Q(unread_count__gt=0) |  # Has unread messages from non-admins
-                ~Q(last_sender_role='admin')  # Last message is not from admin
-            )
-            .order_by('-last_message_at')
-        )
-        
-        result = []
-        application_ids = [t['application_id'] for t in threads_data]
-        
-        if not application_ids:
-            return result
-        
-        # Prefetch applications
-        applications = {
-            app.id: app 
-            for app in Application.objects.filter(id__in=application_ids).select_related('company')
-        }
-        
-        # Get last non-admin message for each application (for preview)
-        last_messages = {}
-        for app_id in application_ids:
-            last_msg = (
-                TicketMessage.objects
-                .filter(application_id=app_id)
-                .exclude(sender__role='admin')
-                .select_related('sender')
-                .order_by('-created_at')
-                .first()
-            )
-            if last_msg:
-                last_messages[app_id] = last_msg
-        
-        for thread in threads_data:
-            app_id = thread['application_id']
-            app = applications.get(app_id)
-            last_msg = last_messages.get(app_id)
-            
-            if not app or not last_msg:
-                continue
-            
-            # Get sender name
-            sender_name = ''
-            sender_email = None
-            if last_msg.sender:
-                if last_msg.sender.first_name or last_msg.sender.last_name:
-                    sender_name = f"{last_msg.sender.first_name or ''} {last_msg.sender.last_name or ''}" .strip()
-                if not sender_name:
-                    sender_name = last_msg.sender.email
-                sender_email = last_msg.sender.email
-            else:
-                sender_name = 'Удалённый пользователь'
-            
-            # Check if admin replied (last message is from admin)
-            admin_replied = thread['last_sender_role'] == 'admin'
-            
-            # Skip if all read AND admin replied
-            if thread['unread_count'] == 0 and admin_replied:
-                continue
-            
-            result.append({
-                'application_id': app_id,
-                'company_name': app.company.name if app.company else f'Заявка #{app_id}',
-                'last_sender_email': sender_email,
-                'last_sender_name': sender_name,
-                'last_message_preview': last_msg.content[:100] if last_msg.content else '[Файл]',
-                'unread_count': thread['unread_count'],
-                'admin_replied': admin_replied,
-                'last_message_at': thread['last_message_at'].isoformat() if thread['last_message_at'] else None,
-            })
+        """Get list of chat threads for admin (same rows as GET /api/applications/chat-threads/)."""
+        from apps.applications.messaging import admin_chat_threads
+        from apps.applications.serializers import ChatThreadSerializer
         
-        return result
+        return [dict(row) for row in ChatThreadSerializer(admin_chat_threads(), many=True).data]
@@ -0,0 +1,98 @@
+"""
+Copy legacy chat.ApplicationMessage rows into applications.TicketMessage
+(the single chat store, see apps.applications.messaging).
+
+Copies get new ids but keep their original created_at; read watermarks are
+(created_at, id) positions, so merged history sorts by time, and the legacy
+is_read flags advance the watermarks after the merge.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.applications.messaging import advance_legacy_watermarks, rebuild_thread_summaries
+from apps.applications.models import TicketMessage
+from apps.chat.models import ApplicationMessage
+
+
+class Command(BaseCommand):
+    help = 'Merge legacy chat messages into TicketMessage and rebuild chat thread summaries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Legacy messages copied per transaction.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Sleep seconds between batches.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, int(options['batch_size']))
+        sleep_seconds = max(0.0, float(options['sleep']))
+
+        after_id = 0
+        merged = 0
+        touched = set()
+        try:
+            while True:
+                batch = list(
+                    ApplicationMessage.objects.filter(pk__gt=after_id).order_by('pk')[:batch_size]
+                )
+                if not batch:
+                    break
+                after_id = batch[-1].pk
+                merged_ids = set(
+                    TicketMessage.objects.filter(
+                        legacy_chat_message_id__in=[legacy.pk for legacy in batch]
+                    ).values_list('legacy_chat_message_id', flat=True)
+                )
+                copies = [
+                    TicketMessage(
+                        application_id=legacy.application_id,
+                        sender_id=legacy.sender_id,
+                        content=legacy.text,
+                        file=legacy.attachment.name or None,
+                        is_read=legacy.is_read,
+                        is_moderated=legacy.is_moderated,
+                        moderated_by_id=legacy.moderated_by_id,
+                        moderated_at=legacy.moderated_at,
+                        legacy_chat_message_id=legacy.pk,
+                    )
+                    for legacy in batch
+                    if legacy.pk not in merged_ids
+                ]
+                if copies:
+                    created_at = {legacy.pk: legacy.created_at for legacy in batch}
+                    with transaction.atomic():
+                        # Plain bulk INSERT: no notifications or broadcasts for history
+                        TicketMessage.objects.bulk_create(copies)
+                        # auto_now_add overwrote created_at on insert; restore the originals
+                        saved = list(
+                            TicketMessage.objects.filter(
+                                legacy_chat_message_id__in=[copy.legacy_chat_message_id for copy in copies]
+                            ).only('id', 'legacy_chat_message_id')
+                        )
+                        for message in saved:
+                            message.created_at = created_at[message.legacy_chat_message_id]
+                        TicketMessage.objects.bulk_update(saved, ['created_at'])
+                    merged += len(copies)
+                    touched.update(copy.application_id for copy in copies)
+                self.stdout.write(f'after_id={after_id} merged={merged}')
+                if sleep_seconds:
+                    time.sleep(sleep_seconds)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Chat merge stopped.'))
+
+        rebuilt = rebuild_thread_summaries(sorted(touched))
+        advanced = advance_legacy_watermarks(sorted(touched))
+        self.stdout.write(self.style.SUCCESS(
+            f'Merged {merged} messages, rebuilt {rebuilt} chat threads, advanced {advanced} read watermarks.'
+        ))
@@ -13,9 +13,9 @@ def chat_attachment_path(instance, filename):
 
 class ApplicationMessage(models.Model):
     """
-    Chat message model.
-    Each Application has its own chat room.
-    All messages are persisted to the database.
+    Legacy chat message model (read-only history).
+    New messages are stored as applications.TicketMessage; existing rows are
+    copied over by the merge_chat_messages management command.
     """
     application = models.ForeignKey(
         'applications.Application',
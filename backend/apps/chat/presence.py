@@ -0,0 +1,148 @@
+"""
+Presence registry for chat rooms (chat_<application_id>) and the admin
+inbox (admin_chat_threads).
+
+Every WebSocket connection registers itself (user id + channel name) with an
+expiry CHAT_PRESENCE_TTL_SECONDS ahead and refreshes it every
+CHAT_PRESENCE_HEARTBEAT_SECONDS, so connections of crashed workers drop out on
+their own. With the Redis cache backend a room is one sorted set scored by
+expiry (shared by daphne and the web workers); other cache backends keep a
+{member: expiry} dict under one cache key, updated under a short cache.add()
+lock so concurrent connects do not overwrite each other's entries.
+
+Chat notifications consult online_user_ids() to skip users who already see
+the message in the open thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.redis_client import get_redis_client, redis_key, uses_redis_cache
+
+logger = logging.getLogger(__name__)
+
+ADMIN_INBOX_ROOM = 'admin_chat_threads'
+
+# Fallback (non-Redis) room lock: held only around one get/set pair
+LOCK_TIMEOUT_SECONDS = 5
+LOCK_WAIT_SECONDS = 2
+LOCK_POLL_SECONDS = 0.005
+
+
+def chat_room(application_id) -> str:
+    return f'chat_{application_id}'
+
+
+def ttl_seconds() -> int:
+    return max(1, int(getattr(settings, 'CHAT_PRESENCE_TTL_SECONDS', 60)))
+
+
+def heartbeat_seconds() -> int:
+    return max(1, int(getattr(settings, 'CHAT_PRESENCE_HEARTBEAT_SECONDS', 20)))
+
+
+def _enabled() -> bool:
+    return getattr(settings, 'CHAT_PRESENCE_ENABLED', True)
+
+
+def _key(room: str) -> str:
+    return f'presence:{room}'
+
+
+def _member(user_id, channel_name: str) -> str:
+    return f'{user_id}:{channel_name}'
+
+
+def _redis(key: str):
+    return redis_key(key), get_redis_client()
+
+
+@contextmanager
+def _room_lock(room: str):
+    lock_key = f'{_key(room)}:lock'
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + LOCK_WAIT_SECONDS
+    while not cache.add(lock_key, token, timeout=LOCK_TIMEOUT_SECONDS):
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f'presence lock {lock_key} is busy')
+        time.sleep(LOCK_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        # Only release our own lock (it may have expired and been taken over)
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def _update_members(room: str, update) -> None:
+    """Read-modify-write of the fallback {member: expiry} dict under the room lock."""
+    with _room_lock(room):
+        now = time.time()
+        members = {
+            name: expiry for name, expiry in (cache.get(_key(room)) or {}).items() if expiry > now
+        }
+        update(members)
+        cache.set(_key(room), members, timeout=ttl_seconds())
+
+
+def touch(room: str, user_id, channel_name: str) -> None:
+    """Register (or keep alive) a connection in the room."""
+    if not _enabled():
+        return
+    now = time.time()
+    expires = now + ttl_seconds()
+    member = _member(user_id, channel_name)
+    try:
+        if uses_redis_cache():
+            key, client = _redis(_key(room))
+            pipe = client.pipeline()
+            pipe.zadd(key, {member: expires})
+            pipe.zremrangebyscore(key, '-inf', now)
+            pipe.expire(key, ttl_seconds())
+            pipe.execute()
+            return
+        _update_members(room, lambda members: members.update({member: expires}))
+    except Exception as exc:
+        logger.warning("Presence %s: update failed: %s", room, exc)
+
+
+def leave(room: str, user_id, channel_name: str) -> None:
+    if not _enabled():
+        return
+    member = _member(user_id, channel_name)
+    try:
+        if uses_redis_cache():
+            key, client = _redis(_key(room))
+            client.zrem(key, member)
+            return
+        _update_members(room, lambda members: members.pop(member, None))
+    except Exception as exc:
+        logger.warning("Presence %s: leave failed: %s", room, exc)
+
+
+def online_user_ids(room: str) -> set[int]:
+    """Users with at least one live connection in the room (empty if unknown)."""
+    if not _enabled():
+        return set()
+    now = time.time()
+    try:
+        if uses_redis_cache():
+            key, client = _redis(_key(room))
+            members = [
+                member.decode() if isinstance(member, bytes) else member
+                for member in client.zrangebyscore(key, now, '+inf')
+            ]
+        else:
+            members = [name for name, expiry in (cache.get(_key(room)) or {}).items() if expiry > now]
+    except Exception as exc:
+        # Unknown presence means "offline": notifications still go out
+        logger.warning("Presence %s: lookup failed: %s", room, exc)
+        return set()
+    return {int(member.split(':', 1)[0]) for member in members}
@@ -1,21 +1,30 @@
 """
 API Serializers for Chat.
+
+Messages are stored as applications.TicketMessage (the single chat store);
+the /api/chat/ field names are kept: text -> content, attachment -> file.
 """
 from rest_framework import serializers
-from .models import ApplicationMessage
+from apps.applications.messaging import post_message
+from apps.applications.models import TicketMessage
+from apps.applications.serializers import ReadMarkersListSerializer, ReadStateMixin
 
 
-class MessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(ReadStateMixin, serializers.ModelSerializer):
     """
     Full serializer for chat messages.
     """
     sender_email = serializers.SerializerMethodField()
     sender_name = serializers.CharField(read_only=True)
     sender_role = serializers.CharField(read_only=True)
+    text = serializers.CharField(source='content')
+    attachment = serializers.FileField(source='file', required=False, allow_null=True)
     attachment_url = serializers.SerializerMethodField()
+    is_read = serializers.SerializerMethodField()
 
     class Meta:
-        model = ApplicationMessage
+        model = TicketMessage
+        list_serializer_class = ReadMarkersListSerializer
         fields = [
             'id',
             'application',
@@ -45,11 +54,11 @@ class MessageSerializer(serializers.ModelSerializer):
 
     def get_attachment_url(self, obj):
         """Get full URL for attachment."""
-        if obj.attachment:
+        if obj.file:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.attachment.url)
-            return obj.attachment.url
+                return request.build_absolute_uri(obj.file.url)
+            return obj.file.url
         return None
 
 
@@ -57,8 +66,11 @@ class MessageCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating chat messages.
     """
+    text = serializers.CharField(source='content')
+    attachment = serializers.FileField(source='file', required=False, allow_null=True)
+
     class Meta:
-        model = ApplicationMessage
+        model = TicketMessage
         fields = [
             'application',
             'text',
@@ -84,21 +96,28 @@ class MessageCreateSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        """Set sender from request user."""
-        validated_data['sender'] = self.context['request'].user
-        return super().create(validated_data)
+        """Save through the shared chat write path (thread summary + broadcast)."""
+        return post_message(
+            validated_data['application'].id,
+            self.context['request'].user,
+            content=validated_data['content'],
+            file=validated_data.get('file'),
+        )
 
 
-class MessageListSerializer(serializers.ModelSerializer):
+class MessageListSerializer(ReadStateMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for message list.
     """
     sender_email = serializers.SerializerMethodField()
     sender_name = serializers.CharField(read_only=True)
     sender_role = serializers.CharField(read_only=True)
+    text = serializers.CharField(source='content', read_only=True)
+    is_read = serializers.SerializerMethodField()
 
     class Meta:
-        model = ApplicationMessage
+        model = TicketMessage
+        list_serializer_class = ReadMarkersListSerializer
         fields = [
             'id',
             'sender_email',
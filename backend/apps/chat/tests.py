@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications import messaging
+from apps.applications.models import Application, TicketMessage
+from apps.chat import presence
+from apps.chat.routing import websocket_urlpatterns
+from apps.companies.models import CompanyProfile
+from apps.users.models import User, UserRole
+
+
+@override_settings(CHAT_MESSAGE_BATCH_WINDOW_MS=50, CHAT_EPHEMERAL_MIN_INTERVAL_MS=200)
+class ApplicationChatConsumerTest(TransactionTestCase):
+    """Broadcasts need real commits (on_commit), hence TransactionTestCase."""
+
+    def setUp(self):
+        self.agent = User.objects.create_user(email='ws_agent@example.com', password='x', role=UserRole.AGENT)
+        self.admin = User.objects.create_user(email='ws_admin@example.com', password='x', role=UserRole.ADMIN)
+        company = CompanyProfile.objects.create(owner=self.agent, inn='7707083893', name='ООО Ромашка')
+        self.application = Application.objects.create(
+            created_by=self.agent, company=company, product_type='bank_guarantee',
+            amount='1000000', term_months=12,
+        )
+
+    async def _connect(self, user):
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns),
+            f'/ws/chat/application/{self.application.id}/?token={AccessToken.for_user(user)}',
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual((await communicator.receive_json_from())['type'], 'connection_established')
+        return communicator
+
+    async def _frames(self, communicator, timeout=0.6):
+        frames = []
+        # receive_json_from() timing out would cancel the consumer
+        while not await communicator.receive_nothing(timeout=timeout):
+            frames.append(await communicator.receive_json_from())
+        return frames
+
+    async def test_typing_is_throttled_and_final_state_delivered(self):
+        agent = await self._connect(self.agent)
+        admin = await self._connect(self.admin)
+
+        for _ in range(5):
+            await agent.send_json_to({'type': 'typing', 'is_typing': True})
+        await agent.send_json_to({'type': 'typing', 'is_typing': False})
+
+        frames = await self._frames(admin)
+        self.assertEqual([frame['is_typing'] for frame in frames], [True, False])
+        await agent.disconnect()
+        await admin.disconnect()
+
+    async def test_final_typing_state_survives_message_flush(self):
+        post_messages = messaging.post_messages
+
+        def slow_post_messages(*args, **kwargs):
+            time.sleep(0.3)
+            return post_messages(*args, **kwargs)
+
+        agent = await self._connect(self.agent)
+        admin = await self._connect(self.admin)
+        with mock.patch('apps.applications.messaging.post_messages', side_effect=slow_post_messages):
+            await agent.send_json_to({'type': 'message', 'text': 'Документы загружены'})
+            # Arrives while the batch is being written
+            await asyncio.sleep(0.15)
+            await agent.send_json_to({'type': 'typing', 'is_typing': False})
+            frames = await self._frames(admin)
+
+        self.assertEqual([frame['type'] for frame in frames], ['message', 'typing'])
+        self.assertFalse(frames[-1]['is_typing'])
+        await agent.disconnect()
+        await admin.disconnect()
+
+    async def test_messages_within_window_are_written_as_one_batch(self):
+        agent = await self._connect(self.agent)
+        admin = await self._connect(self.admin)
+        with mock.patch(
+            'apps.applications.messaging.post_messages', wraps=messaging.post_messages,
+        ) as post_messages:
+            for text in ('Раз', 'Два', 'Три'):
+                await agent.send_json_to({'type': 'message', 'text': text})
+            frames = await self._frames(admin)
+
+        self.assertEqual([frame['text'] for frame in frames], ['Раз', 'Два', 'Три'])
+        self.assertEqual(post_messages.call_count, 1)
+        count = await database_sync_to_async(TicketMessage.objects.filter(application=self.application).count)()
+        self.assertEqual(count, 3)
+        await agent.disconnect()
+        await admin.disconnect()
+
+
+class PresenceFallbackTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_connects_keep_every_member(self):
+        room = presence.chat_room(1)
+        get = LocMemCache.get
+
+        def slow_get(self, *args, **kwargs):
+            # Widen the read-modify-write window
+            value = get(self, *args, **kwargs)
+            time.sleep(0.01)
+            return value
+
+        with mock.patch.object(LocMemCache, 'get', slow_get):
+            threads = [
+                threading.Thread(target=presence.touch, args=(room, user_id, f'channel-{user_id}'))
+                for user_id in range(1, 9)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(presence.online_user_ids(room), set(range(1, 9)))
+        presence.leave(room, 3, 'channel-3')
+        self.assertNotIn(3, presence.online_user_ids(room))
@@ -5,18 +5,20 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from django.utils import timezone
 from django.db.models import Q
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
-from .models import ApplicationMessage
+from apps.applications.messaging import ReadMarkers, chat_history, mark_thread_read, parse_history_params
+from apps.applications.models import TicketMessage
 from .serializers import (
     MessageSerializer,
     MessageCreateSerializer,
     MessageListSerializer,
     MessageModerateSerializer,
 )
+from apps.applications.views import CHAT_HISTORY_PARAMETERS, CHAT_HISTORY_RESPONSE
 from apps.users.permissions import IsAdmin
 
 
@@ -28,7 +30,7 @@ from apps.users.permissions import IsAdmin
 )
 class MessageViewSet(viewsets.ModelViewSet):
     """
-    ViewSet for Chat Messages.
+    ViewSet for Chat Messages (stored as applications.TicketMessage).
     
     Provides REST API for:
     - Loading message history before connecting to WebSocket
@@ -45,7 +47,7 @@ class MessageViewSet(viewsets.ModelViewSet):
         # Filter by application if provided
         application_id = self.request.query_params.get('application_id')
         # Optimize: select_related('sender') to avoid N+1 queries on sender.email
-        queryset = ApplicationMessage.objects.select_related('sender').all()
+        queryset = TicketMessage.objects.select_related('sender').all()
         
         if application_id:
             queryset = queryset.filter(application_id=application_id)
@@ -70,9 +72,14 @@ class MessageViewSet(viewsets.ModelViewSet):
             return MessageListSerializer
         return MessageSerializer
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['read_markers'] = ReadMarkers(self.request.user)
+        return context
+
     def perform_create(self, serializer):
-        """Set sender to current user."""
-        serializer.save(sender=self.request.user)
+        """Sender is the current user (set by MessageCreateSerializer.create)."""
+        serializer.save()
 
     @extend_schema(
         request=MessageModerateSerializer,
@@ -91,9 +98,9 @@ class MessageViewSet(viewsets.ModelViewSet):
         message.is_moderated = serializer.validated_data['is_moderated']
         message.moderated_by = request.user
         message.moderated_at = timezone.now()
-        message.save()
+        message.save(update_fields=['is_moderated', 'moderated_by', 'moderated_at'])
         
-        return Response(MessageSerializer(message, context={'request': request}).data)
+        return Response(MessageSerializer(message, context=self.get_serializer_context()).data)
 
     @extend_schema(responses={200: MessageListSerializer(many=True)})
     @action(detail=False, methods=['get'])
@@ -113,10 +120,37 @@ class MessageViewSet(viewsets.ModelViewSet):
             )
         
         queryset = self.get_queryset().filter(application_id=application_id)
-        serializer = MessageListSerializer(queryset, many=True)
+        serializer = MessageListSerializer(queryset, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
 
-    @action(detail=False, methods=['post'])
+    @extend_schema(parameters=CHAT_HISTORY_PARAMETERS, responses={200: CHAT_HISTORY_RESPONSE})
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """
+        Compact cursor-based history for one application.
+        GET /api/chat/history/?application_id={id}&before=|after=|since=&limit=
+        
+        After a WebSocket reconnect pass since=<last received id> to fetch only the gap.
+        """
+        try:
+            application_id = int(request.query_params.get('application_id', ''))
+        except ValueError:
+            return Response(
+                {'error': 'application_id is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            params = parse_history_params(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = chat_history(
+            self.get_queryset(), request.user, application_id,
+            url_base=request.build_absolute_uri('/').rstrip('/'), **params,
+        )
+        return Response(data)
+
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, FormParser])
     def mark_read(self, request):
         """
         Mark messages as read.
@@ -131,9 +165,19 @@ class MessageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Mark as read only messages not sent by current user
-        updated = ApplicationMessage.objects.filter(
-            id__in=message_ids
-        ).exclude(sender=request.user).update(is_read=True)
+        # Advance the reader's watermark per application up to the latest given message
+        # in chat order (created_at, id); merged legacy messages have high ids but old times
+        targets = {}
+        for application_id, message_id in (
+            self.get_queryset()
+            .filter(id__in=message_ids)
+            .order_by('created_at', 'id')
+            .values_list('application_id', 'id')
+        ):
+            targets[application_id] = message_id
+        updated = sum(
+            mark_thread_read(request.user, application_id, up_to_message_id=last_id)
+            for application_id, last_id in targets.items()
+        )
         
         return Response({'updated': updated})
@@ -0,0 +1,106 @@
+"""
+Compact company snapshots for Application.full_client_data.
+
+The full snapshot is stored once per distinct company state in
+CompanySnapshotBase; each application keeps only a reference to the base and
+the keys that differ from it:
+
+    {"snapshot_base": <base id>, "changes": {...}, "removed": [...]}
+
+Applications sent from an unchanged profile share one base with an empty
+diff. Legacy full snapshots (plain dicts with "inn") are returned as-is by
+expand_client_snapshot().
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+from apps.core.caching import get_or_compute
+
+from .models import CompanySnapshotBase
+
+BASE_KEY = 'snapshot_base'
+SNAPSHOTS_NAMESPACE = 'company_snapshots'
+BASE_CACHE_TIMEOUT = 86400
+
+
+def _content_hash(snapshot: dict) -> str:
+    payload = json.dumps(snapshot, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def is_compact(data) -> bool:
+    return isinstance(data, dict) and BASE_KEY in data
+
+
+def _diff(base: dict, snapshot: dict) -> tuple[dict, list]:
+    changes = {key: value for key, value in snapshot.items() if key not in base or base[key] != value}
+    removed = sorted(key for key in base if key not in snapshot)
+    return changes, removed
+
+
+def compact_client_snapshot(company_id: int, snapshot: dict) -> dict:
+    """
+    Store `snapshot` as a diff against the company's latest base, starting a
+    new base when there is none or when more than half of the keys changed.
+    """
+    base = CompanySnapshotBase.objects.filter(company_id=company_id).order_by('-created_at', '-id').first()
+    if base is not None:
+        changes, removed = _diff(base.data, snapshot)
+        if len(changes) + len(removed) <= len(snapshot) // 2:
+            return {BASE_KEY: base.id, 'changes': changes, 'removed': removed}
+
+    base, _ = CompanySnapshotBase.objects.get_or_create(
+        content_hash=_content_hash(snapshot),
+        defaults={'company_id': company_id, 'data': snapshot},
+    )
+    return {BASE_KEY: base.id, 'changes': {}, 'removed': []}
+
+
+def _load_base(base_id: int) -> dict | None:
+    return CompanySnapshotBase.objects.filter(pk=base_id).values_list('data', flat=True).first()
+
+
+def expand_client_snapshot(data) -> dict | None:
+    """Full snapshot dict for compact or legacy full_client_data (None if empty)."""
+    if not data or not isinstance(data, dict):
+        return None
+    if not is_compact(data):
+        return data
+
+    base_id = data[BASE_KEY]
+    # Bases are immutable: cache them by id
+    base = get_or_compute(SNAPSHOTS_NAMESPACE, base_id, lambda: _load_base(base_id), timeout=BASE_CACHE_TIMEOUT)
+    if base is None:
+        return None
+    removed = set(data.get('removed') or ())
+    snapshot = {key: value for key, value in base.items() if key not in removed}
+    snapshot.update(data.get('changes') or {})
+    return snapshot
+
+
+def compact_legacy_snapshots_batch(batch_size: int, after_id: int = 0) -> tuple[int, int, int | None]:
+    """
+    Convert one batch of legacy full snapshots (applications with id > after_id).
+    Returns (processed, compacted, last_id); last_id is None when done.
+    """
+    from apps.applications.models import Application
+
+    applications = list(
+        Application.objects.filter(pk__gt=after_id, company__isnull=False)
+        .exclude(full_client_data={})
+        .order_by('pk')
+        .only('pk', 'company_id', 'full_client_data')[:batch_size]
+    )
+    compacted = 0
+    for application in applications:
+        data = application.full_client_data
+        if is_compact(data) or not isinstance(data, dict) or not data.get('inn'):
+            continue
+        compact = compact_client_snapshot(application.company_id, data)
+        Application.objects.filter(pk=application.pk).update(full_client_data=compact)
+        compacted += 1
+    last_id = applications[-1].pk if applications else None
+    return len(applications), compacted, last_id
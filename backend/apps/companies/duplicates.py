@@ -0,0 +1,64 @@
+"""
+INN duplicate clusters among CRM clients.
+
+All CRM companies are grouped by INN with one GROUP BY ... HAVING query; the
+resulting {inn: cluster} map is cached in the 'company_duplicates' namespace
+and invalidated when a CRM company is created or deleted or its inn /
+is_crm_client changes (see signals.py). A cluster id
+is the smallest company id in the group, so it stays stable while the
+cluster's first member exists.
+"""
+
+from django.db.models import Count, Min
+
+from apps.core.caching import get_or_compute
+
+from .models import CompanyProfile
+
+DUPLICATES_NAMESPACE = 'company_duplicates'
+DUPLICATES_TIMEOUT = 600
+
+
+def compute_duplicate_clusters() -> dict[str, dict]:
+    rows = (
+        CompanyProfile.objects.filter(is_crm_client=True)
+        .exclude(inn='')
+        .order_by()
+        .values('inn')
+        .annotate(size=Count('id'), cluster_id=Min('id'))
+        .filter(size__gt=1)
+    )
+    return {row['inn']: {'cluster_id': row['cluster_id'], 'size': row['size']} for row in rows}
+
+
+def get_duplicate_clusters() -> dict[str, dict]:
+    return get_or_compute(DUPLICATES_NAMESPACE, 'clusters', compute_duplicate_clusters, timeout=DUPLICATES_TIMEOUT)
+
+
+def get_duplicate_report() -> list[dict]:
+    """Clusters with their members, largest first (two queries on a cold cache, one on a warm one)."""
+    clusters = get_duplicate_clusters()
+    if not clusters:
+        return []
+
+    members: dict[str, list] = {inn: [] for inn in clusters}
+    companies = (
+        CompanyProfile.objects.filter(is_crm_client=True, inn__in=list(clusters))
+        .select_related('owner')
+        .order_by('inn', 'id')
+    )
+    for company in companies:
+        members[company.inn].append(company)
+
+    report = [
+        {
+            'inn': inn,
+            'cluster_id': cluster['cluster_id'],
+            'size': len(members[inn]),
+            'companies': members[inn],
+        }
+        for inn, cluster in clusters.items()
+        if len(members[inn]) > 1
+    ]
+    report.sort(key=lambda item: (-item['size'], item['cluster_id']))
+    return report
@@ -0,0 +1,66 @@
+"""
+Backfill normalized company child tables and compact application snapshots.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.companies.client_snapshots import compact_legacy_snapshots_batch
+from apps.companies.relations import backfill_relations_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Populate CompanyFounder / CompanyBankAccount / CompanyLicense from company JSON '
+        'and optionally convert legacy Application.full_client_data snapshots to diffs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Rows processed per batch.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Pause in seconds between batches (to limit DB load).',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild child rows even if the stored digest matches.',
+        )
+        parser.add_argument(
+            '--snapshots',
+            action='store_true',
+            help='Also compact legacy full_client_data snapshots.',
+        )
+
+    def _run(self, label, batch, batch_size, sleep_seconds, **kwargs):
+        after_id = 0
+        total_processed = total_changed = 0
+        while True:
+            processed, changed, last_id = batch(batch_size, after_id=after_id, **kwargs)
+            if last_id is None:
+                break
+            total_processed += processed
+            total_changed += changed
+            after_id = last_id
+            self.stdout.write(f"{label}: processed={total_processed} changed={total_changed} last_id={last_id}")
+            if sleep_seconds:
+                time.sleep(sleep_seconds)
+        self.stdout.write(self.style.SUCCESS(
+            f"{label} done: processed={total_processed} changed={total_changed}"
+        ))
+
+    def handle(self, *args, **options):
+        batch_size = max(1, int(options['batch_size']))
+        sleep_seconds = max(0.0, float(options['sleep']))
+
+        self._run('relations', backfill_relations_batch, batch_size, sleep_seconds, force=options['force'])
+        if options['snapshots']:
+            self._run('snapshots', compact_legacy_snapshots_batch, batch_size, sleep_seconds)
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.4 on 2026-10-19 02:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Trigram indexes serving company search (UPPER(...) LIKE for name icontains,
+# LIKE 'prefix%' for INN/OGRN). PostgreSQL only.
+TRIGRAM_INDEXES = {
+    'company_name_trgm_idx': '(UPPER(name::text)) gin_trgm_ops',
+    'company_short_name_trgm_idx': '(UPPER(short_name::text)) gin_trgm_ops',
+    'company_inn_trgm_idx': 'inn gin_trgm_ops',
+    'company_ogrn_trgm_idx': 'ogrn gin_trgm_ops',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, expression in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON companies_companyprofile USING gin ({expression})'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0014_alter_companyprofile_owner'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=models.Index(fields=['inn', 'is_crm_client'], name='company_inn_crm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=models.Index(fields=['is_crm_client', '-created_at'], name='company_crm_created_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
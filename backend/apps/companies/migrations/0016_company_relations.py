@@ -0,0 +1,114 @@
+# Generated by Django 5.0.4 on 2026-10-19 02:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# jsonb_path_ops GIN indexes for containment lookups inside the JSON lists,
+# e.g. founders_data__contains=[{'inn': '...'}]. PostgreSQL only.
+JSONB_INDEXED_FIELDS = (
+    'founders_data',
+    'legal_founders_data',
+    'bank_accounts_data',
+    'licenses_data',
+    'activities_data',
+)
+
+
+def create_jsonb_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in JSONB_INDEXED_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS company_{field}_gin_idx '
+            f'ON companies_companyprofile USING gin ({field} jsonb_path_ops)'
+        )
+
+
+def drop_jsonb_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in JSONB_INDEXED_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS company_{field}_gin_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0015_company_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='companyprofile',
+            name='relations_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40, verbose_name='Хэш связанных данных'),
+        ),
+        migrations.CreateModel(
+            name='CompanyBankAccount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='Позиция в списке')),
+                ('bank_name', models.CharField(blank=True, default='', max_length=300, verbose_name='Банк')),
+                ('bank_bik', models.CharField(blank=True, db_index=True, default='', max_length=9, verbose_name='БИК')),
+                ('account', models.CharField(blank=True, db_index=True, default='', max_length=20, verbose_name='Расчётный счёт')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bank_account_rows', to='companies.companyprofile', verbose_name='Компания')),
+            ],
+            options={
+                'verbose_name': 'Банковский счёт',
+                'verbose_name_plural': 'Банковские счета',
+                'ordering': ['company', 'position'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyFounder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('individual', 'Физ. лицо'), ('legal', 'Юр. лицо')], max_length=20, verbose_name='Тип')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='Позиция в списке')),
+                ('inn', models.CharField(blank=True, db_index=True, default='', max_length=12, verbose_name='ИНН')),
+                ('ogrn', models.CharField(blank=True, default='', max_length=15, verbose_name='ОГРН')),
+                ('name', models.CharField(blank=True, default='', max_length=500, verbose_name='Наименование / ФИО')),
+                ('share', models.DecimalField(blank=True, decimal_places=4, max_digits=9, null=True, verbose_name='Доля (%)')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='founder_rows', to='companies.companyprofile', verbose_name='Компания')),
+            ],
+            options={
+                'verbose_name': 'Учредитель',
+                'verbose_name_plural': 'Учредители',
+                'ordering': ['company', 'kind', 'position'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyLicense',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='Позиция в списке')),
+                ('license_type', models.CharField(blank=True, default='', max_length=100, verbose_name='Тип')),
+                ('name', models.CharField(blank=True, default='', max_length=500, verbose_name='Наименование')),
+                ('number', models.CharField(blank=True, db_index=True, default='', max_length=100, verbose_name='Номер')),
+                ('valid_until', models.CharField(blank=True, default='', max_length=20, verbose_name='Действует до')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='license_rows', to='companies.companyprofile', verbose_name='Компания')),
+            ],
+            options={
+                'verbose_name': 'Лицензия',
+                'verbose_name_plural': 'Лицензии',
+                'ordering': ['company', 'position'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanySnapshotBase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True, verbose_name='Хэш содержимого')),
+                ('data', models.JSONField(default=dict, verbose_name='Снимок данных')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot_bases', to='companies.companyprofile', verbose_name='Компания')),
+            ],
+            options={
+                'verbose_name': 'Базовый снимок компании',
+                'verbose_name_plural': 'Базовые снимки компаний',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['company', '-created_at'], name='company_snapshot_latest_idx')],
+            },
+        ),
+        migrations.RunPython(create_jsonb_indexes, drop_jsonb_indexes),
+    ]
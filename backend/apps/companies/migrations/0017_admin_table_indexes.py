@@ -0,0 +1,23 @@
+# Generated by Django 5.0.4 on 2026-10-19 02:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0016_company_relations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=models.Index(fields=['is_crm_client', 'name', 'id'], name='company_crm_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=models.Index(fields=['is_crm_client', 'client_status', 'id'], name='company_crm_status_idx'),
+        ),
+    ]
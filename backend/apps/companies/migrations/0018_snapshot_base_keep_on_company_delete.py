@@ -0,0 +1,19 @@
+# Generated by Django 5.0.4 on 2026-10-19 03:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0017_admin_table_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='companysnapshotbase',
+            name='company',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='snapshot_bases', to='companies.companyprofile', verbose_name='Компания'),
+        ),
+    ]
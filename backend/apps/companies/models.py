@@ -525,6 +525,16 @@ class CompanyProfile(models.Model):
         blank=True,
         help_text='XML или PDF файл машиночитаемой доверенности'
     )
+
+    # Digest of the JSON lists mirrored into CompanyFounder / CompanyBankAccount /
+    # CompanyLicense; rows are rebuilt only when it changes (see relations.py)
+    relations_hash = models.CharField(
+        'Хэш связанных данных',
+        max_length=40,
+        blank=True,
+        default='',
+        editable=False
+    )
     
     # Timestamps
     created_at = models.DateTimeField('Дата создания', auto_now_add=True)
@@ -534,6 +544,12 @@ class CompanyProfile(models.Model):
         verbose_name = 'Профиль компании'
         verbose_name_plural = 'Профили компаний'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['inn', 'is_crm_client'], name='company_inn_crm_idx'),
+            models.Index(fields=['is_crm_client', '-created_at'], name='company_crm_created_idx'),
+            models.Index(fields=['is_crm_client', 'name', 'id'], name='company_crm_name_idx'),
+            models.Index(fields=['is_crm_client', 'client_status', 'id'], name='company_crm_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.short_name or self.name} (ИНН: {self.inn})"
@@ -544,3 +560,121 @@ class CompanyProfile(models.Model):
         if self.inn:
             return f"https://checko.ru/company/{self.inn}"
         return None
+
+
+
+# =============================================================================
+# NORMALIZED CHILD TABLES
+# Queryable mirror of the JSON lists above. The JSONFields remain the source
+# of truth; rows are rebuilt by apps.companies.relations on change.
+# =============================================================================
+
+class CompanyFounder(models.Model):
+    """Founder row mirrored from founders_data / legal_founders_data."""
+
+    KIND_INDIVIDUAL = 'individual'
+    KIND_LEGAL = 'legal'
+    KIND_CHOICES = [
+        (KIND_INDIVIDUAL, 'Физ. лицо'),
+        (KIND_LEGAL, 'Юр. лицо'),
+    ]
+
+    company = models.ForeignKey(
+        CompanyProfile,
+        on_delete=models.CASCADE,
+        related_name='founder_rows',
+        verbose_name='Компания'
+    )
+    kind = models.CharField('Тип', max_length=20, choices=KIND_CHOICES)
+    position = models.PositiveIntegerField('Позиция в списке', default=0)
+    inn = models.CharField('ИНН', max_length=12, blank=True, default='', db_index=True)
+    ogrn = models.CharField('ОГРН', max_length=15, blank=True, default='')
+    name = models.CharField('Наименование / ФИО', max_length=500, blank=True, default='')
+    share = models.DecimalField('Доля (%)', max_digits=9, decimal_places=4, null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Учредитель'
+        verbose_name_plural = 'Учредители'
+        ordering = ['company', 'kind', 'position']
+
+    def __str__(self):
+        return f"{self.name} (ИНН: {self.inn})"
+
+
+class CompanyBankAccount(models.Model):
+    """Bank account row mirrored from bank_accounts_data."""
+
+    company = models.ForeignKey(
+        CompanyProfile,
+        on_delete=models.CASCADE,
+        related_name='bank_account_rows',
+        verbose_name='Компания'
+    )
+    position = models.PositiveIntegerField('Позиция в списке', default=0)
+    bank_name = models.CharField('Банк', max_length=300, blank=True, default='')
+    bank_bik = models.CharField('БИК', max_length=9, blank=True, default='', db_index=True)
+    account = models.CharField('Расчётный счёт', max_length=20, blank=True, default='', db_index=True)
+
+    class Meta:
+        verbose_name = 'Банковский счёт'
+        verbose_name_plural = 'Банковские счета'
+        ordering = ['company', 'position']
+
+    def __str__(self):
+        return f"{self.account} ({self.bank_name})"
+
+
+class CompanyLicense(models.Model):
+    """License / SRO row mirrored from licenses_data."""
+
+    company = models.ForeignKey(
+        CompanyProfile,
+        on_delete=models.CASCADE,
+        related_name='license_rows',
+        verbose_name='Компания'
+    )
+    position = models.PositiveIntegerField('Позиция в списке', default=0)
+    license_type = models.CharField('Тип', max_length=100, blank=True, default='')
+    name = models.CharField('Наименование', max_length=500, blank=True, default='')
+    number = models.CharField('Номер', max_length=100, blank=True, default='', db_index=True)
+    valid_until = models.CharField('Действует до', max_length=20, blank=True, default='')
+
+    class Meta:
+        verbose_name = 'Лицензия'
+        verbose_name_plural = 'Лицензии'
+        ordering = ['company', 'position']
+
+    def __str__(self):
+        return f"{self.license_type} {self.number}".strip()
+
+
+class CompanySnapshotBase(models.Model):
+    """
+    Shared full snapshot of a company profile. Application.full_client_data
+    stores a reference to a base plus the keys that differ from it.
+    Bases outlive the company: deleting a company must not erase the client
+    data of its applications (Application.company is SET_NULL as well).
+    """
+
+    company = models.ForeignKey(
+        CompanyProfile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='snapshot_bases',
+        verbose_name='Компания'
+    )
+    content_hash = models.CharField('Хэш содержимого', max_length=64, unique=True)
+    data = models.JSONField('Снимок данных', default=dict)
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Базовый снимок компании'
+        verbose_name_plural = 'Базовые снимки компаний'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['company', '-created_at'], name='company_snapshot_latest_idx'),
+        ]
+
+    def __str__(self):
+        return f"Снимок #{self.id} ({self.company_id})"
@@ -0,0 +1,154 @@
+"""
+Normalized child tables mirrored from CompanyProfile JSON lists.
+
+founders_data / legal_founders_data -> CompanyFounder,
+bank_accounts_data -> CompanyBankAccount, licenses_data -> CompanyLicense.
+
+The JSONFields stay the source of truth. A digest of the mirrored lists is
+kept in CompanyProfile.relations_hash, so a profile save that does not touch
+them costs nothing, and a changed list rebuilds that company's rows in one
+delete + bulk_create per table.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .models import CompanyBankAccount, CompanyFounder, CompanyLicense, CompanyProfile
+
+logger = logging.getLogger(__name__)
+
+RELATION_FIELDS = ('founders_data', 'legal_founders_data', 'bank_accounts_data', 'licenses_data')
+
+
+def _items(value) -> list[dict]:
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, dict)]
+
+
+def _text(value, max_length: int) -> str:
+    if value is None:
+        return ''
+    return str(value).strip()[:max_length]
+
+
+def _share(value) -> Decimal | None:
+    if value in (None, ''):
+        return None
+    try:
+        share = Decimal(str(value).replace(',', '.').strip())
+    except (InvalidOperation, ValueError):
+        return None
+    if not share.is_finite() or abs(share) >= 10 ** 5:
+        return None
+    return share.quantize(Decimal('0.0001'))
+
+
+def relations_digest(company: CompanyProfile) -> str:
+    payload = json.dumps(
+        [getattr(company, field) or [] for field in RELATION_FIELDS],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def build_relation_rows(company: CompanyProfile) -> tuple[list, list, list]:
+    founders = [
+        CompanyFounder(
+            company=company,
+            kind=CompanyFounder.KIND_INDIVIDUAL,
+            position=position,
+            inn=_text(item.get('inn'), 12),
+            name=_text(item.get('full_name'), 500),
+            share=_share(item.get('share_relative')),
+        )
+        for position, item in enumerate(_items(company.founders_data))
+    ]
+    founders += [
+        CompanyFounder(
+            company=company,
+            kind=CompanyFounder.KIND_LEGAL,
+            position=position,
+            inn=_text(item.get('inn'), 12),
+            ogrn=_text(item.get('ogrn'), 15),
+            name=_text(item.get('name'), 500),
+            share=_share(item.get('share_relative')),
+        )
+        for position, item in enumerate(_items(company.legal_founders_data))
+    ]
+    accounts = [
+        CompanyBankAccount(
+            company=company,
+            position=position,
+            bank_name=_text(item.get('bank_name'), 300),
+            bank_bik=_text(item.get('bank_bik') or item.get('bik'), 9),
+            account=_text(item.get('account'), 20),
+        )
+        for position, item in enumerate(_items(company.bank_accounts_data))
+    ]
+    licenses = [
+        CompanyLicense(
+            company=company,
+            position=position,
+            license_type=_text(item.get('type'), 100),
+            name=_text(item.get('name'), 500),
+            number=_text(item.get('number'), 100),
+            valid_until=_text(item.get('valid_until'), 20),
+        )
+        for position, item in enumerate(_items(company.licenses_data))
+    ]
+    return founders, accounts, licenses
+
+
+def sync_company_relations(company: CompanyProfile, force: bool = False) -> bool:
+    """Rebuild child rows if the mirrored JSON lists changed. Returns True if rebuilt."""
+    digest = relations_digest(company)
+    if not force and digest == company.relations_hash:
+        return False
+
+    founders, accounts, licenses = build_relation_rows(company)
+    with transaction.atomic():
+        CompanyFounder.objects.filter(company=company).delete()
+        CompanyBankAccount.objects.filter(company=company).delete()
+        CompanyLicense.objects.filter(company=company).delete()
+        CompanyFounder.objects.bulk_create(founders)
+        CompanyBankAccount.objects.bulk_create(accounts)
+        CompanyLicense.objects.bulk_create(licenses)
+        # queryset update: no post_save recursion
+        CompanyProfile.objects.filter(pk=company.pk).update(relations_hash=digest)
+    company.relations_hash = digest
+    return True
+
+
+def backfill_relations_batch(batch_size: int, after_id: int = 0, force: bool = False) -> tuple[int, int, int | None]:
+    """
+    Sync one batch of companies with id > after_id.
+    Returns (processed, rebuilt, last_id); last_id is None when done.
+    """
+    companies = list(
+        CompanyProfile.objects.filter(pk__gt=after_id)
+        .order_by('pk')
+        .only('pk', 'relations_hash', *RELATION_FIELDS)[:batch_size]
+    )
+    rebuilt = 0
+    for company in companies:
+        try:
+            if sync_company_relations(company, force=force):
+                rebuilt += 1
+        except Exception as exc:
+            logger.error("Company %s: relations sync failed: %s", company.pk, exc)
+    last_id = companies[-1].pk if companies else None
+    return len(companies), rebuilt, last_id
+
+
+def companies_with_founder_inn(inn: str):
+    """Companies where `inn` is listed among individual or legal founders."""
+    return CompanyProfile.objects.filter(pk__in=CompanyFounder.objects.filter(inn=inn).values('company_id'))
@@ -0,0 +1,40 @@
+"""
+Company directory search for admin CRM / direct-client screens.
+
+Digits are matched as an INN/OGRN prefix, text as a substring of name /
+short_name. On PostgreSQL both are served by the trigram indexes from
+migration 0015 and results are ranked by trigram word similarity; other
+backends fall back to plain LIKE ordered by name.
+"""
+
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Greatest
+
+MIN_QUERY_LENGTH = 2
+
+
+def normalize_query(query: str | None) -> str:
+    return ' '.join((query or '').split())
+
+
+def search_companies(queryset: QuerySet, query: str | None) -> QuerySet:
+    """Filter and rank a CompanyProfile queryset by a free-text query."""
+    query = normalize_query(query)
+    if len(query) < MIN_QUERY_LENGTH:
+        return queryset
+
+    if query.isdigit():
+        return queryset.filter(Q(inn__startswith=query) | Q(ogrn__startswith=query)).order_by('inn', '-created_at')
+
+    queryset = queryset.filter(Q(name__icontains=query) | Q(short_name__icontains=query))
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        return queryset.annotate(
+            search_rank=Greatest(
+                TrigramWordSimilarity(query, 'name'),
+                TrigramWordSimilarity(query, 'short_name'),
+            )
+        ).order_by('-search_rank', 'name')
+    return queryset.order_by('name')
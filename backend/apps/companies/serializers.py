@@ -380,6 +380,7 @@ class AdminCRMClientSerializer(serializers.ModelSerializer):
     agent_name = serializers.SerializerMethodField()
     client_status_display = serializers.SerializerMethodField()
     has_duplicates = serializers.SerializerMethodField()
+    duplicate_cluster_id = serializers.SerializerMethodField()
     
     class Meta:
         model = CompanyProfile
@@ -406,6 +407,7 @@ class AdminCRMClientSerializer(serializers.ModelSerializer):
             'agent_name',
             # Duplicate info
             'has_duplicates',
+            'duplicate_cluster_id',
             'created_at',
             'updated_at',
         ]
@@ -419,13 +421,21 @@ class AdminCRMClientSerializer(serializers.ModelSerializer):
     def get_client_status_display(self, obj):
         return dict(CompanyProfile.CLIENT_STATUS_CHOICES).get(obj.client_status, obj.client_status)
     
+    def _duplicate_cluster(self, obj):
+        if not obj.inn or not obj.is_crm_client:
+            return None
+        clusters = self.context.get('duplicate_clusters')
+        if clusters is None:
+            from .duplicates import get_duplicate_clusters
+            clusters = get_duplicate_clusters()
+        return clusters.get(obj.inn)
+
     def get_has_duplicates(self, obj):
-        if not obj.inn:
-            return False
-        return CompanyProfile.objects.filter(
-            inn=obj.inn,
-            is_crm_client=True
-        ).exclude(id=obj.id).exists()
+        return self._duplicate_cluster(obj) is not None
+
+    def get_duplicate_cluster_id(self, obj):
+        cluster = self._duplicate_cluster(obj)
+        return cluster['cluster_id'] if cluster else None
 
 
 class AdminDirectClientSerializer(serializers.ModelSerializer):
@@ -5,13 +5,20 @@ Automatically creates CompanyProfile for new Client/Agent users.
 This ensures that email and phone from registration are transferred
 to company contact fields.
 """
+import logging
 import re
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.conf import settings
 
+from apps.core.caching import invalidate_namespaces, register_namespace
+
+from .duplicates import DUPLICATES_NAMESPACE
+from .relations import RELATION_FIELDS, sync_company_relations
 from .models import CompanyProfile
 
+logger = logging.getLogger(__name__)
+
 
 def format_russian_phone(phone: str) -> str:
     """
@@ -97,3 +104,54 @@ def create_company_profile_for_user(sender, instance, created, **kwargs):
         contact_phone=formatted_phone,
         contact_person=contact_person,
     )
+
+
+# Duplicate-INN clusters are cached and depend only on these fields of CRM rows
+DUPLICATE_FIELDS = ('inn', 'is_crm_client')
+register_namespace(DUPLICATES_NAMESPACE)
+
+
+def _duplicate_key(instance):
+    # __dict__ lookup: deferred fields stay None (unknown) instead of loading
+    return tuple(instance.__dict__.get(field) for field in DUPLICATE_FIELDS)
+
+
+@receiver(post_init, sender=CompanyProfile)
+def remember_duplicate_key(sender, instance, **kwargs):
+    instance._duplicate_key = _duplicate_key(instance)
+
+
+@receiver(post_save, sender=CompanyProfile)
+def invalidate_duplicate_clusters(sender, instance, created, update_fields=None, **kwargs):
+    """Drop cached clusters only when a CRM row appears or its INN / CRM flag changes."""
+    previous, current = getattr(instance, '_duplicate_key', (None, None)), _duplicate_key(instance)
+    instance._duplicate_key = current
+    if created:
+        changed = current[1] is not False
+    elif update_fields is not None and not set(update_fields) & set(DUPLICATE_FIELDS):
+        changed = False
+    else:
+        unknown = None in previous or None in current
+        was_crm, is_crm = previous[1] is not False, current[1] is not False
+        changed = unknown or (previous != current and (was_crm or is_crm))
+    if changed:
+        invalidate_namespaces(DUPLICATES_NAMESPACE)
+
+
+@receiver(post_delete, sender=CompanyProfile)
+def invalidate_duplicate_clusters_on_delete(sender, instance, **kwargs):
+    if instance.__dict__.get('is_crm_client') is not False:
+        invalidate_namespaces(DUPLICATES_NAMESPACE)
+
+
+@receiver(post_save, sender=CompanyProfile)
+def sync_company_relation_rows(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Mirror founders / accounts / licenses JSON into the child tables."""
+    if raw or not getattr(settings, 'COMPANY_RELATIONS_SYNC_ENABLED', True):
+        return
+    if update_fields is not None and not set(update_fields) & set(RELATION_FIELDS):
+        return
+    try:
+        sync_company_relations(instance)
+    except Exception as exc:
+        logger.error(f"Company {instance.pk}: relations sync failed: {exc}")
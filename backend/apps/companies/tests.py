@@ -0,0 +1,126 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.companies.client_snapshots import compact_client_snapshot, expand_client_snapshot
+from apps.companies.models import CompanyFounder, CompanyProfile, CompanySnapshotBase
+from apps.companies.relations import companies_with_founder_inn
+from apps.users.models import User, UserRole
+
+
+class AdminCompanySearchTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(email='search_admin@example.com', password='x', role=UserRole.ADMIN)
+        agent = User.objects.create_user(email='search_agent@example.com', password='x', role=UserRole.AGENT)
+        CompanyProfile.objects.create(owner=agent, is_crm_client=True, inn='7707083893', name='ООО Ромашка')
+        CompanyProfile.objects.create(owner=agent, is_crm_client=True, inn='5408000000', name='ООО Василёк')
+        CompanyProfile.objects.create(owner=self.admin, is_crm_client=False, inn='7707000001', name='ООО Ромашка Плюс')
+        self.client.force_authenticate(self.admin)
+
+    def test_search_by_name_and_inn_prefix(self):
+        response = self.client.get('/api/companies/admin/crm/search/', {'q': 'Ромаш'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['inn'], '7707083893')
+
+        response = self.client.get('/api/companies/admin/direct/search/', {'q': '7707'})
+        self.assertEqual([item['inn'] for item in response.data['results']], ['7707000001'])
+
+    def test_search_is_paginated(self):
+        response = self.client.get('/api/companies/admin/crm/search/', {'page_size': 1})
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+
+
+class DuplicateClustersTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(email='dup_admin@example.com', password='x', role=UserRole.ADMIN)
+        agent_a = User.objects.create_user(email='dup_a@example.com', password='x', role=UserRole.AGENT)
+        agent_b = User.objects.create_user(email='dup_b@example.com', password='x', role=UserRole.AGENT)
+        self.first = CompanyProfile.objects.create(owner=agent_a, is_crm_client=True, inn='7707083893', name='А')
+        CompanyProfile.objects.create(owner=agent_b, is_crm_client=True, inn='7707083893', name='Б')
+        self.single = CompanyProfile.objects.create(owner=agent_b, is_crm_client=True, inn='5408000000', name='В')
+        self.client.force_authenticate(self.admin)
+
+    def test_list_rows_carry_cluster_ids(self):
+        rows = {row['id']: row for row in self.client.get('/api/companies/admin/crm/').data}
+        self.assertEqual(rows[self.first.id]['duplicate_cluster_id'], self.first.id)
+        self.assertTrue(rows[self.first.id]['has_duplicates'])
+        self.assertFalse(rows[self.single.id]['has_duplicates'])
+
+    def test_report_and_invalidation(self):
+        report = self.client.get('/api/companies/admin/crm/duplicates/').data
+        self.assertEqual(report['count'], 1)
+        self.assertEqual(report['clusters'][0]['size'], 2)
+
+        self.single.inn = '7707083893'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.single.save()
+        report = self.client.get('/api/companies/admin/crm/duplicates/').data
+        self.assertEqual(report['clusters'][0]['size'], 3)
+
+    def test_unrelated_changes_keep_clusters_cached(self):
+        from apps.companies.duplicates import DUPLICATES_NAMESPACE
+        from apps.core.caching import get_namespace_version
+
+        version = get_namespace_version(DUPLICATES_NAMESPACE)
+        with self.captureOnCommitCallbacks(execute=True):
+            company = CompanyProfile.objects.get(pk=self.single.pk)
+            company.name = 'В2'
+            company.save()
+            CompanyProfile.objects.create(owner=self.admin, is_crm_client=False, inn='7707083893', name='Прямой')
+        self.assertEqual(get_namespace_version(DUPLICATES_NAMESPACE), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CompanyProfile.objects.get(pk=self.first.pk).delete()
+        self.assertGreater(get_namespace_version(DUPLICATES_NAMESPACE), version)
+
+
+class CompanyRelationsTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='rel_owner@example.com', password='x', role=UserRole.AGENT)
+        self.company = CompanyProfile.objects.create(
+            owner=self.owner, is_crm_client=True, inn='7707083893', name='ООО Ромашка',
+            founders_data=[{'full_name': 'Иванов И.И.', 'inn': '500100732259', 'share_relative': 60}],
+            legal_founders_data=[{'name': 'ООО Опора', 'inn': '7701000000', 'share_relative': '40'}],
+            bank_accounts_data=[{'bank_name': 'Банк', 'bank_bik': '044525225', 'account': '40702810000000000001'}],
+        )
+
+    def test_child_rows_follow_json(self):
+        self.assertEqual(list(companies_with_founder_inn('500100732259')), [self.company])
+        self.assertEqual(self.company.bank_account_rows.get().bank_bik, '044525225')
+
+        self.company.founders_data = []
+        self.company.save()
+        self.assertFalse(companies_with_founder_inn('500100732259').exists())
+        self.assertEqual(self.company.founder_rows.get().kind, CompanyFounder.KIND_LEGAL)
+
+    def test_snapshots_share_a_base(self):
+        snapshot = {'id': self.company.id, 'inn': self.company.inn, 'name': 'ООО Ромашка', 'kpp': '', 'ogrn': ''}
+        first = compact_client_snapshot(self.company.id, snapshot)
+        second = compact_client_snapshot(self.company.id, {**snapshot, 'kpp': '770701001'})
+        self.assertEqual(first['snapshot_base'], second['snapshot_base'])
+        self.assertEqual(second['changes'], {'kpp': '770701001'})
+        self.assertEqual(expand_client_snapshot(second)['kpp'], '770701001')
+        self.assertEqual(CompanySnapshotBase.objects.count(), 1)
+
+    def test_snapshot_survives_company_delete(self):
+        from django.core.cache import cache
+
+        from apps.applications.models import Application, ProductType
+
+        snapshot = {'id': self.company.id, 'inn': self.company.inn, 'name': 'ООО Ромашка', 'kpp': '', 'ogrn': ''}
+        compact_client_snapshot(self.company.id, snapshot)
+        application = Application.objects.create(
+            created_by=self.owner, company=self.company, product_type=ProductType.BANK_GUARANTEE,
+            amount=1000000, term_months=12,
+            full_client_data=compact_client_snapshot(self.company.id, {**snapshot, 'kpp': '770701001'}),
+        )
+
+        self.company.delete()
+        cache.clear()
+        application.refresh_from_db()
+        self.assertIsNone(application.company_id)
+        self.assertEqual(expand_client_snapshot(application.full_client_data)['inn'], '7707083893')
+        self.assertEqual(expand_client_snapshot(application.full_client_data)['kpp'], '770701001')
@@ -5,11 +5,15 @@ from rest_framework import viewsets, generics, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import PageNumberPagination
 from django.db import transaction
 from django.db.models import Q
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 
 from .models import CompanyProfile
+from .duplicates import get_duplicate_clusters, get_duplicate_report
+from .relations import companies_with_founder_inn
+from .search import search_companies
 from .serializers import (
     CompanyProfileSerializer,
     CompanyProfileCreateSerializer,
@@ -17,6 +21,7 @@ from .serializers import (
     CRMClientSerializer,
     AdminDirectClientSerializer,
 )
+from apps.core.tables import AdminTableMixin
 from apps.users.permissions import IsAdmin, IsAgent, IsClientOrAgent, IsOwnerOrAdmin, IsAgentOrAdmin
 
 
@@ -304,12 +309,66 @@ class CRMClientViewSet(viewsets.ModelViewSet):
                 logger.error(f"Failed to send invitation email to {instance.invitation_email}: {e}")
 
 
+class CompanySearchPagination(PageNumberPagination):
+    """Pagination for admin company search."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+COMPANY_TABLE_ORDERING = {
+    'created_at': 'created_at',
+    'name': 'name',
+    'inn': 'inn',
+    'client_status': 'client_status',
+}
+
+
+class AdminCompanySearchMixin:
+    """
+    Paginated search over the viewset queryset for admin client screens.
+    GET .../search/?q=<name|INN|OGRN>&client_status=&is_active=&founder_inn=&page=&page_size=
+    """
+
+    def search_table(self, queryset, term):
+        return search_companies(queryset, term)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter('q', str, description='Название, ИНН или ОГРН'),
+            OpenApiParameter('client_status', str),
+            OpenApiParameter('is_active', bool),
+            OpenApiParameter('founder_inn', str, description='ИНН учредителя (физ. или юр. лица)'),
+            OpenApiParameter('page', int),
+            OpenApiParameter('page_size', int),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        queryset = search_companies(self.get_queryset(), request.query_params.get('q'))
+
+        client_status = request.query_params.get('client_status')
+        if client_status:
+            queryset = queryset.filter(client_status=client_status)
+        is_active = request.query_params.get('is_active')
+        if is_active in ('true', 'false'):
+            queryset = queryset.filter(is_active=is_active == 'true')
+        founder_inn = request.query_params.get('founder_inn')
+        if founder_inn:
+            queryset = queryset.filter(pk__in=companies_with_founder_inn(founder_inn.strip()).values('pk'))
+
+        paginator = CompanySearchPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
 @extend_schema(tags=['Admin - CRM Clients'])
 @extend_schema_view(
     list=extend_schema(description='List all CRM clients from all agents (Admin only)'),
     retrieve=extend_schema(description='Get CRM client details'),
 )
-class AdminCRMClientViewSet(viewsets.ModelViewSet):
+class AdminCRMClientViewSet(AdminCompanySearchMixin, AdminTableMixin, viewsets.ModelViewSet):
     """
     ViewSet for Admin to manage all CRM clients from all agents.
     
@@ -320,7 +379,12 @@ class AdminCRMClientViewSet(viewsets.ModelViewSet):
     """
     serializer_class = CRMClientSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
-    pagination_class = None  # Frontend expects full list without pagination
+    table_filter_fields = {
+        'client_status': 'client_status',
+        'is_active': 'is_active',
+        'owner': 'owner_id',
+    }
+    table_ordering_fields = COMPANY_TABLE_ORDERING
 
     def get_queryset(self):
         """Return all CRM clients from all agents (including inactive)."""
@@ -332,6 +396,13 @@ class AdminCRMClientViewSet(viewsets.ModelViewSet):
             return CompanyProfileSerializer
         return AdminCRMClientSerializer
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == 'list':
+            # One cluster map for the whole page; other actions resolve it lazily
+            context['duplicate_clusters'] = get_duplicate_clusters()
+        return context
+
     def perform_update(self, serializer):
         serializer.save(is_crm_client=True)
 
@@ -456,15 +527,52 @@ class AdminCRMClientViewSet(viewsets.ModelViewSet):
                 'message': 'ИНН не указан'
             })
         
-        duplicates = CompanyProfile.objects.filter(
-            inn=company.inn,
-            is_crm_client=True
-        ).exclude(id=company.id).select_related('owner')
+        clusters = get_duplicate_clusters()
+        if company.inn not in clusters:
+            return Response({'has_duplicates': False, 'duplicates': []})
+
+        duplicates = list(
+            CompanyProfile.objects.filter(
+                inn=company.inn,
+                is_crm_client=True
+            ).exclude(id=company.id).select_related('owner')
+        )
         
         from .serializers import AdminCRMClientSerializer
         return Response({
-            'has_duplicates': duplicates.exists(),
-            'duplicates': AdminCRMClientSerializer(duplicates, many=True).data
+            'has_duplicates': bool(duplicates),
+            'duplicates': AdminCRMClientSerializer(
+                duplicates, many=True, context={'duplicate_clusters': clusters}
+            ).data
+        })
+
+    @extend_schema(
+        responses={200: {'type': 'object', 'properties': {
+            'count': {'type': 'integer'},
+            'clusters': {'type': 'array', 'items': {'type': 'object'}}
+        }}}
+    )
+    @action(detail=False, methods=['get'])
+    def duplicates(self, request):
+        """
+        All CRM clients sharing an INN, grouped into clusters.
+        GET /api/companies/admin/crm/duplicates/
+        """
+        from .serializers import AdminCRMClientSerializer
+
+        context = self.get_serializer_context()
+        report = get_duplicate_report()
+        return Response({
+            'count': len(report),
+            'clusters': [
+                {
+                    'cluster_id': cluster['cluster_id'],
+                    'inn': cluster['inn'],
+                    'size': cluster['size'],
+                    'companies': AdminCRMClientSerializer(cluster['companies'], many=True, context=context).data,
+                }
+                for cluster in report
+            ],
         })
 
 
@@ -473,7 +581,7 @@ class AdminCRMClientViewSet(viewsets.ModelViewSet):
     list=extend_schema(description='List all direct clients (registered without agent)'),
     retrieve=extend_schema(description='Get direct client details'),
 )
-class AdminDirectClientsViewSet(viewsets.ModelViewSet):
+class AdminDirectClientsViewSet(AdminCompanySearchMixin, AdminTableMixin, viewsets.ModelViewSet):
     """
     ViewSet for Admin to view all direct clients (is_crm_client=False).
     
@@ -482,7 +590,11 @@ class AdminDirectClientsViewSet(viewsets.ModelViewSet):
     """
     serializer_class = AdminDirectClientSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
-    pagination_class = None  # Frontend expects full list without pagination
+    table_filter_fields = {
+        'client_status': 'client_status',
+        'is_active': 'is_active',
+    }
+    table_ordering_fields = COMPANY_TABLE_ORDERING
 
     def get_queryset(self):
         """Return all direct clients (not CRM clients), including inactive."""
@@ -0,0 +1 @@
+# Core app (shared infrastructure)
@@ -0,0 +1,10 @@
+"""
+Core app configuration (shared infrastructure: caching, ...).
+"""
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Ядро'
@@ -0,0 +1,317 @@
+"""
+Shared caching subsystem on top of the default Django cache (Redis in production).
+
+- Namespaced keys: every key lives in a namespace ("dictionaries", "seo", ...)
+  and embeds the namespace version, so one version bump drops the whole
+  namespace without scanning keys.
+- Per-model invalidation: ``invalidate_on(Model, 'namespace')`` bumps the
+  namespace version after commit on save/delete/m2m changes.
+- ``get_or_compute``: stampede protection. Only the worker holding a short
+  lock recomputes an expired value; the others keep serving the stale copy
+  (or briefly wait for the first value when nothing is cached yet).
+- Hit/miss counters per namespace for the stats endpoint. Counts are summed
+  in process and added to the shared counters at most once per
+  CACHE_STATS_FLUSH_INTERVAL_SECONDS, so a hit costs no extra cache round
+  trip. Namespaces used by any worker are listed in a shared registry of
+  fixed slots, each claimed with cache.add(), so the stats endpoint sees
+  them all.
+
+Cache outages never break a request: every helper falls back to computing
+the value directly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+_registered_namespaces: set[str] = set()
+_published_namespaces: set[str] = set()
+
+_MAX_RAW_KEY_LENGTH = 200
+_REGISTRY_SLOTS = 128
+
+_stats_lock = threading.Lock()
+_pending_stats: dict[str, int] = defaultdict(int)
+_stats_flushed_at = time.monotonic()
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def register_namespace(namespace: str) -> None:
+    _registered_namespaces.add(namespace)
+
+
+def _registry_key(slot: int) -> str:
+    return f'ns:registry:{slot}'
+
+
+def _publish_namespace(namespace: str) -> None:
+    """List the namespace in the shared registry (once per process)."""
+    if namespace in _published_namespaces:
+        return
+    try:
+        slots = [_registry_key(slot) for slot in range(_REGISTRY_SLOTS)]
+        taken = cache.get_many(slots)
+        if namespace not in taken.values():
+            # cache.add() claims a free slot atomically; a lost race moves on to the next one
+            for key in slots:
+                if key in taken:
+                    continue
+                if cache.add(key, namespace, timeout=None) or cache.get(key) == namespace:
+                    break
+            else:
+                logger.warning("Cache namespace registry is full, %s is not listed", namespace)
+        _published_namespaces.add(namespace)
+    except Exception as exc:
+        logger.warning("Cache namespace %s: registry update failed: %s", namespace, exc)
+
+
+def registered_namespaces() -> list[str]:
+    """Namespaces known to this process or used by any worker."""
+    try:
+        shared = set(cache.get_many([_registry_key(slot) for slot in range(_REGISTRY_SLOTS)]).values())
+    except Exception:
+        shared = set()
+    return sorted(_registered_namespaces | shared)
+
+
+def _version_key(namespace: str) -> str:
+    return f'ns:{namespace}:version'
+
+
+def _stats_key(namespace: str, kind: str) -> str:
+    return f'stats:{namespace}:{kind}'
+
+
+def get_namespace_version(namespace: str) -> int:
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key) or 1
+    return int(version)
+
+
+def bump_namespace(namespace: str) -> None:
+    """Invalidate every key in the namespace."""
+    key = _version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Version key missing (evicted / never read): any new value invalidates.
+        cache.set(key, int(time.time()), timeout=None)
+    except Exception as exc:
+        logger.warning("Cache namespace %s: version bump failed: %s", namespace, exc)
+
+
+def make_key(namespace: str, *parts: Any) -> str:
+    raw = ':'.join(str(part) for part in parts)
+    if len(raw) > _MAX_RAW_KEY_LENGTH or any(ch.isspace() for ch in raw):
+        raw = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f'ns:{namespace}:v{get_namespace_version(namespace)}:{raw}'
+
+
+def request_key(request) -> str:
+    """Stable key part for a GET request: host + path + sorted query params."""
+    params = sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+    )
+    query = '&'.join(f'{key}={value}' for key, value in params)
+    return f'{request.get_host()}{request.path}?{query}'
+
+
+def _record(namespace: str, kind: str) -> None:
+    if not _setting('CACHE_STATS_ENABLED', True):
+        return
+    interval = float(_setting('CACHE_STATS_FLUSH_INTERVAL_SECONDS', 10))
+    with _stats_lock:
+        _pending_stats[_stats_key(namespace, kind)] += 1
+        due = time.monotonic() - _stats_flushed_at >= interval
+    if due:
+        flush_cache_stats()
+
+
+def flush_cache_stats() -> None:
+    """Add this process's pending hit/miss counts to the shared counters."""
+    global _stats_flushed_at
+    with _stats_lock:
+        pending = dict(_pending_stats)
+        _pending_stats.clear()
+        _stats_flushed_at = time.monotonic()
+    for key, delta in pending.items():
+        try:
+            try:
+                cache.incr(key, delta)
+            except ValueError:
+                if not cache.add(key, delta, timeout=None):
+                    cache.incr(key, delta)
+        except Exception:
+            pass
+
+
+def get_or_compute(
+    namespace: str,
+    key: Any,
+    compute: Callable[[], Any],
+    timeout: int | None = None,
+) -> Any:
+    """
+    Return cached value for (namespace, key) or compute and store it.
+
+    Values are stored with a soft expiry; the hard TTL is longer by
+    CACHE_STALE_GRACE_SECONDS so a stale copy can be served while a single
+    worker refreshes it.
+    """
+    register_namespace(namespace)
+    _publish_namespace(namespace)
+    timeout = int(timeout or _setting('CACHE_DEFAULT_TIMEOUT', 300))
+    lock_timeout = int(_setting('CACHE_LOCK_TIMEOUT_SECONDS', 30))
+
+    try:
+        cache_key = make_key(namespace, key)
+        envelope = cache.get(cache_key)
+    except Exception as exc:
+        logger.warning("Cache namespace %s unavailable, computing directly: %s", namespace, exc)
+        return compute()
+
+    lock_key = f'{cache_key}:lock'
+    locked = False
+    try:
+        if envelope is not None:
+            value, fresh_until = envelope
+            if fresh_until > time.time():
+                _record(namespace, 'hits')
+                return value
+            locked = cache.add(lock_key, 1, timeout=lock_timeout)
+            if not locked:
+                # Another worker is refreshing: serve the stale copy.
+                _record(namespace, 'hits')
+                return value
+        else:
+            locked = cache.add(lock_key, 1, timeout=lock_timeout)
+            if not locked:
+                deadline = time.monotonic() + float(_setting('CACHE_LOCK_WAIT_SECONDS', 2))
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    envelope = cache.get(cache_key)
+                    if envelope is not None:
+                        _record(namespace, 'hits')
+                        return envelope[0]
+    except Exception as exc:
+        logger.warning("Cache namespace %s: lock handling failed: %s", namespace, exc)
+
+    _record(namespace, 'misses')
+    try:
+        value = compute()
+        try:
+            cache.set(
+                cache_key,
+                (value, time.time() + timeout),
+                timeout=timeout + int(_setting('CACHE_STALE_GRACE_SECONDS', 60)),
+            )
+        except Exception as exc:
+            logger.warning("Cache namespace %s: store failed: %s", namespace, exc)
+        return value
+    finally:
+        if locked:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                pass
+
+
+def invalidate_namespaces(*namespaces: str) -> None:
+    """Bump namespaces for a write in the current transaction."""
+    def _bump():
+        for namespace in namespaces:
+            bump_namespace(namespace)
+
+    # Bump now (this connection sees its own writes) and again after
+    # commit, so values recomputed by other workers from pre-commit
+    # data are discarded as well.
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def invalidate_on(sender, *namespaces: str) -> None:
+    """
+    Bump namespaces after commit whenever `sender` rows are saved/deleted.
+    For M2M relations pass the through model (e.g. SeoPage.banks.through).
+    """
+    for namespace in namespaces:
+        register_namespace(namespace)
+
+    def _handler(**kwargs):
+        action = kwargs.get('action')
+        if action is not None and not action.startswith('post_'):
+            return
+        invalidate_namespaces(*namespaces)
+
+    uid = f'cache-invalidate:{sender._meta.label}:{",".join(namespaces)}'
+    post_save.connect(_handler, sender=sender, weak=False, dispatch_uid=f'{uid}:save')
+    post_delete.connect(_handler, sender=sender, weak=False, dispatch_uid=f'{uid}:delete')
+    m2m_changed.connect(_handler, sender=sender, weak=False, dispatch_uid=f'{uid}:m2m')
+
+
+def get_cache_stats() -> dict[str, Any]:
+    """Shared counters; other workers' latest counts arrive with their next flush."""
+    flush_cache_stats()
+    namespaces = registered_namespaces()
+    keys = []
+    for namespace in namespaces:
+        keys.extend([
+            _stats_key(namespace, 'hits'),
+            _stats_key(namespace, 'misses'),
+            _version_key(namespace),
+        ])
+    values = cache.get_many(keys) if keys else {}
+
+    result = {}
+    total_hits = total_misses = 0
+    for namespace in namespaces:
+        hits = int(values.get(_stats_key(namespace, 'hits')) or 0)
+        misses = int(values.get(_stats_key(namespace, 'misses')) or 0)
+        total_hits += hits
+        total_misses += misses
+        result[namespace] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+            'version': values.get(_version_key(namespace)),
+        }
+
+    return {
+        'backend': settings.CACHES['default']['BACKEND'],
+        'namespaces': result,
+        'total': {
+            'hits': total_hits,
+            'misses': total_misses,
+            'hit_ratio': round(total_hits / (total_hits + total_misses), 4) if total_hits + total_misses else None,
+        },
+    }
+
+
+def reset_cache_stats() -> None:
+    with _stats_lock:
+        _pending_stats.clear()
+    cache.delete_many([
+        _stats_key(namespace, kind)
+        for namespace in registered_namespaces()
+        for kind in ('hits', 'misses')
+    ])
@@ -0,0 +1,199 @@
+"""
+Buffered counters: hot "+1" writes (article views, page hits, attribution
+counts) are accumulated outside the row and applied in bulk.
+
+- With the Redis cache backend increments go to one Redis hash per counter
+  (HINCRBY) and are shared by all workers.
+- Otherwise they accumulate in an in-process dict.
+
+A flush drains the buffer atomically and applies all deltas with a single
+UPDATE ... FROM (VALUES ...) on PostgreSQL (one UPDATE per distinct delta on
+other backends). Flushes run opportunistically from incr() at most once per
+COUNTER_FLUSH_INTERVAL_SECONDS (guarded by a cache lock) and from the
+flush_counters management command. If the buffer is unavailable the
+increment is applied directly, as before.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import defaultdict
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
+
+from .redis_client import get_redis_client, redis_key, uses_redis_cache
+
+logger = logging.getLogger(__name__)
+
+_registry: dict[str, 'BufferedCounter'] = {}
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _uses_redis() -> bool:
+    mode = _setting('COUNTER_BUFFER_BACKEND', 'auto')
+    if mode == 'auto':
+        return uses_redis_cache()
+    return mode == 'redis'
+
+
+class _LocalBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deltas: dict[int, int] = defaultdict(int)
+
+    def add(self, pk: int, amount: int) -> None:
+        with self._lock:
+            self._deltas[pk] += amount
+
+    def drain(self) -> dict[int, int]:
+        with self._lock:
+            deltas, self._deltas = self._deltas, defaultdict(int)
+        return dict(deltas)
+
+    def restore(self, deltas: dict[int, int]) -> None:
+        for pk, amount in deltas.items():
+            self.add(pk, amount)
+
+
+class _RedisBuffer:
+    def __init__(self, name: str):
+        self.name = name
+
+    def _key(self) -> str:
+        return redis_key(f'counters:{self.name}')
+
+    def add(self, pk: int, amount: int) -> None:
+        get_redis_client().hincrby(self._key(), str(pk), amount)
+
+    def drain(self) -> dict[int, int]:
+        key = self._key()
+        client = get_redis_client()
+        if not client.exists(key):
+            return {}
+        draining = f'{key}:draining:{uuid.uuid4().hex}'
+        # RENAME is atomic: increments arriving meanwhile start a new hash
+        client.rename(key, draining)
+        raw = client.hgetall(draining)
+        client.delete(draining)
+        return {int(pk): int(amount) for pk, amount in raw.items() if int(amount)}
+
+    def restore(self, deltas: dict[int, int]) -> None:
+        key = self._key()
+        pipe = get_redis_client().pipeline()
+        for pk, amount in deltas.items():
+            pipe.hincrby(key, str(pk), amount)
+        pipe.execute()
+
+
+class BufferedCounter:
+    """Buffered `field = field + n` increments for rows of `model_label`."""
+
+    def __init__(self, name: str, model_label: str, field: str):
+        self.name = name
+        self.model_label = model_label
+        self.field = field
+        self._local = _LocalBuffer()
+        self._redis = _RedisBuffer(name)
+        _registry[name] = self
+
+    @property
+    def model(self):
+        return django_apps.get_model(self.model_label)
+
+    def _buffer(self):
+        return self._redis if _uses_redis() else self._local
+
+    def _apply_directly(self, pk: int, amount: int) -> None:
+        self.model.objects.filter(pk=pk).update(**{self.field: F(self.field) + amount})
+
+    def incr(self, pk: int, amount: int = 1) -> None:
+        if not _setting('COUNTER_BUFFER_ENABLED', True):
+            self._apply_directly(pk, amount)
+            return
+        try:
+            self._buffer().add(pk, amount)
+        except Exception as exc:
+            logger.warning("Counter %s: buffer unavailable, writing directly: %s", self.name, exc)
+            self._apply_directly(pk, amount)
+            return
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        interval = int(_setting('COUNTER_FLUSH_INTERVAL_SECONDS', 10))
+        try:
+            due = cache.add(f'counters:{self.name}:flush-lock', 1, timeout=interval)
+        except Exception:
+            return
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Apply buffered increments. Returns the number of rows updated."""
+        buffer = self._buffer()
+        try:
+            deltas = buffer.drain()
+        except Exception as exc:
+            logger.warning("Counter %s: drain failed: %s", self.name, exc)
+            return 0
+        if not deltas:
+            return 0
+        try:
+            return bulk_increment(self.model, self.field, deltas)
+        except Exception as exc:
+            logger.error("Counter %s: flush of %s rows failed, re-buffering: %s", self.name, len(deltas), exc)
+            try:
+                buffer.restore(deltas)
+            except Exception:
+                logger.error("Counter %s: lost %s buffered increments", self.name, sum(deltas.values()))
+            return 0
+
+
+def bulk_increment(model, field: str, deltas: dict[int, int]) -> int:
+    """`field += delta` for every pk in deltas, in one statement where possible."""
+    if not deltas:
+        return 0
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.get_field(field).column)
+    pk_column = connection.ops.quote_name(model._meta.pk.column)
+
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            values = ', '.join(['(%s::bigint, %s::bigint)'] * len(deltas))
+            params = [value for pair in sorted(deltas.items()) for value in pair]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} SET {column} = {table}.{column} + v.delta '
+                    f'FROM (VALUES {values}) AS v(id, delta) WHERE {table}.{pk_column} = v.id',
+                    params,
+                )
+                return cursor.rowcount
+
+        by_delta: dict[int, list[int]] = defaultdict(list)
+        for pk, delta in deltas.items():
+            by_delta[delta].append(pk)
+        updated = 0
+        for delta, pks in by_delta.items():
+            updated += model.objects.filter(pk__in=pks).update(**{field: F(field) + delta})
+        return updated
+
+
+def get_counter(name: str) -> BufferedCounter:
+    return _registry[name]
+
+
+def registered_counters() -> list[BufferedCounter]:
+    return list(_registry.values())
+
+
+def flush_all() -> dict[str, int]:
+    return {counter.name: counter.flush() for counter in registered_counters()}
+
@@ -0,0 +1,82 @@
+"""
+Materialized JSON responses: rendered and gzip-compressed once, stored in the
+shared cache under a namespace version and served with a strong ETag, so
+conditional requests are answered with 304 without touching the DB.
+
+The gzip and identity bodies are different representations, so each gets its
+own ETag (the gzip one carries a "-gzip" suffix) and responses vary on
+Accept-Encoding.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from typing import Any, Callable
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+
+from .caching import get_or_compute
+
+
+def build_json_snapshot(data: Any) -> dict:
+    body = JSONRenderer().render(data)
+    return {
+        'etag': f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        'body': body,
+        'gzip_body': gzip.compress(body, compresslevel=6, mtime=0),
+    }
+
+
+def get_json_snapshot(namespace: str, key: Any, compute: Callable[[], Any], timeout: int | None = None) -> dict:
+    """Snapshot of compute() output, rebuilt when the namespace version changes."""
+    return get_or_compute(namespace, key, lambda: build_json_snapshot(compute()), timeout=timeout)
+
+
+def encoded_etag(etag: str, encoding: str | None) -> str:
+    """ETag of the snapshot body in the given content coding ('"abc"' -> '"abc-gzip"')."""
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+def _etag_matches(request, etag: str) -> bool:
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not header:
+        return False
+    # If-None-Match uses weak comparison: W/ prefixes are ignored
+    candidates = {item.strip().removeprefix('W/') for item in header.split(',')}
+    return '*' in candidates or etag in candidates
+
+
+def _accepts_gzip(request) -> bool:
+    for coding in request.META.get('HTTP_ACCEPT_ENCODING', '').lower().split(','):
+        name, _, params = coding.partition(';')
+        if name.strip() in ('gzip', '*'):
+            qvalue = params.strip().removeprefix('q=')
+            try:
+                return not params or float(qvalue) > 0
+            except ValueError:
+                return True
+    return False
+
+
+def snapshot_response(request, snapshot: dict, cache_control: str = 'private, no-cache') -> HttpResponse:
+    """
+    Serve a snapshot: 304 on matching If-None-Match, precompressed body for
+    gzip-capable clients, plain JSON otherwise.
+    """
+    encoding = 'gzip' if _accepts_gzip(request) else None
+    etag = encoded_etag(snapshot['etag'], encoding)
+    if _etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    elif encoding:
+        response = HttpResponse(snapshot['gzip_body'], content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(snapshot['body'], content_type='application/json')
+
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
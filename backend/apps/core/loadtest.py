@@ -0,0 +1,359 @@
+"""
+HTTP + WebSocket load harness (`python manage.py loadtest`).
+
+Drives a running deployment (gunicorn for HTTP, daphne for ws/) with N
+virtual users. Each one logs in, then loops over a weighted scenario mix
+until the duration is over:
+
+- list:          GET the list endpoints (applications, notifications, CRM clients)
+- create:        POST /api/applications/ for one of the user's CRM companies
+- chat:          send a message over ws/chat/application/<id>/ and wait until
+                 its broadcast comes back (batching window included)
+- send_to_bank:  POST send_to_bank for an application created in this run
+- sync_status:   POST sync_status for an application already sent
+
+With BANK_API_PHASE1_MODE=False and BANK_API_URL pointing at the local stub
+(`manage.py run_bank_stub`), the bank scenarios include the stub's
+configured latency and error rate, as the production bank calls would.
+
+Every request is timed; report() gives count, errors, p50/p95/p99/max and
+throughput per scenario. HTTP runs in a thread pool (one requests.Session
+per virtual user, like a browser tab); WebSockets use a small asyncio
+client (ChatSocket).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import math
+import os
+import random
+import struct
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from urllib.parse import urlparse
+
+import requests
+
+DEFAULT_MIX = {
+    'list': 50,
+    'create': 15,
+    'chat': 20,
+    'send_to_bank': 10,
+    'sync_status': 5,
+}
+
+LIST_ENDPOINTS = {
+    'list_applications': '/api/applications/',
+    'list_notifications': '/api/notifications/',
+    'list_crm_clients': '/api/companies/crm/',
+}
+
+
+@dataclass
+class Account:
+    email: str
+    password: str
+    company_ids: list
+    application_ids: list = field(default_factory=list)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = min(len(sorted_values), max(1, math.ceil(q / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_samples = defaultdict(set)
+
+    def record(self, name, elapsed_ms, ok, detail=None):
+        self.samples[name].append(elapsed_ms)
+        if not ok:
+            self.errors[name] += 1
+            if detail and len(self.error_samples[name]) < 5:
+                self.error_samples[name].add(str(detail)[:200])
+
+    def report(self, elapsed_seconds) -> list[dict]:
+        rows = []
+        for name in sorted(self.samples):
+            values = sorted(self.samples[name])
+            rows.append({
+                'scenario': name,
+                'requests': len(values),
+                'errors': self.errors[name],
+                'p50_ms': round(percentile(values, 50), 1),
+                'p95_ms': round(percentile(values, 95), 1),
+                'p99_ms': round(percentile(values, 99), 1),
+                'max_ms': round(values[-1], 1),
+                'rps': round(len(values) / elapsed_seconds, 2) if elapsed_seconds else None,
+                'error_samples': sorted(self.error_samples[name]),
+            })
+        return rows
+
+
+class ChatSocket:
+    """
+    Minimal RFC 6455 client for the chat socket (text frames only): send a
+    message and wait for its broadcast. Built on asyncio streams because
+    daphne already binds autobahn/txaio to Twisted in this process.
+    """
+
+    def __init__(self):
+        self._reader = None
+        self._writer = None
+        self._listener = None
+        self._waiters = {}
+
+    async def connect(self, url, origin, timeout):
+        parsed = urlparse(url)
+        secure = parsed.scheme == 'wss'
+        port = parsed.port or (443 if secure else 80)
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(parsed.hostname, port, ssl=True if secure else None), timeout,
+        )
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = parsed.path + (f'?{parsed.query}' if parsed.query else '')
+        self._writer.write((
+            f'GET {path} HTTP/1.1\r\n'
+            f'Host: {parsed.hostname}:{port}\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Key: {key}\r\n'
+            'Sec-WebSocket-Version: 13\r\n'
+            f'Origin: {origin}\r\n\r\n'
+        ).encode())
+        head = await asyncio.wait_for(self._reader.readuntil(b'\r\n\r\n'), timeout)
+        status_line = head.split(b'\r\n', 1)[0].decode(errors='replace')
+        if ' 101 ' not in f'{status_line} ':
+            self.close()
+            raise ConnectionError(f'handshake failed: {status_line}')
+        self._listener = asyncio.ensure_future(self._listen())
+        return self
+
+    @property
+    def is_open(self):
+        return self._listener is not None and not self._listener.done()
+
+    def _send_frame(self, opcode, payload=b''):
+        mask = os.urandom(4)
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('!BB', 0x80 | opcode, 0x80 | length)
+        elif length < 1 << 16:
+            header = struct.pack('!BBH', 0x80 | opcode, 0x80 | 126, length)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 0x80 | 127, length)
+        masked = bytes(byte ^ mask[n % 4] for n, byte in enumerate(payload))
+        self._writer.write(header + mask + masked)
+
+    async def _read_frame(self):
+        first, second = await self._reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', await self._reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', await self._reader.readexactly(8))[0]
+        # Server frames are not masked
+        return first & 0x0F, await self._reader.readexactly(length)
+
+    async def _listen(self):
+        reason = 'closed'
+        try:
+            while True:
+                opcode, payload = await self._read_frame()
+                if opcode == 0x8:
+                    code = struct.unpack('!H', payload[:2])[0] if len(payload) >= 2 else ''
+                    reason = f'closed: {code}'
+                    break
+                if opcode == 0x9:
+                    self._send_frame(0xA, payload)
+                elif opcode == 0x1:
+                    self._received(payload)
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            reason = f'connection lost: {exc!r}'
+        finally:
+            for waiter in self._waiters.values():
+                if not waiter.done():
+                    waiter.set_exception(ConnectionError(reason))
+            self._waiters.clear()
+
+    def _received(self, payload):
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            return
+        waiter = self._waiters.pop(data.get('text'), None) if data.get('type') == 'message' else None
+        if waiter and not waiter.done():
+            waiter.set_result(data)
+
+    async def send_and_wait(self, text, timeout):
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[text] = waiter
+        self._send_frame(0x1, json.dumps({'type': 'message', 'text': text}).encode())
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        finally:
+            self._waiters.pop(text, None)
+
+    def close(self):
+        if self._writer is not None and not self._writer.is_closing():
+            try:
+                self._send_frame(0x8, struct.pack('!H', 1000))
+            except (ConnectionError, RuntimeError):
+                pass
+            self._writer.close()
+        if self._listener is not None:
+            self._listener.cancel()
+
+
+@dataclass
+class VirtualUser:
+    account: Account
+    session: requests.Session
+    token: str = ''
+    unsent: list = field(default_factory=list)
+    sent: list = field(default_factory=list)
+    socket: ChatSocket | None = None
+
+
+class LoadTest:
+    def __init__(self, base_url, accounts, *, users=10, duration=60, mix=None, think_ms=500,
+                 ws_url=None, timeout=30, seed=None):
+        self.base_url = base_url.rstrip('/')
+        self.ws_url = (ws_url or self.base_url.replace('http', 'ws', 1)).rstrip('/')
+        self.accounts = accounts
+        self.users = users
+        self.duration = duration
+        self.mix = {name: weight for name, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+        self.think_ms = think_ms
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.recorder = LatencyRecorder()
+        self.elapsed = 0.0
+
+    def run(self) -> list[dict]:
+        return asyncio.run(self._run())
+
+    async def _run(self):
+        self._executor = ThreadPoolExecutor(max_workers=max(4, self.users * 2))
+        started = time.monotonic()
+        self._deadline = started + self.duration
+        try:
+            await asyncio.gather(*(
+                self._virtual_user(self.accounts[n % len(self.accounts)], n) for n in range(self.users)
+            ))
+        finally:
+            self._executor.shutdown(wait=False)
+        self.elapsed = time.monotonic() - started
+        return self.recorder.report(self.elapsed)
+
+    async def _timed(self, name, coroutine):
+        started = time.perf_counter()
+        try:
+            result = await coroutine
+        except Exception as exc:
+            self.recorder.record(name, (time.perf_counter() - started) * 1000, False, repr(exc))
+            return None
+        self.recorder.record(name, (time.perf_counter() - started) * 1000, True)
+        return result
+
+    async def _http(self, user, name, method, path, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = partial(user.session.request, method, f'{self.base_url}{path}', timeout=self.timeout, **kwargs)
+        started = time.perf_counter()
+        try:
+            response = await loop.run_in_executor(self._executor, call)
+        except requests.RequestException as exc:
+            self.recorder.record(name, (time.perf_counter() - started) * 1000, False, repr(exc))
+            return None
+        ok = response.status_code < 400
+        self.recorder.record(
+            name, (time.perf_counter() - started) * 1000, ok,
+            None if ok else f'{response.status_code} {response.text[:150]}',
+        )
+        return response if ok else None
+
+    async def _virtual_user(self, account, n):
+        user = VirtualUser(account=account, session=requests.Session())
+        rng = random.Random(self.rng.random())
+        # Stagger the ramp-up over the first second
+        await asyncio.sleep(n / max(1, self.users))
+        response = await self._http(user, 'login', 'post', '/api/auth/login/',
+                                    json={'email': account.email, 'password': account.password})
+        if response is None:
+            return
+        user.token = response.json()['access']
+        user.session.headers['Authorization'] = f'Bearer {user.token}'
+
+        names = list(self.mix)
+        weights = list(self.mix.values())
+        try:
+            while time.monotonic() < self._deadline:
+                scenario = rng.choices(names, weights=weights)[0]
+                await getattr(self, f'_scenario_{scenario}')(user, rng)
+                if self.think_ms:
+                    await asyncio.sleep(rng.expovariate(1000 / self.think_ms))
+        finally:
+            if user.socket:
+                user.socket.close()
+            user.session.close()
+
+    # ------------------------------------------------------------------
+    # scenarios
+
+    async def _scenario_list(self, user, rng):
+        name = rng.choice(list(LIST_ENDPOINTS))
+        await self._http(user, name, 'get', LIST_ENDPOINTS[name])
+
+    async def _scenario_create(self, user, rng):
+        response = await self._http(user, 'create_application', 'post', '/api/applications/', json={
+            'company': rng.choice(user.account.company_ids),
+            'product_type': 'bank_guarantee',
+            'guarantee_type': 'contract_execution',
+            'tender_law': '44_fz',
+            'amount': str(rng.randrange(500, 50000) * 1000),
+            'term_months': rng.choice([6, 12, 24]),
+        })
+        if response is not None:
+            user.unsent.append(response.json()['id'])
+            user.account.application_ids.append(response.json()['id'])
+
+    async def _scenario_send_to_bank(self, user, rng):
+        if not user.unsent:
+            await self._scenario_create(user, rng)
+            if not user.unsent:
+                return
+        application_id = user.unsent.pop()
+        response = await self._http(user, 'send_to_bank', 'post', f'/api/applications/{application_id}/send_to_bank/')
+        if response is not None:
+            user.sent.append(application_id)
+
+    async def _scenario_sync_status(self, user, rng):
+        if not user.sent:
+            return await self._scenario_send_to_bank(user, rng)
+        await self._http(user, 'sync_status', 'post', f'/api/applications/{rng.choice(user.sent)}/sync_status/')
+
+    async def _scenario_chat(self, user, rng):
+        if user.socket is None or not user.socket.is_open:
+            if not user.account.application_ids:
+                return await self._scenario_create(user, rng)
+            application_id = rng.choice(user.account.application_ids)
+            socket = ChatSocket()
+            url = f'{self.ws_url}/ws/chat/application/{application_id}/?token={user.token}'
+            if await self._timed('ws_connect', socket.connect(url, self.base_url, self.timeout)) is None:
+                return
+            user.socket = socket
+        text = f'Нагрузочный тест {uuid.uuid4().hex[:12]}'
+        await self._timed('chat_send', user.socket.send_and_wait(text, self.timeout))
@@ -0,0 +1,44 @@
+"""
+Apply buffered counter increments (see apps.core.counters).
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import autodiscover_modules
+
+from apps.core.counters import flush_all
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered counters (news views, SEO page views and leads, ...) to the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Run continuously as worker.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=int,
+            default=int(getattr(settings, 'COUNTER_FLUSH_INTERVAL_SECONDS', 10)),
+            help='Sleep seconds between flushes.',
+        )
+
+    def handle(self, *args, **options):
+        # Counters are declared in <app>/counters.py modules
+        autodiscover_modules('counters')
+        loop = options['loop']
+        sleep_seconds = max(1, int(options['sleep']))
+
+        try:
+            while True:
+                stats = flush_all()
+                self.stdout.write(' '.join(f"{name}={rows}" for name, rows in stats.items()) or 'no counters')
+                if not loop:
+                    break
+                time.sleep(sleep_seconds)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Counter flusher stopped.'))
@@ -0,0 +1,82 @@
+"""
+Generate a production-shaped synthetic dataset (see apps.core.synthetic).
+
+    python manage.py generate_synthetic_data --scale 0.05
+    python manage.py generate_synthetic_data --scale 2 --set thread_length_alpha=1.1
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.synthetic import SYNTHETIC_EMAIL_DOMAIN, SYNTHETIC_PASSWORD, ScaleProfile, SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, companies, applications, chats and notifications for load tests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1.0,
+            help='Scale factor for row counts (1.0 = ~200k applications, ~1.5M rows).',
+        )
+        parser.add_argument(
+            '--set',
+            action='append',
+            default=[],
+            metavar='NAME=VALUE',
+            help='Override a ScaleProfile field after scaling (repeatable).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per write chunk.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed (same seed and scale give the same dataset shape).',
+        )
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Use bulk_create on PostgreSQL too instead of COPY.',
+        )
+
+    def handle(self, *args, **options):
+        overrides = {}
+        for item in options['set']:
+            name, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Ожидается NAME=VALUE: {item}')
+            overrides[name.strip()] = value.strip()
+        try:
+            profile = ScaleProfile().scaled(options['scale'], **overrides)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        generator = SyntheticDataGenerator(
+            profile,
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            use_copy=not options['no_copy'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(
+            f"Профиль: {profile} ({'COPY' if generator.uses_copy else 'bulk_create'})"
+        )
+        try:
+            stats = generator.run()
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Generation interrupted; written chunks are kept.'))
+            return
+
+        seconds = stats.pop('seconds')
+        for label, rows in stats.items():
+            self.stdout.write(f'{label}: {rows}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {sum(stats.values())} rows in {seconds}s. '
+            f'Log in as <role>.<id>@{SYNTHETIC_EMAIL_DOMAIN} / {SYNTHETIC_PASSWORD}'
+        ))
@@ -0,0 +1,153 @@
+"""
+Run the HTTP/WebSocket load harness (apps.core.loadtest) against a running
+deployment that shares this database.
+
+    python manage.py generate_synthetic_data --scale 0.05
+    python manage.py run_bank_stub --latency-ms 300 --error-rate 0.02 &
+    python manage.py loadtest --base-url http://127.0.0.1:8000 --users 40 --duration 120
+
+Virtual users log in as accredited synthetic agents (one per user while
+there are enough of them) and work on their own CRM companies.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.applications.models import Application
+from apps.companies.models import CompanyProfile
+from apps.core.loadtest import DEFAULT_MIX, Account, LoadTest
+from apps.core.synthetic import SYNTHETIC_EMAIL_DOMAIN, SYNTHETIC_PASSWORD
+from apps.users.models import User, UserRole
+
+
+class Command(BaseCommand):
+    help = 'Drive login, application, list, chat and bank scenarios and report p50/p95/p99 per scenario.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='HTTP base URL (gunicorn).')
+        parser.add_argument(
+            '--ws-url',
+            default=None,
+            help='WebSocket base URL (daphne); defaults to the base URL with ws:// scheme.',
+        )
+        parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users.')
+        parser.add_argument('--duration', type=float, default=60, help='Seconds to run.')
+        parser.add_argument(
+            '--think-ms',
+            type=float,
+            default=500,
+            help='Mean pause between scenarios of one user (0 = closed loop at full speed).',
+        )
+        parser.add_argument(
+            '--mix',
+            action='append',
+            default=[],
+            metavar='SCENARIO=WEIGHT',
+            help=f"Scenario weight override (repeatable). Defaults: "
+                 f"{', '.join(f'{name}={weight}' for name, weight in DEFAULT_MIX.items())}.",
+        )
+        parser.add_argument('--password', default=SYNTHETIC_PASSWORD, help='Password of the synthetic agents.')
+        parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout, seconds.')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for scenario choice.')
+        parser.add_argument('--json', dest='json_path', default=None, help='Write the report as JSON.')
+
+    def handle(self, *args, **options):
+        mix = dict(DEFAULT_MIX)
+        for item in options['mix']:
+            name, sep, weight = item.partition('=')
+            if not sep or name not in DEFAULT_MIX:
+                raise CommandError(f"Ожидается SCENARIO=WEIGHT, сценарии: {', '.join(DEFAULT_MIX)}")
+            mix[name] = float(weight)
+
+        users = max(1, options['users'])
+        accounts = self._accounts(users, options['password'])
+        if not accounts:
+            raise CommandError(
+                'Нет аккредитованных синтетических агентов с CRM-клиентами. '
+                'Сначала выполните generate_synthetic_data.'
+            )
+
+        test = LoadTest(
+            options['base_url'],
+            accounts,
+            users=users,
+            duration=options['duration'],
+            mix=mix,
+            think_ms=options['think_ms'],
+            ws_url=options['ws_url'],
+            timeout=options['timeout'],
+            seed=options['seed'],
+        )
+        self.stdout.write(
+            f"{users} users ({len(accounts)} accounts) for {options['duration']}s against {test.base_url}, "
+            f"ws {test.ws_url}; mix {test.mix}"
+        )
+        try:
+            rows = test.run()
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Load test interrupted.'))
+            return
+
+        self._print(rows, test.elapsed)
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as handle:
+                json.dump({
+                    'generated_at': timezone.now().isoformat(),
+                    'base_url': test.base_url,
+                    'ws_url': test.ws_url,
+                    'users': users,
+                    'duration_seconds': round(test.elapsed, 1),
+                    'think_ms': options['think_ms'],
+                    'mix': test.mix,
+                    'results': rows,
+                }, handle, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Report written to {options['json_path']}")
+
+    def _accounts(self, count, password):
+        agents = list(
+            User.objects.filter(
+                role=UserRole.AGENT,
+                is_active=True,
+                accreditation_status=User.AccreditationStatus.APPROVED,
+                email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}',
+                owned_companies__is_crm_client=True,
+            ).distinct().order_by('id')[:count]
+        )
+        companies = {}
+        for owner_id, company_id in CompanyProfile.objects.filter(
+            owner__in=agents, is_crm_client=True,
+        ).values_list('owner_id', 'id'):
+            companies.setdefault(owner_id, []).append(company_id)
+        applications = {}
+        for creator_id, application_id in Application.objects.filter(
+            created_by__in=agents,
+        ).order_by('-id').values_list('created_by_id', 'id')[:count * 20]:
+            applications.setdefault(creator_id, []).append(application_id)
+        return [
+            Account(
+                email=agent.email,
+                password=password,
+                company_ids=companies[agent.id],
+                application_ids=applications.get(agent.id, [])[:20],
+            )
+            for agent in agents
+        ]
+
+    def _print(self, rows, elapsed):
+        header = f"{'scenario':<20} {'count':>7} {'errors':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'rps':>8}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in rows:
+            line = (
+                f"{row['scenario']:<20} {row['requests']:>7} {row['errors']:>7} "
+                f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8} {row['rps']:>8}"
+            )
+            self.stdout.write(self.style.ERROR(line) if row['errors'] else line)
+            for sample in row['error_samples']:
+                self.stdout.write(f'    {sample}')
+        total = sum(row['requests'] for row in rows)
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} requests in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} rps)'
+        ))
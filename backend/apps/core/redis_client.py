@@ -0,0 +1,51 @@
+"""
+Direct access to the Redis server behind the default cache, for structures
+the cache API has no verbs for (hashes for buffered counters, sorted sets for
+chat presence).
+
+The client is built with the public redis-py API (Redis.from_url) from the
+cache LOCATION - the first server when several are configured, which is where
+Django's RedisCache writes - and shared per process. Keys go through the
+cache's make_and_validate_key(), so KEY_PREFIX and VERSION apply exactly as
+for regular cache entries.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+_clients: dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+
+def uses_redis_cache() -> bool:
+    return settings.CACHES['default']['BACKEND'].endswith('RedisCache')
+
+
+def redis_key(name: str) -> str:
+    """Full Redis key of a cache-style key name (prefix and version applied)."""
+    return cache.make_and_validate_key(name)
+
+
+def _primary_location() -> str:
+    location = settings.CACHES['default']['LOCATION']
+    if isinstance(location, str):
+        location = location.split(',')
+    return location[0].strip()
+
+
+def get_redis_client():
+    """Process-wide redis.Redis for the default cache server."""
+    url = _primary_location()
+    client = _clients.get(url)
+    if client is None:
+        import redis
+
+        with _clients_lock:
+            client = _clients.get(url)
+            if client is None:
+                client = _clients[url] = redis.Redis.from_url(url)
+    return client
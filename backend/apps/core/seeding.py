@@ -0,0 +1,178 @@
+"""
+Test data seeding shared by scripts/seed_test_data.py (manual dashboard
+testing) and the performance suite (apps.core.tests_performance).
+"""
+
+from datetime import date
+
+from django.contrib.auth import get_user_model
+
+from apps.applications.models import Application, ApplicationStatus, ProductType
+from apps.companies.models import CompanyProfile
+
+
+def seed_test_data(log=print) -> dict:
+    """
+    Idempotently create the dashboard test accounts: agent with company,
+    partner (bank), a PENDING bank guarantee application and a superuser.
+    Returns {'agent', 'company', 'partner', 'application', 'admin'}.
+    """
+    User = get_user_model()
+
+    log("=" * 60)
+    log("SEED DATA: Создание тестовых данных для Dashboard")
+    log("=" * 60)
+
+    # =====================
+    # 1. CREATE AGENT USER
+    # =====================
+    agent_email = "agent@lidergarantpanel.com"
+    agent_user, created = User.objects.get_or_create(
+        email=agent_email,
+        defaults={
+            'role': 'agent',
+            'first_name': 'Иван',
+            'last_name': 'Агентов',
+            'phone': '+7 (999) 123-45-67',
+            'is_active': True,
+        }
+    )
+    if created:
+        agent_user.set_password('Admin123!')
+        agent_user.save()
+        log(f"✓ Создан Agent: {agent_email}")
+    else:
+        log(f"• Agent уже существует: {agent_email}")
+
+    # =====================
+    # 2. CREATE AGENT'S COMPANY (with INN and Passport)
+    # =====================
+    try:
+        company = CompanyProfile.objects.get(owner=agent_user, is_crm_client=False)
+        log(f"• Компания агента уже существует: {company.name}")
+    except CompanyProfile.DoesNotExist:
+        company = CompanyProfile.objects.create(
+            owner=agent_user,
+            is_crm_client=False,
+            inn='7707123456',
+            kpp='770701001',
+            ogrn='1027700123456',
+            name='ООО "Тест-Финанс"',
+            short_name='Тест-Финанс',
+            legal_address='г. Москва, ул. Тестовая, д. 1',
+            actual_address='г. Москва, ул. Тестовая, д. 1',
+            director_name='Иванов Иван Иванович',
+            director_position='Генеральный директор',
+            # Passport data (for API-Ready structure)
+            passport_series='4510',
+            passport_number='123456',
+            passport_issued_by='ОВД Центрального района г. Москвы',
+            passport_date=date(2015, 5, 15),
+            passport_code='770-001',
+            # Founders
+            founders_data=[
+                {'name': 'Иванов И.И.', 'inn': '771234567890', 'share': 100.0}
+            ],
+            # Bank accounts
+            bank_accounts_data=[
+                {'account': '40702810500000012345', 'bic': '044525225', 'bank_name': 'ПАО Сбербанк'}
+            ],
+            bank_name='ПАО Сбербанк',
+            bank_bic='044525225',
+            bank_account='40702810500000012345',
+            bank_corr_account='30101810400000000225',
+            contact_person='Иванов Иван Иванович',
+            contact_phone='+7 (999) 123-45-67',
+            contact_email=agent_email,
+        )
+        log(f"✓ Создана компания: {company.name} (ИНН: {company.inn})")
+
+    # =====================
+    # 3. CREATE PARTNER USER (Bank)
+    # =====================
+    partner_email = "partner@lidergarantpanel.com"
+    partner_user, created = User.objects.get_or_create(
+        email=partner_email,
+        defaults={
+            'role': 'partner',
+            'first_name': 'Сергей',
+            'last_name': 'Партнёров',
+            'phone': '+7 (495) 500-55-55',
+            'is_active': True,
+        }
+    )
+    if created:
+        partner_user.set_password('Admin123!')
+        partner_user.save()
+        log(f"✓ Создан Partner (Bank): {partner_email}")
+    else:
+        log(f"• Partner уже существует: {partner_email}")
+
+    # =====================
+    # 4. CREATE APPLICATION (PENDING status)
+    # =====================
+    # Check if test application already exists
+    existing_app = Application.objects.filter(
+        created_by=agent_user, 
+        company=company,
+        target_bank_name='Сбербанк'
+    ).first()
+
+    application = existing_app
+    if existing_app:
+        log(f"• Заявка уже существует: #{existing_app.id} - {existing_app.status}")
+        # Update status to PENDING for testing
+        if existing_app.status != ApplicationStatus.PENDING:
+            existing_app.status = ApplicationStatus.PENDING
+            existing_app.save()
+            log(f"  → Статус обновлён на PENDING")
+    else:
+        application = Application.objects.create(
+            created_by=agent_user,
+            company=company,
+            product_type=ProductType.BANK_GUARANTEE,
+            amount=5000000.00,
+            term_months=12,
+            target_bank_name='Сбербанк',
+            tender_number='0373100112523000001',
+            tender_platform='zakupki.gov.ru',
+            status=ApplicationStatus.PENDING,
+            notes='Тестовая заявка на банковскую гарантию',
+        )
+        log(f"✓ Создана заявка: #{application.id}")
+        log(f"  - Продукт: {application.get_product_type_display()}")
+        log(f"  - Сумма: {application.amount:,.2f} ₽")
+        log(f"  - Целевой банк: {application.target_bank_name}")
+        log(f"  - Статус: {application.get_status_display()}")
+
+    # =====================
+    # 5. CREATE SUPERUSER (Admin)
+    # =====================
+    admin_email = "admin@lidergarantpanel.com"
+    if not User.objects.filter(email=admin_email).exists():
+        User.objects.create_superuser(
+            email=admin_email,
+            password='Admin123!',
+            first_name='Admin',
+            last_name='User'
+        )
+        log(f"✓ Создан Superuser: {admin_email}")
+    else:
+        log(f"• Superuser уже существует: {admin_email}")
+
+    log("=" * 60)
+    log("SEED DATA: Готово!")
+    log("=" * 60)
+    log("\nДанные для входа:")
+    log(f"  Agent:   {agent_email} / Admin123!")
+    log(f"  Partner: {partner_email} / Admin123!")
+    log(f"  Admin:   {admin_email} / Admin123!")
+    log("=" * 60)
+
+    return {
+        'agent': agent_user,
+        'company': company,
+        'partner': partner_user,
+        'application': application,
+        'admin': User.objects.get(email=admin_email),
+    }
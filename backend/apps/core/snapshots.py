@@ -0,0 +1,112 @@
+"""
+Process-local snapshots of small reference tables, versioned in the shared cache.
+
+A snapshot is built once per process (maps, indexes, compiled matchers) and
+reused until its version token in the shared cache changes. Model changes
+bump the token so every worker rebuilds on the next read after
+SNAPSHOT_CHECK_INTERVAL_SECONDS.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedSnapshot:
+    """
+    Lazily built immutable object shared by all threads of a process.
+
+    Builds run under a lock; readers on the fast path never block and never
+    see a missing value while a rebuild is in progress.
+    """
+
+    def __init__(self, name: str, builder: Callable[[], Any], check_interval_setting: str = 'SNAPSHOT_CHECK_INTERVAL_SECONDS'):
+        self.name = name
+        self._builder = builder
+        self._check_interval_setting = check_interval_setting
+        self._lock = threading.Lock()
+        # (version, generation, value), replaced as a whole so lock-free readers
+        # always see a consistent build; never reset to None once built.
+        self._state: tuple[str, int, Any] | None = None
+        self._generation = 0
+        self._checked_at = 0.0
+
+    @property
+    def version_key(self) -> str:
+        return f'refdata:{self.name}:version'
+
+    @property
+    def version(self) -> str | None:
+        state = self._state
+        return state[0] if state is not None else None
+
+    def _check_interval(self) -> float:
+        return float(getattr(settings, self._check_interval_setting, 5))
+
+    def _shared_version(self) -> str:
+        try:
+            version = cache.get(self.version_key)
+            if version is None:
+                version = uuid.uuid4().hex
+                if not cache.add(self.version_key, version, timeout=None):
+                    version = cache.get(self.version_key) or version
+            return version
+        except Exception as exc:
+            # Shared cache outage must not break reads: keep the local snapshot.
+            logger.warning("Snapshot %s: shared version unavailable: %s", self.name, exc)
+            return self.version or ''
+
+    def current(self) -> Any:
+        state = self._state
+        if state is not None and time.monotonic() - self._checked_at < self._check_interval():
+            return state[2]
+
+        with self._lock:
+            state = self._state
+            if state is not None and time.monotonic() - self._checked_at < self._check_interval():
+                return state[2]
+            version = self._shared_version()
+            generation = self._generation
+            if state is None or state[0] != version or state[1] != generation:
+                # Readers keep getting the previous build until this one is published
+                state = (version, generation, self._builder())
+                self._state = state
+            self._checked_at = time.monotonic()
+            return state[2]
+
+    def invalidate(self) -> None:
+        """Rebuild on the next read and publish a new version for other workers."""
+        with self._lock:
+            self._generation += 1
+            self._checked_at = 0.0
+        try:
+            cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+        except Exception as exc:
+            logger.warning("Snapshot %s: failed to publish new version: %s", self.name, exc)
+
+    def invalidate_on(self, *senders) -> None:
+        """Rebuild whenever any of `senders` (models or M2M through models) change."""
+        def _handler(**kwargs):
+            action = kwargs.get('action')
+            if action is not None and not action.startswith('post_'):
+                return
+            # Only after commit (immediately in autocommit): no worker, this
+            # one included, may keep a build of uncommitted data.
+            transaction.on_commit(self.invalidate)
+
+        for sender in senders:
+            uid = f'snapshot-invalidate:{self.name}:{sender._meta.label}'
+            post_save.connect(_handler, sender=sender, weak=False, dispatch_uid=f'{uid}:save')
+            post_delete.connect(_handler, sender=sender, weak=False, dispatch_uid=f'{uid}:delete')
+            m2m_changed.connect(_handler, sender=sender, weak=False, dispatch_uid=f'{uid}:m2m')
@@ -0,0 +1,615 @@
+"""
+Production-shaped synthetic dataset for load tests and query profiling.
+
+Unlike apps.core.seeding (a handful of fixed dashboard accounts) this builds
+tens of thousands of companies and hundreds of thousands of applications,
+chat messages and notifications with realistic distributions:
+
+- role mix: a few admins and partner banks, hundreds of agents (accreditation
+  statuses mixed), thousands of clients, 60% of them invited by an agent;
+- CRM duplicates: agents' CRM companies partly reuse INNs of registered
+  clients (confirmed) and of other agents' CRM clients;
+- skewed activity: agents are picked by a Zipf-like weight, so a few agents
+  own most of the applications (the list endpoints' worst case);
+- status histories: each application walks Application.VALID_TRANSITIONS
+  from draft; every step leaves a status_change notification and partner
+  steps leave PartnerDecision rows;
+- chat threads with heavy-tailed (Pareto) lengths, ChatThread summaries and
+  ChatReadState watermarks written directly (no per-thread rebuild).
+
+Rows get their primary keys reserved up front (Postgres: from the table
+sequence, elsewhere: above the current max id), so children are generated in
+the same pass as their parents and written per chunk: `COPY ... FROM STDIN`
+on PostgreSQL, `bulk_create` elsewhere (or with use_copy=False). Signals do
+not fire, exactly like the bulk paths of the application code.
+
+Entry point: `python manage.py generate_synthetic_data --scale 0.1`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import csv
+import io
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, fields, replace
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.applications.models import (
+    Application,
+    ApplicationStatus,
+    ChatReadState,
+    ChatThread,
+    PartnerDecision,
+    ProductType,
+    TicketMessage,
+)
+from apps.bank_conditions.models import Bank
+from apps.companies.models import CompanyProfile
+from apps.notifications.models import Notification, NotificationType
+from apps.users.models import User, UserRole
+
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.lidergarant.test'
+SYNTHETIC_PASSWORD = 'Synthetic123!'
+
+
+@dataclass(frozen=True)
+class ScaleProfile:
+    """Row counts and distribution knobs at scale 1.0 (~1.5M rows)."""
+    admins: int = 5
+    partners: int = 25
+    agents: int = 500
+    clients: int = 5000
+    crm_companies_per_agent: int = 40
+    applications: int = 200_000
+    # Share of CRM companies reusing an INN that already exists
+    crm_duplicate_ratio: float = 0.35
+    # Share of applications created by agents (the rest by clients)
+    agent_application_share: float = 0.7
+    # Share of non-draft applications with a chat thread
+    chat_share: float = 0.6
+    # Pareto shape of the thread length (mean ~ alpha / (alpha - 1))
+    thread_length_alpha: float = 1.25
+    max_thread_length: int = 300
+    history_days: int = 540
+
+    def scaled(self, factor: float, **overrides) -> 'ScaleProfile':
+        """Scale the row counts (not the ratios); explicit overrides win."""
+        profile = replace(self, **{
+            name: max(1, int(round(getattr(self, name) * factor)))
+            for name in ('partners', 'agents', 'clients', 'applications')
+        })
+        known = {field.name for field in fields(self)}
+        for name in overrides:
+            if name not in known:
+                raise ValueError(f'Неизвестный параметр масштаба: {name}')
+        return replace(profile, **{
+            name: type(getattr(self, name))(value) for name, value in overrides.items()
+        })
+
+
+# Status walk: probability to stop in the state, per state
+STOP_PROBABILITY = {
+    ApplicationStatus.DRAFT: 0.08,
+    ApplicationStatus.PENDING: 0.15,
+    ApplicationStatus.IN_REVIEW: 0.2,
+    ApplicationStatus.INFO_REQUESTED: 0.3,
+    ApplicationStatus.APPROVED: 0.45,
+}
+MAX_STATUS_STEPS = 8
+PARTNER_DECISIONS = {
+    ApplicationStatus.APPROVED: PartnerDecision.DecisionType.APPROVED,
+    ApplicationStatus.REJECTED: PartnerDecision.DecisionType.REJECTED,
+    ApplicationStatus.INFO_REQUESTED: PartnerDecision.DecisionType.INFO_REQUESTED,
+}
+
+PRODUCT_WEIGHTS = {
+    ProductType.BANK_GUARANTEE: 55,
+    ProductType.CONTRACT_LOAN: 12,
+    ProductType.TENDER_LOAN: 8,
+    ProductType.CORPORATE_CREDIT: 8,
+    ProductType.FACTORING: 5,
+    ProductType.LEASING: 4,
+    ProductType.RKO: 3,
+    ProductType.INSURANCE: 2,
+    ProductType.SPECIAL_ACCOUNT: 1,
+    ProductType.VED: 1,
+    ProductType.TENDER_SUPPORT: 1,
+}
+
+CLIENT_PHRASES = [
+    'Добрый день! Какие документы ещё нужны?',
+    'Загрузили бухгалтерскую отчётность за последний квартал.',
+    'Подскажите, когда будет решение по заявке?',
+    'Можно ли снизить комиссию?',
+    'Спасибо, ждём.',
+]
+STAFF_PHRASES = [
+    'Здравствуйте! Заявка передана в банк.',
+    'Банк запросил выписку по расчётному счёту за 6 месяцев.',
+    'Пожалуйста, подпишите анкету ЭЦП.',
+    'Решение ожидается в течение двух рабочих дней.',
+    'Заявка одобрена, направляем условия.',
+]
+BANK_PHRASES = [
+    'Требуется актуальная карточка предприятия.',
+    'Условия согласованы, ожидаем оплату комиссии.',
+]
+FIRST_NAMES = ['Иван', 'Анна', 'Сергей', 'Мария', 'Дмитрий', 'Елена', 'Алексей', 'Ольга']
+LAST_NAMES = ['Иванов', 'Петрова', 'Смирнов', 'Кузнецова', 'Попов', 'Соколова', 'Лебедев', 'Новикова']
+COMPANY_WORDS = ['Строй', 'Торг', 'Тех', 'Инвест', 'Снаб', 'Пром', 'Монтаж', 'Логистик']
+CITIES = ['г. Москва', 'г. Санкт-Петербург', 'г. Казань', 'г. Екатеринбург', 'г. Новосибирск']
+
+
+class IdAllocator:
+    """Reserve primary keys before the rows are written."""
+
+    def __init__(self, model):
+        self.model = model
+        self._next = None
+
+    def take(self, count: int) -> list[int]:
+        if count <= 0:
+            return []
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+                    [self.model._meta.db_table, self.model._meta.pk.column, count],
+                )
+                return [row[0] for row in cursor.fetchall()]
+        if self._next is None:
+            self._next = (self.model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        ids = list(range(self._next, self._next + count))
+        self._next += count
+        return ids
+
+
+@contextlib.contextmanager
+def _explicit_timestamps(model):
+    """Let bulk_create keep the generated created_at/updated_at values."""
+    patched = [
+        (field, field.auto_now, field.auto_now_add)
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    for field, _, _ in patched:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in patched:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _copy_value(field, obj):
+    value = field.get_prep_value(getattr(obj, field.attname))
+    if value is None:
+        return r'\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class TableWriter:
+    """Buffers model instances and writes them with COPY or bulk_create."""
+
+    def __init__(self, model, *, use_copy: bool, batch_size: int):
+        self.model = model
+        self.use_copy = use_copy and connection.vendor == 'postgresql'
+        self.batch_size = batch_size
+        self.rows = []
+        self.written = 0
+        self._timestamp_fields = [
+            field.attname for field in model._meta.concrete_fields
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+        ]
+
+    def add(self, obj):
+        for attname in self._timestamp_fields:
+            if getattr(obj, attname) is None:
+                setattr(obj, attname, timezone.now())
+        self.rows.append(obj)
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.use_copy:
+            self._copy(self.rows)
+        else:
+            with _explicit_timestamps(self.model):
+                self.model.objects.bulk_create(self.rows, batch_size=self.batch_size)
+        self.written += len(self.rows)
+        self.rows = []
+
+    def _copy(self, rows):
+        pk = self.model._meta.pk
+        # Auto pks left unset are filled by the column default
+        columns = [
+            field for field in self.model._meta.concrete_fields
+            if not (field is pk and isinstance(field, models.AutoField) and rows[0].pk is None)
+        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in rows:
+            writer.writerow([_copy_value(field, obj) for field in columns])
+        buffer.seek(0)
+        sql = "COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')".format(
+            connection.ops.quote_name(self.model._meta.db_table),
+            ', '.join(connection.ops.quote_name(field.column) for field in columns),
+        )
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy_expert'):  # psycopg2
+                raw.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+
+class SyntheticDataGenerator:
+    """Builds the dataset described in the module docstring."""
+
+    def __init__(self, profile: ScaleProfile, *, seed: int = 42, batch_size: int = 5000,
+                 use_copy: bool = True, log=print):
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.batch_size = max(100, batch_size)
+        self.use_copy = use_copy
+        self.log = log
+        self.now = timezone.now()
+        self.writers = {
+            model: TableWriter(model, use_copy=use_copy, batch_size=self.batch_size)
+            for model in (
+                User, Bank, CompanyProfile, Application, TicketMessage,
+                ChatThread, ChatReadState, PartnerDecision, Notification,
+            )
+        }
+        self.ids = {model: IdAllocator(model) for model in (User, CompanyProfile, Application, TicketMessage)}
+        self.password = make_password(SYNTHETIC_PASSWORD)
+        self._inn_counter = self.rng.randrange(10 ** 8)
+
+    @property
+    def uses_copy(self) -> bool:
+        return self.use_copy and connection.vendor == 'postgresql'
+
+    def run(self) -> dict:
+        started = time.monotonic()
+        self._create_users()
+        self._create_companies()
+        self._create_applications()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for model in self.writers:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+        stats = {model._meta.label: writer.written for model, writer in self.writers.items()}
+        stats['seconds'] = round(time.monotonic() - started, 1)
+        return stats
+
+    # ------------------------------------------------------------------
+    # helpers
+
+    def _flush(self):
+        with transaction.atomic():
+            for writer in self.writers.values():
+                writer.flush()
+
+    def _past(self, max_days=None):
+        """A moment in the past, skewed towards recent dates (growing traffic)."""
+        days = max_days or self.profile.history_days
+        return self.now - timedelta(seconds=(self.rng.random() ** 1.6) * days * 86400)
+
+    def _person(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def _new_inn(self):
+        self._inn_counter += 1
+        return f'77{self._inn_counter % 10 ** 8:08d}'
+
+    def _user(self, user_id, role, **extra):
+        first_name, last_name = self._person()
+        joined = extra.pop('date_joined', None) or self._past()
+        return User(
+            id=user_id,
+            email=f'{role}.{user_id}@{SYNTHETIC_EMAIL_DOMAIN}',
+            password=self.password,
+            role=role,
+            first_name=first_name,
+            last_name=last_name,
+            phone=f'+7 (9{self.rng.randrange(10, 100)}) {self.rng.randrange(100, 1000)}-'
+                  f'{self.rng.randrange(10, 100)}-{self.rng.randrange(10, 100)}',
+            is_active=True,
+            email_verified=True,
+            date_joined=joined,
+            updated_at=joined,
+            **extra,
+        )
+
+    def _company(self, company_id, owner_id, inn, name, *, is_crm_client, client_status='pending'):
+        created = self._past()
+        return CompanyProfile(
+            id=company_id,
+            owner_id=owner_id,
+            is_crm_client=is_crm_client,
+            client_status=client_status,
+            is_accredited=client_status == 'confirmed',
+            inn=inn,
+            kpp=f'{inn[:4]}01001',
+            ogrn=f'1{inn}{self.rng.randrange(100, 1000)}'[:13],
+            name=f'ООО "{name}"',
+            short_name=name,
+            legal_address=f'{self.rng.choice(CITIES)}, ул. Промышленная, д. {self.rng.randrange(1, 200)}',
+            director_name=' '.join(self._person()),
+            director_position='Генеральный директор',
+            created_at=created,
+            updated_at=created,
+        )
+
+    # ------------------------------------------------------------------
+    # users and companies
+
+    def _create_users(self):
+        profile = self.profile
+        self.admin_ids = self.ids[User].take(profile.admins)
+        for user_id in self.admin_ids:
+            self.writers[User].add(self._user(user_id, UserRole.ADMIN, is_staff=True))
+
+        self.partner_ids = self.ids[User].take(profile.partners)
+        for n, user_id in enumerate(self.partner_ids):
+            self.writers[User].add(self._user(user_id, UserRole.PARTNER))
+            self.writers[Bank].add(Bank(
+                name=f'Синтетический банк {user_id}',
+                short_name=f'Банк {user_id}',
+                order=n,
+                partner_user_id=user_id,
+            ))
+        # A few big banks take most of the applications
+        self.partner_weights = [1 / (rank + 1) for rank in range(len(self.partner_ids))]
+
+        statuses = (
+            [User.AccreditationStatus.APPROVED] * 85
+            + [User.AccreditationStatus.PENDING] * 10
+            + [User.AccreditationStatus.REJECTED] * 5
+        )
+        self.agent_ids = self.ids[User].take(profile.agents)
+        for user_id in self.agent_ids:
+            status = self.rng.choice(statuses)
+            joined = self._past()
+            self.writers[User].add(self._user(
+                user_id, UserRole.AGENT,
+                date_joined=joined,
+                accreditation_status=status,
+                accreditation_submitted_at=joined + timedelta(days=1),
+            ))
+        # Zipf-like activity: a few agents own most of the applications
+        self.agent_cum_weights = list(_cumulative(1 / (rank + 1) ** 0.8 for rank in range(len(self.agent_ids))))
+
+        self.client_ids = self.ids[User].take(profile.clients)
+        for user_id in self.client_ids:
+            invited_by = self.rng.choice(self.agent_ids) if self.rng.random() < 0.6 else None
+            self.writers[User].add(self._user(user_id, UserRole.CLIENT, invited_by_id=invited_by))
+        self.client_set = set(self.client_ids)
+        self._flush()
+        self.log(f'Пользователи: {self.writers[User].written}')
+
+    def _create_companies(self):
+        profile = self.profile
+        self.client_company = {}
+        known_inns = []  # (inn, short name): pool for CRM duplicates
+
+        owners = self.agent_ids + self.client_ids
+        company_ids = iter(self.ids[CompanyProfile].take(len(owners)))
+        for owner_id in owners:
+            inn, name = self._new_inn(), self._company_name()
+            company_id = next(company_ids)
+            self.writers[CompanyProfile].add(self._company(company_id, owner_id, inn, name, is_crm_client=False))
+            if owner_id in self.client_set:
+                self.client_company[owner_id] = company_id
+                known_inns.append((inn, name, True))
+        registered = len(known_inns)
+
+        self.agent_crm_companies = {}
+        pending = 0
+        for agent_id in self.agent_ids:
+            count = max(1, int(self.rng.expovariate(1 / profile.crm_companies_per_agent)))
+            ids = self.ids[CompanyProfile].take(count)
+            self.agent_crm_companies[agent_id] = ids
+            for company_id in ids:
+                if known_inns and self.rng.random() < profile.crm_duplicate_ratio:
+                    inn, name, is_registered = known_inns[self.rng.randrange(len(known_inns))]
+                else:
+                    inn, name, is_registered = self._new_inn(), self._company_name(), False
+                    known_inns.append((inn, name, False))
+                self.writers[CompanyProfile].add(self._company(
+                    company_id, agent_id, inn, name, is_crm_client=True,
+                    client_status='confirmed' if is_registered else 'pending',
+                ))
+                pending += 1
+                if pending >= self.batch_size:
+                    self._flush()
+                    pending = 0
+        self._flush()
+        self.log(
+            f'Компании: {self.writers[CompanyProfile].written} '
+            f'(ИНН: {len(known_inns)}, из них клиентов: {registered})'
+        )
+
+    def _company_name(self):
+        return f'{self.rng.choice(COMPANY_WORDS)}{self.rng.choice(COMPANY_WORDS).lower()}-{self.rng.randrange(1, 1000)}'
+
+    # ------------------------------------------------------------------
+    # applications, status histories, chats, notifications
+
+    def _create_applications(self):
+        profile = self.profile
+        products = list(PRODUCT_WEIGHTS)
+        product_weights = list(_cumulative(PRODUCT_WEIGHTS.values()))
+        partner_cum_weights = list(_cumulative(self.partner_weights))
+        remaining = profile.applications
+        while remaining > 0:
+            chunk = min(self.batch_size, remaining)
+            remaining -= chunk
+            for application_id in self.ids[Application].take(chunk):
+                if self.rng.random() < profile.agent_application_share:
+                    creator = self.rng.choices(self.agent_ids, cum_weights=self.agent_cum_weights)[0]
+                    company_id = self.rng.choice(self.agent_crm_companies[creator])
+                else:
+                    creator = self.rng.choice(self.client_ids)
+                    company_id = self.client_company[creator]
+                partner = self.rng.choices(self.partner_ids, cum_weights=partner_cum_weights)[0]
+                product = self.rng.choices(products, cum_weights=product_weights)[0]
+                self._application(application_id, creator, company_id, partner, product)
+            self._flush()
+            self.log(
+                f'Заявки: {self.writers[Application].written}/{profile.applications}, '
+                f'сообщения: {self.writers[TicketMessage].written}, '
+                f'уведомления: {self.writers[Notification].written}'
+            )
+
+    def _status_history(self, created_at):
+        """[(status, at)] walk over Application.VALID_TRANSITIONS from draft."""
+        history = [(ApplicationStatus.DRAFT, created_at)]
+        at = created_at
+        while len(history) < MAX_STATUS_STEPS:
+            current = history[-1][0]
+            options = sorted(Application.VALID_TRANSITIONS.get(current, ()))
+            if not options or self.rng.random() < STOP_PROBABILITY.get(current, 1):
+                break
+            at = min(self.now, at + timedelta(hours=self.rng.expovariate(1 / 30)))
+            history.append((self.rng.choice(options), at))
+        return history
+
+    def _application(self, application_id, creator, company_id, partner, product):
+        created_at = self._past()
+        history = self._status_history(created_at)
+        status, updated_at = history[-1]
+        submitted_at = history[1][1] if len(history) > 1 else None
+        reached_bank = any(step in (ApplicationStatus.IN_REVIEW, ApplicationStatus.APPROVED,
+                                    ApplicationStatus.REJECTED) for step, _ in history)
+        amount = Decimal(int(math.exp(self.rng.gauss(15, 1.2)) // 1000 * 1000) or 100000)
+        self.writers[Application].add(Application(
+            id=application_id,
+            created_by_id=creator,
+            company_id=company_id,
+            product_type=product,
+            amount=min(amount, Decimal('9999999999999')),
+            term_months=self.rng.choice([3, 6, 12, 12, 18, 24, 36]),
+            status=status,
+            target_bank_name=f'Банк {partner}',
+            assigned_partner_id=partner if reached_bank else None,
+            submitted_at=submitted_at,
+            created_at=created_at,
+            updated_at=updated_at,
+        ))
+
+        for (old_status, _), (new_status, at) in zip(history, history[1:]):
+            if reached_bank and old_status == ApplicationStatus.IN_REVIEW and new_status in PARTNER_DECISIONS:
+                self.writers[PartnerDecision].add(PartnerDecision(
+                    application_id=application_id,
+                    partner_id=partner,
+                    decision=PARTNER_DECISIONS[new_status],
+                    offered_rate=Decimal(self.rng.randrange(150, 600)) / 100
+                    if new_status == ApplicationStatus.APPROVED else None,
+                    created_at=at,
+                ))
+            self._notify(creator, NotificationType.STATUS_CHANGE, 'Изменение статуса заявки',
+                         f'Заявка #{application_id}: {ApplicationStatus(new_status).label}', at, {
+                             'application_id': application_id,
+                             'old_status': old_status,
+                             'new_status': new_status,
+                             'status_display': ApplicationStatus(new_status).label,
+                         })
+
+        if status != ApplicationStatus.DRAFT and self.rng.random() < self.profile.chat_share:
+            self._thread(application_id, creator, partner if reached_bank else None, submitted_at or created_at)
+
+    def _thread(self, application_id, creator, partner, started_at):
+        length = min(self.profile.max_thread_length, int(self.rng.paretovariate(self.profile.thread_length_alpha)))
+        admin = self.rng.choice(self.admin_ids)
+        message_ids = self.ids[TicketMessage].take(length)
+        at = started_at
+        last = last_client = None
+        sent_at = {}
+        for message_id in message_ids:
+            at = min(self.now, at + timedelta(minutes=self.rng.expovariate(1 / 240)))
+            roll = self.rng.random()
+            if partner and roll < 0.1:
+                sender, role, content, is_bank = partner, UserRole.PARTNER, self.rng.choice(BANK_PHRASES), True
+            elif roll < 0.55:
+                sender, role, content, is_bank = creator, None, self.rng.choice(CLIENT_PHRASES), False
+            else:
+                sender, role, content, is_bank = admin, UserRole.ADMIN, self.rng.choice(STAFF_PHRASES), False
+            self.writers[TicketMessage].add(TicketMessage(
+                id=message_id,
+                application_id=application_id,
+                sender_id=sender,
+                content=content,
+                is_bank_message=is_bank,
+                created_at=at,
+            ))
+            sent_at[message_id] = at
+            last = (message_id, at, role or self._role_of(creator))
+            if role != UserRole.ADMIN:
+                last_client = message_id
+            if sender != creator:
+                self._notify(creator, NotificationType.CHAT_MESSAGE, 'Новое сообщение', content[:100], at, {
+                    'application_id': application_id,
+                    'preview_text': content[:100],
+                })
+
+        last_id, last_at, last_role = last
+        # Old threads are read; recent ones are partly unread
+        settled = self.now - last_at > timedelta(days=2)
+        admin_read = (last_client or 0) if settled or self.rng.random() < 0.5 else 0
+        self.writers[ChatThread].add(ChatThread(
+            application_id=application_id,
+            last_message_id=last_id,
+            last_message_at=last_at,
+            last_sender_role=last_role,
+            last_client_message_id=last_client,
+            message_count=len(message_ids),
+            admin_read_message_id=admin_read,
+            admin_read_message_at=sent_at.get(admin_read),
+        ))
+        read_up_to = last_id if settled or self.rng.random() < 0.6 else self.rng.choice(message_ids)
+        self.writers[ChatReadState].add(ChatReadState(
+            user_id=creator,
+            application_id=application_id,
+            last_read_message_id=read_up_to,
+            last_read_message_at=sent_at[read_up_to],
+            last_read_at=last_at,
+        ))
+
+    def _role_of(self, user_id):
+        return UserRole.CLIENT if user_id in self.client_set else UserRole.AGENT
+
+    def _notify(self, user_id, kind, title, message, at, data):
+        self.writers[Notification].add(Notification(
+            user_id=user_id,
+            type=kind,
+            title=title,
+            message=message,
+            data=data,
+            is_read=self.now - at > timedelta(days=7) or self.rng.random() < 0.3,
+            created_at=at,
+        ))
+
+
+def _cumulative(weights):
+    total = 0
+    for weight in weights:
+        total += weight
+        yield total
@@ -0,0 +1,241 @@
+"""
+Server-side table protocol for admin list endpoints.
+
+Query parameters (all optional):
+- search=<text>            substring search over the view's table_search_fields
+- ordering=<field>|-<field> one of table_ordering_fields (default table_default_ordering)
+- <filter>=<value>         exact filters declared in table_filter_fields
+- limit=<n>, cursor=<tok>  keyset page over (ordering field, id)
+
+Paged response:
+    {"results": [...], "next_cursor": "..."|null, "limit": n,
+     "total": n, "total_is_estimate": bool}
+
+Compatibility: while ADMIN_TABLE_LEGACY_FULL_LIST is on, requests without
+limit/cursor get the whole (filtered) list as a plain array, as before.
+Ordering fields must be non-null columns, each backed by an index.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import connection
+from django.db.models import BooleanField, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+TRUE_VALUES = ('true', '1', 'yes')
+FALSE_VALUES = ('false', '0', 'no')
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _lookup_field(model, lookup: str):
+    """Model field an ORM lookup path ends on, or None if it ends on a transform/lookup."""
+    opts, field = model._meta, None
+    for part in lookup.split('__'):
+        if field is not None:
+            if not field.is_relation:
+                return None
+            opts = field.related_model._meta
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            return None
+    return field
+
+
+def _parse_filter_value(model, param: str, lookup: str, value: str):
+    """Query-string value converted for the filtered field: bool only for boolean fields."""
+    value = value.strip()
+    field = _lookup_field(model, lookup)
+    if isinstance(field, BooleanField) or lookup.endswith('__isnull'):
+        lowered = value.lower()
+        if lowered in TRUE_VALUES:
+            return True
+        if lowered in FALSE_VALUES:
+            return False
+        raise ValidationError({param: 'Ожидается true или false'})
+    if field is None:
+        return value
+    try:
+        return field.to_python(value)
+    except DjangoValidationError:
+        raise ValidationError({param: 'Некорректное значение'})
+
+
+def encode_cursor(value, pk) -> str:
+    raw = json.dumps([value, pk], ensure_ascii=False, default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        value, pk = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValidationError({'cursor': 'Некорректный курсор'})
+    return value, pk
+
+
+def estimate_total(queryset) -> tuple[int, bool]:
+    """
+    Row count for the table footer. Unfiltered PostgreSQL tables use the
+    planner estimate; otherwise the count stops at ADMIN_TABLE_COUNT_LIMIT.
+    """
+    cap = int(_setting('ADMIN_TABLE_COUNT_LIMIT', 10000))
+    if connection.vendor == 'postgresql' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] > cap:
+            return int(row[0]), True
+
+    total = queryset.order_by()[:cap].count()
+    return total, total >= cap
+
+
+class AdminTablePagination(BasePagination):
+    """Keyset pagination driven by AdminTableMixin.table_sort."""
+
+    def is_requested(self, request) -> bool:
+        params = request.query_params
+        if 'limit' in params or 'cursor' in params:
+            return True
+        return not _setting('ADMIN_TABLE_LEGACY_FULL_LIST', True)
+
+    def _limit(self, request) -> int:
+        raw = request.query_params.get('limit')
+        if raw in (None, ''):
+            return DEFAULT_LIMIT
+        try:
+            limit = int(raw)
+        except (TypeError, ValueError):
+            raise ValidationError({'limit': 'Должно быть целым числом'})
+        return max(1, min(limit, MAX_LIMIT))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if view is not None and not view.is_table_request():
+            return None
+        if not self.is_requested(request):
+            return None
+
+        self.limit = self._limit(request)
+        field_name, descending = view.table_sort
+        field = queryset.model._meta.get_field(field_name)
+        self.total, self.total_is_estimate = estimate_total(queryset)
+
+        token = request.query_params.get('cursor')
+        if token:
+            value, pk = decode_cursor(token)
+            try:
+                value = field.to_python(value)
+            except DjangoValidationError:
+                raise ValidationError({'cursor': 'Некорректный курсор'})
+            op = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field_name}__{op}': value}) | Q(**{field_name: value, f'pk__{op}': pk})
+            )
+
+        rows = list(queryset[:self.limit + 1])
+        self.next_cursor = None
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            self.next_cursor = encode_cursor(field.value_to_string(last), last.pk)
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'results': data,
+            'next_cursor': self.next_cursor,
+            'limit': self.limit,
+            'total': self.total,
+            'total_is_estimate': self.total_is_estimate,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'results': schema,
+                'next_cursor': {'type': 'string', 'nullable': True},
+                'limit': {'type': 'integer'},
+                'total': {'type': 'integer'},
+                'total_is_estimate': {'type': 'boolean'},
+            },
+        }
+
+
+class AdminTableMixin:
+    """
+    Adds filter / search / ordering / cursor paging to an admin list view.
+
+    Views declare:
+    - table_filter_fields: {query param: ORM lookup}
+    - table_search_fields: fields searched with icontains (or override search_table)
+    - table_ordering_fields: {public name: model field}
+    - table_default_ordering: e.g. '-created_at'
+    - table_actions: actions using the protocol (default: list)
+    """
+
+    pagination_class = AdminTablePagination
+    table_filter_fields: dict = {}
+    table_search_fields: tuple = ()
+    table_ordering_fields: dict = {}
+    table_default_ordering: str = '-created_at'
+    table_actions: tuple = ('list',)
+
+    def is_table_request(self) -> bool:
+        return getattr(self, 'action', 'list') in self.table_actions
+
+    def search_table(self, queryset, term: str):
+        query = Q()
+        for field in self.table_search_fields:
+            query |= Q(**{f'{field}__icontains': term})
+        return queryset.filter(query)
+
+    def _table_sort(self, ordering: str | None) -> tuple[str, bool]:
+        ordering = (ordering or self.table_default_ordering).strip()
+        descending = ordering.startswith('-')
+        name = ordering.lstrip('-')
+        if name not in self.table_ordering_fields:
+            raise ValidationError({
+                'ordering': f'Допустимые значения: {", ".join(sorted(self.table_ordering_fields))}'
+            })
+        return self.table_ordering_fields[name], descending
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.is_table_request():
+            return queryset
+
+        params = self.request.query_params
+        for param, lookup in self.table_filter_fields.items():
+            value = params.get(param)
+            if value not in (None, ''):
+                queryset = queryset.filter(**{lookup: _parse_filter_value(queryset.model, param, lookup, value)})
+
+        term = ' '.join((params.get('search') or '').split())
+        if term:
+            queryset = self.search_table(queryset, term)
+
+        self.table_sort = self._table_sort(params.get('ordering'))
+        paged = self.paginator is not None and self.paginator.is_requested(self.request)
+        if paged or params.get('ordering'):
+            field_name, descending = self.table_sort
+            prefix = '-' if descending else ''
+            queryset = queryset.order_by(f'{prefix}{field_name}', f'{prefix}pk')
+        return queryset
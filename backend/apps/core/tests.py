@@ -0,0 +1,254 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.applications.models import Application, ChatThread, TicketMessage
+from apps.core.caching import get_cache_stats, get_or_compute
+from apps.core.counters import bulk_increment
+from apps.core.loadtest import LatencyRecorder, percentile
+from apps.core.snapshots import VersionedSnapshot
+from apps.core.synthetic import ScaleProfile, SyntheticDataGenerator
+from apps.news.counters import news_views
+from apps.news.models import News
+from apps.users.models import User, UserRole
+
+
+class GetOrComputeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_value_computed_once_and_counted(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {'value': 42}
+
+        self.assertEqual(get_or_compute('tests', 'answer', compute), {'value': 42})
+        self.assertEqual(get_or_compute('tests', 'answer', compute), {'value': 42})
+
+        self.assertEqual(len(calls), 1)
+        stats = get_cache_stats()['namespaces']['tests']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_stats_are_flushed_in_bulk_and_listed_for_all_workers(self):
+        from apps.core import caching
+
+        with self.settings(CACHE_STATS_FLUSH_INTERVAL_SECONDS=3600):
+            for _ in range(3):
+                get_or_compute('remote', 'answer', lambda: 1)
+            # Nothing written to the shared counters per hit
+            self.assertIsNone(cache.get('stats:remote:hits'))
+            # Namespace used only by another worker: not registered in this process
+            caching._registered_namespaces.discard('remote')
+            stats = get_cache_stats()['namespaces']['remote']
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+
+    def test_model_change_invalidates_namespace(self):
+        from apps.bank_conditions.models import Bank
+
+        get_or_compute('bank_conditions', 'banks', lambda: 'old')
+
+        Bank.objects.create(name='АО Тестбанк')
+
+        self.assertEqual(get_or_compute('bank_conditions', 'banks', lambda: 'new'), 'new')
+
+
+class VersionedSnapshotTest(TestCase):
+    def test_readers_never_see_a_missing_build(self):
+        import itertools
+        import threading
+
+        builds = itertools.count(1)
+        snapshot = VersionedSnapshot('test_snapshot', lambda: {'build': next(builds)})
+        snapshot.invalidate()
+        seen = []
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                seen.append(snapshot.current())
+
+        with self.settings(SNAPSHOT_CHECK_INTERVAL_SECONDS=0):
+            snapshot.current()
+            readers = [threading.Thread(target=read) for _ in range(4)]
+            for reader in readers:
+                reader.start()
+            for _ in range(50):
+                snapshot.invalidate()
+            stop.set()
+            for reader in readers:
+                reader.join()
+            self.assertGreater(snapshot.current()['build'], 1)
+        self.assertNotIn(None, seen)
+
+
+class JsonSnapshotResponseTest(TestCase):
+    def setUp(self):
+        from django.test import RequestFactory
+        from apps.core.json_snapshots import build_json_snapshot
+
+        self.factory = RequestFactory()
+        self.snapshot = build_json_snapshot({'banks': ['Сбербанк']})
+
+    def _get(self, **headers):
+        from apps.core.json_snapshots import snapshot_response
+
+        return snapshot_response(self.factory.get('/', **headers), self.snapshot)
+
+    def test_each_encoding_has_its_own_etag(self):
+        import gzip
+        import json
+
+        plain = self._get()
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(json.loads(plain.content), {'banks': ['Сбербанк']})
+
+        packed = self._get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(packed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(packed.content), plain.content)
+        self.assertNotEqual(packed['ETag'], plain['ETag'])
+        for response in (plain, packed):
+            self.assertIn('Accept-Encoding', response['Vary'])
+
+        self.assertIsNone(self._get(HTTP_ACCEPT_ENCODING='gzip;q=0').get('Content-Encoding'))
+
+    def test_not_modified_only_for_the_served_representation(self):
+        plain_etag = self._get()['ETag']
+        gzip_etag = self._get(HTTP_ACCEPT_ENCODING='gzip')['ETag']
+
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=plain_etag).status_code, 304)
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=f'W/{plain_etag}').status_code, 304)
+        not_modified = self._get(HTTP_IF_NONE_MATCH=gzip_etag, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual((not_modified.status_code, not_modified['ETag']), (304, gzip_etag))
+
+        # A cached gzip validator must not revalidate an identity response, and vice versa
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=gzip_etag).status_code, 200)
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=plain_etag, HTTP_ACCEPT_ENCODING='gzip').status_code, 200)
+
+
+class AdminTableProtocolTest(APITestCase):
+    def setUp(self):
+        from apps.applications.models import Lead
+
+        self.admin = User.objects.create_user(email='table_admin@example.com', password='x', role=UserRole.ADMIN)
+        for index in range(5):
+            Lead.objects.create(full_name=f'Лид {index}', phone=f'+7900000000{index}')
+        self.client.force_authenticate(self.admin)
+
+    def test_legacy_full_list_without_limit(self):
+        response = self.client.get('/api/applications/admin/leads/')
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+    def test_cursor_pages_cover_all_rows(self):
+        names, cursor = [], None
+        while True:
+            params = {'limit': 2, 'ordering': 'full_name'}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get('/api/applications/admin/leads/', params)
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertEqual(response.data['total'], 5)
+            names += [row['full_name'] for row in response.data['results']]
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(names, [f'Лид {index}' for index in range(5)])
+
+    def test_search_and_invalid_ordering(self):
+        response = self.client.get('/api/applications/admin/leads/', {'limit': 10, 'search': '+79000000003'})
+        self.assertEqual([row['full_name'] for row in response.data['results']], ['Лид 3'])
+        response = self.client.get('/api/applications/admin/leads/', {'ordering': 'phone'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_filter_values_follow_field_type(self):
+        from apps.applications.models import Lead
+        from apps.core.tables import _parse_filter_value
+        from apps.seo.models import SeoPage
+
+        self.assertEqual(_parse_filter_value(Lead, 'assigned_to', 'assigned_to_id', '1'), 1)
+        self.assertIs(_parse_filter_value(SeoPage, 'is_published', 'is_published', 'yes'), True)
+        self.assertEqual(_parse_filter_value(Lead, 'status', 'status', ' new '), 'new')
+
+        Lead.objects.filter(full_name='Лид 1').update(assigned_to=self.admin)
+        url = '/api/applications/admin/leads/'
+        response = self.client.get(url, {'limit': 10, 'assigned_to': self.admin.id})
+        self.assertEqual([row['full_name'] for row in response.data['results']], ['Лид 1'])
+        self.assertEqual(self.client.get(url, {'limit': 10, 'assigned_to': 'x'}).status_code, 400)
+
+
+class BufferedCounterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        news_views.flush()
+        self.news = News.objects.create(title='Новость', slug='counter-news', content='Текст', is_published=True)
+        self.other = News.objects.create(title='Другая', slug='counter-other', content='Текст', is_published=True)
+
+    def test_increments_are_buffered_until_flush(self):
+        # Hold the opportunistic flush lock so increments stay buffered
+        cache.add('counters:news_views:flush-lock', 1, timeout=60)
+        for _ in range(3):
+            news_views.incr(self.news.pk)
+        news_views.incr(self.other.pk)
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.views_count, 0)
+
+        self.assertEqual(news_views.flush(), 2)
+        self.news.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.news.views_count, self.other.views_count), (3, 1))
+
+    def test_bulk_increment(self):
+        bulk_increment(News, 'views_count', {self.news.pk: 5, self.other.pk: 5})
+        self.assertEqual(
+            sorted(News.objects.values_list('views_count', flat=True)),
+            [5, 5],
+        )
+
+
+class RedisClientTest(TestCase):
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://cache-primary:6390/2,redis://cache-replica:6390/2',
+    }})
+    def test_client_for_primary_cache_server_is_shared(self):
+        from apps.core.redis_client import get_redis_client, uses_redis_cache
+
+        self.assertTrue(uses_redis_cache())
+        client = get_redis_client()
+        self.assertIs(get_redis_client(), client)
+        kwargs = client.connection_pool.connection_kwargs
+        self.assertEqual((kwargs['host'], kwargs['port'], kwargs['db']), ('cache-primary', 6390, 2))
+
+
+class SyntheticDataTest(TestCase):
+    def test_small_dataset_is_consistent(self):
+        profile = ScaleProfile().scaled(0.001, crm_companies_per_agent=5)
+        stats = SyntheticDataGenerator(profile, batch_size=100, log=lambda *args: None).run()
+
+        self.assertEqual(Application.objects.count(), profile.applications)
+        self.assertEqual(stats['applications.TicketMessage'], TicketMessage.objects.count())
+        # Explicit timestamps survive bulk_create
+        oldest = Application.objects.order_by('created_at').first()
+        self.assertLess(oldest.created_at, timezone.now() - timedelta(days=1))
+        for thread in ChatThread.objects.select_related('last_message')[:20]:
+            messages = TicketMessage.objects.filter(application_id=thread.application_id)
+            self.assertEqual(thread.message_count, messages.count())
+            self.assertEqual(thread.last_message_id, messages.order_by('-created_at', '-id').first().id)
+
+
+class LatencyRecorderTest(TestCase):
+    def test_percentiles_and_errors(self):
+        self.assertEqual(percentile(list(range(1, 101)), 95), 95)
+        self.assertEqual(percentile([7], 99), 7)
+
+        recorder = LatencyRecorder()
+        for ms in range(1, 201):
+            recorder.record('login', ms, ok=ms % 50 != 0, detail='500')
+        [row] = recorder.report(elapsed_seconds=10)
+        self.assertEqual((row['requests'], row['errors'], row['rps']), (200, 4, 20.0))
+        self.assertEqual((row['p50_ms'], row['p99_ms'], row['max_ms']), (100, 198, 200))
@@ -0,0 +1,205 @@
+"""
+Query-count and latency budgets for the hot API endpoints.
+
+Seeds the dashboard test accounts (apps.core.seeding.seed_test_data) plus a
+few pages' worth of related rows, then calls every endpoint twice: cold
+(caches cleared) and warm. Each call must stay within the query budget (an
+N+1 regression on a 20-row page blows it immediately); these checks run in
+the regular suite.
+
+Wall-time budgets depend on the machine, so the cold-call latency is only
+asserted when PERF_TIME_BUDGETS=1 (it is always reported). Run the timed
+suite and write a JSON report:
+
+    PERF_TIME_BUDGETS=1 PERF_REPORT_PATH=perf-report.json \
+        python manage.py test apps.core.tests_performance
+
+PERF_TIME_FACTOR scales the time budgets for slow CI machines.
+"""
+
+import json
+import os
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications.messaging import post_message
+from apps.applications.models import Application, ApplicationStatus, ProductType
+from apps.bank_conditions.models import Bank, BankCondition, StopFactor
+from apps.companies.models import CompanyProfile
+from apps.core.counters import registered_counters
+from apps.core.seeding import seed_test_data
+from apps.seo.models import SeoPage
+from apps.users.models import User, UserRole
+
+# name: (method, path, role, max queries per call, max cold milliseconds)
+BUDGETS = {
+    'applications_list_admin': ('get', '/api/applications/', 'admin', 5, 1500),
+    'applications_list_agent': ('get', '/api/applications/', 'agent', 5, 1500),
+    'applications_list_client': ('get', '/api/applications/', 'client', 10, 1500),
+    'applications_list_partner': ('get', '/api/applications/', 'partner', 5, 1500),
+    'client_stats_client': ('get', '/api/applications/stats/client/', 'client', 8, 500),
+    'client_stats_agent': ('get', '/api/applications/stats/client/', 'agent', 6, 500),
+    'chat_threads_admin': ('get', '/api/applications/chat-threads/', 'admin', 4, 500),
+    'accreditation_list_pending': ('get', '/api/auth/admin/accreditation/', 'admin', 6, 1000),
+    'accreditation_list_all': ('get', '/api/auth/admin/accreditation/?status=all', 'admin', 6, 1000),
+    'bank_conditions_aggregate': ('get', '/api/bank-conditions/all/', 'agent', 7, 1000),
+    'seo_page_retrieve': ('get', '/api/seo/pages/perf-page/', None, 3, 500),
+}
+
+PAGE_ROWS = 30
+
+
+def _time_factor():
+    return float(os.getenv('PERF_TIME_FACTOR', '1'))
+
+
+def _time_budgets_enabled():
+    return os.getenv('PERF_TIME_BUDGETS', '').lower() in ('1', 'true', 'yes')
+
+
+@tag('performance')
+class EndpointBudgetTest(APITestCase):
+    report = []
+
+    @classmethod
+    def setUpTestData(cls):
+        seeded = seed_test_data(log=lambda *args: None)
+        cls.users = {
+            'admin': seeded['admin'],
+            'agent': seeded['agent'],
+            'partner': seeded['partner'],
+        }
+        agent, partner = seeded['agent'], seeded['partner']
+        User.objects.filter(pk=seeded['admin'].pk).update(role=UserRole.ADMIN)
+
+        client = User.objects.create_user(
+            email='perf-client@example.com', password='x', role=UserRole.CLIENT, invited_by=agent,
+        )
+        cls.users['client'] = client
+        client_company = CompanyProfile.objects.create(owner=client, inn='7701000001', name='ООО Клиент')
+        crm_company = CompanyProfile.objects.create(
+            owner=agent, inn='7701000001', name='ООО Клиент (CRM)', is_crm_client=True,
+        )
+
+        statuses = [ApplicationStatus.PENDING, ApplicationStatus.IN_REVIEW, ApplicationStatus.APPROVED]
+        applications = []
+        for i in range(PAGE_ROWS):
+            for creator, company in ((agent, crm_company), (client, client_company)):
+                applications.append(Application(
+                    created_by=creator,
+                    company=company,
+                    product_type=ProductType.BANK_GUARANTEE,
+                    amount=1000000 + i,
+                    term_months=12,
+                    status=statuses[i % len(statuses)],
+                    target_bank_name='Сбербанк',
+                    assigned_partner=partner if i % 2 else None,
+                ))
+        Application.objects.bulk_create(applications)
+
+        for application in applications[:PAGE_ROWS]:
+            post_message(application.id, application.created_by, content='Вопрос по заявке')
+            post_message(application.id, application.created_by, content='Уточнение')
+
+        for i in range(PAGE_ROWS):
+            pending_agent = User.objects.create_user(
+                email=f'perf-agent-{i}@example.com', password='x', role=UserRole.AGENT,
+                accreditation_status='pending',
+                accreditation_submitted_at=timezone.now() - timedelta(minutes=i),
+            )
+            CompanyProfile.objects.create(owner=pending_agent, inn=f'77020{i:05d}', name=f'ООО Агент {i}')
+
+        banks = Bank.objects.bulk_create(
+            [Bank(name=f'Банк {i}', short_name=f'Банк {i}', order=i) for i in range(PAGE_ROWS)]
+        )
+        BankCondition.objects.bulk_create([
+            BankCondition(bank=bank, product=f'Продукт {n}', term_months=12)
+            for bank in banks for n in range(3)
+        ])
+        StopFactor.objects.bulk_create([StopFactor(description=f'Стоп-фактор {i}') for i in range(10)])
+
+        page = SeoPage.objects.create(slug='perf-page', h1_title='Страница', faq=[{'question': 'q', 'answer': 'a'}])
+        page.banks.set(banks[:9])
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.getenv('PERF_REPORT_PATH')
+        if path and cls.report:
+            with open(path, 'w', encoding='utf-8') as handle:
+                json.dump({
+                    'generated_at': timezone.now().isoformat(),
+                    'database': connection.vendor,
+                    'time_factor': _time_factor(),
+                    'time_budgets_enforced': _time_budgets_enabled(),
+                    'results': cls.report,
+                }, handle, ensure_ascii=False, indent=2)
+        super().tearDownClass()
+
+    def _call(self, method, path):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(self.client, method)(path)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        return response, len(queries), elapsed_ms
+
+    def _measure(self, name):
+        method, path, role, max_queries, max_ms = BUDGETS[name]
+        if role:
+            token = AccessToken.for_user(self.users[role])
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        cache.clear()
+        # Buffered counter flushes are the flusher's work, not the endpoint's
+        for counter in registered_counters():
+            cache.add(f'counters:{counter.name}:flush-lock', 1, timeout=60)
+
+        response, cold_queries, cold_ms = self._call(method, path)
+        self.assertEqual(response.status_code, 200, f'{name}: {response.status_code}')
+        _, warm_queries, warm_ms = self._call(method, path)
+        max_ms *= _time_factor()
+
+        ok = cold_queries <= max_queries and warm_queries <= max_queries
+        if _time_budgets_enabled():
+            ok = ok and cold_ms <= max_ms
+        self.report.append({
+            'name': name,
+            'method': method.upper(),
+            'path': path,
+            'role': role,
+            'queries': {'cold': cold_queries, 'warm': warm_queries, 'budget': max_queries},
+            'ms': {'cold': round(cold_ms, 1), 'warm': round(warm_ms, 1), 'budget': max_ms},
+            'ok': ok,
+        })
+        self.assertLessEqual(cold_queries, max_queries, f'{name}: cold queries over budget')
+        self.assertLessEqual(warm_queries, max_queries, f'{name}: warm queries over budget')
+        if _time_budgets_enabled():
+            self.assertLessEqual(cold_ms, max_ms, f'{name}: cold latency over budget')
+
+    def test_applications_list_per_role(self):
+        for role in ('admin', 'agent', 'client', 'partner'):
+            with self.subTest(role=role):
+                self._measure(f'applications_list_{role}')
+
+    def test_client_stats(self):
+        self._measure('client_stats_client')
+        self._measure('client_stats_agent')
+
+    def test_chat_threads(self):
+        self._measure('chat_threads_admin')
+
+    def test_accreditation_lists(self):
+        self._measure('accreditation_list_pending')
+        self._measure('accreditation_list_all')
+
+    def test_bank_conditions_aggregate(self):
+        self._measure('bank_conditions_aggregate')
+
+    def test_seo_page_retrieve(self):
+        self._measure('seo_page_retrieve')
@@ -0,0 +1,22 @@
+"""
+DRF throttles backed by the shared cache.
+"""
+import logging
+
+from rest_framework.throttling import ScopedRateThrottle
+
+logger = logging.getLogger(__name__)
+
+
+class FailOpenScopedRateThrottle(ScopedRateThrottle):
+    """
+    ScopedRateThrottle that lets requests through when the cache is down,
+    so a Redis outage never blocks public forms.
+    """
+
+    def allow_request(self, request, view):
+        try:
+            return super().allow_request(request, view)
+        except Exception as exc:
+            logger.warning("Throttle cache unavailable, allowing request: %s", exc)
+            return True
@@ -0,0 +1,10 @@
+"""
+URL configuration for Core app.
+"""
+from django.urls import path
+
+from .views import CacheStatsView
+
+urlpatterns = [
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+]
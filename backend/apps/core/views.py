@@ -0,0 +1,34 @@
+"""
+API Views for shared infrastructure.
+"""
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.users.permissions import IsAdmin
+from .caching import get_cache_stats, reset_cache_stats
+
+
+@extend_schema(tags=['Cache'])
+class CacheStatsView(APIView):
+    """
+    Cache hit/miss statistics per namespace.
+    GET /api/core/cache/stats/ - Current counters and namespace versions
+    DELETE /api/core/cache/stats/ - Reset counters
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        try:
+            return Response(get_cache_stats())
+        except Exception:
+            return Response(
+                {'error': 'Кэш недоступен'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+    def delete(self, request):
+        reset_cache_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
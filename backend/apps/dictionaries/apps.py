@@ -8,3 +8,7 @@ class DictionariesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.dictionaries'
     verbose_name = 'Справочники'
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.dictionaries.signals  # noqa: F401
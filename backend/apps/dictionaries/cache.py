@@ -0,0 +1,170 @@
+"""
+Reference-data cache for dictionary tables.
+
+Each dictionary (DocumentTypeDefinition, ApplicationStatusDefinition) is
+loaded once per process into an immutable map. A version token is kept in
+the shared Django cache; post_save/post_delete signals bump it so every
+worker reloads its map on the next lookup after the check interval.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+from apps.core.snapshots import VersionedSnapshot
+
+UNKNOWN_SOURCE_DISPLAY = "Неизвестно"
+ADDITIONAL_DOCUMENT_NAME = "Дополнительный документ"
+
+
+@dataclass(frozen=True)
+class DocumentTypeInfo:
+    id: int
+    document_type_id: int
+    product_type: str
+    name: str
+    source: str
+    source_display: str
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class StatusInfo:
+    id: int
+    status_id: int
+    product_type: str
+    name: str
+    internal_status: str
+    order: int
+    is_terminal: bool
+    is_active: bool
+
+
+class ReferenceTable(VersionedSnapshot):
+    """
+    Process-local immutable map of a dictionary table, versioned in the shared cache.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], dict]):
+        super().__init__(
+            name,
+            lambda: MappingProxyType(loader()),
+            check_interval_setting='REFERENCE_CACHE_CHECK_INTERVAL_SECONDS',
+        )
+
+    def get_map(self) -> Mapping:
+        return self.current()
+
+    def get(self, key, default=None):
+        return self.get_map().get(key, default)
+
+
+def _load_document_types() -> dict:
+    from apps.documents.models import DocumentTypeDefinition
+
+    return {
+        (item.document_type_id, item.product_type): DocumentTypeInfo(
+            id=item.pk,
+            document_type_id=item.document_type_id,
+            product_type=item.product_type,
+            name=item.name,
+            source=item.source,
+            source_display=item.get_source_display(),
+            is_active=item.is_active,
+        )
+        for item in DocumentTypeDefinition.objects.all()
+    }
+
+
+def _load_statuses() -> dict:
+    from apps.applications.models import ApplicationStatusDefinition
+
+    data = {}
+    for item in ApplicationStatusDefinition.objects.all():
+        info = StatusInfo(
+            id=item.pk,
+            status_id=item.status_id,
+            product_type=item.product_type,
+            name=item.name,
+            internal_status=item.internal_status,
+            order=item.order,
+            is_terminal=item.is_terminal,
+            is_active=item.is_active,
+        )
+        data[(item.status_id, item.product_type)] = info
+        # Product-independent fallback: first definition in model ordering.
+        data.setdefault((item.status_id, None), info)
+    return data
+
+
+document_types = ReferenceTable('document_types', _load_document_types)
+application_statuses = ReferenceTable('application_statuses', _load_statuses)
+
+
+def get_document_type(document_type_id: int, product_type: str) -> DocumentTypeInfo | None:
+    if not document_type_id or not product_type:
+        return None
+    return document_types.get((document_type_id, product_type))
+
+
+def get_document_type_name(document_type_id: int, product_type: str) -> str:
+    type_info = get_document_type(document_type_id, product_type)
+    if type_info:
+        return type_info.name
+    if document_type_id == 0:
+        return ADDITIONAL_DOCUMENT_NAME
+    return f"Документ (ID: {document_type_id})"
+
+
+def get_document_source_display(document_type_id: int, product_type: str) -> str:
+    type_info = get_document_type(document_type_id, product_type)
+    if type_info:
+        return type_info.source_display
+    return UNKNOWN_SOURCE_DISPLAY
+
+
+def get_status(status_id: int, product_type: str | None = None) -> StatusInfo | None:
+    """Status definition for product; product_type=None returns any product's definition."""
+    if status_id is None:
+        return None
+    return application_statuses.get((status_id, product_type))
+
+
+def get_status_name(status_id: int, product_type: str) -> str | None:
+    status_info = get_status(status_id, product_type)
+    return status_info.name if status_info else None
+
+
+def active_document_types(product_type: str | None = None, source: str | None = None) -> list[DocumentTypeInfo]:
+    """Active document types ordered by (product_type, document_type_id)."""
+    return sorted(
+        (
+            info for info in document_types.get_map().values()
+            if info.is_active
+            and (not product_type or info.product_type == product_type)
+            and (not source or info.source == source)
+        ),
+        key=lambda info: (info.product_type, info.document_type_id),
+    )
+
+
+def active_statuses(
+    product_type: str | None = None,
+    internal_status: str | None = None,
+    is_terminal: bool | None = None,
+) -> list[StatusInfo]:
+    """Active status definitions ordered by (product_type, order, status_id)."""
+    return sorted(
+        (
+            info for (_, key_product), info in application_statuses.get_map().items()
+            # (status_id, None) keys are fallbacks duplicating a product entry
+            if key_product is not None
+            and info.is_active
+            and (not product_type or info.product_type == product_type)
+            and (not internal_status or info.internal_status == internal_status)
+            and (is_terminal is None or info.is_terminal == is_terminal)
+        ),
+        key=lambda info: (info.product_type, info.order, info.status_id),
+    )
@@ -10,8 +10,9 @@ class DocumentTypeDefinitionSerializer(serializers.ModelSerializer):
     """
     Serializer for DocumentTypeDefinition reference data.
     Returns data needed by frontend to render document type selectors.
+    Serializes apps.dictionaries.cache.DocumentTypeInfo snapshot entries.
     """
-    source_display = serializers.CharField(source='get_source_display', read_only=True)
+    source_display = serializers.CharField(read_only=True)
     
     class Meta:
         model = DocumentTypeDefinition
@@ -30,6 +31,7 @@ class ApplicationStatusDefinitionSerializer(serializers.ModelSerializer):
     """
     Serializer for ApplicationStatusDefinition reference data.
     Returns data needed by frontend to render status badges and funnels.
+    Serializes apps.dictionaries.cache.StatusInfo snapshot entries.
     """
     internal_status_display = serializers.SerializerMethodField()
     
@@ -0,0 +1,10 @@
+"""
+Invalidate reference-data caches when dictionary tables change.
+"""
+from apps.applications.models import ApplicationStatusDefinition
+from apps.documents.models import DocumentTypeDefinition
+
+from .cache import application_statuses, document_types
+
+document_types.invalidate_on(DocumentTypeDefinition)
+application_statuses.invalidate_on(ApplicationStatusDefinition)
@@ -0,0 +1,62 @@
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from apps.applications.models import ApplicationStatusDefinition
+from apps.dictionaries.cache import application_statuses, get_status_name
+
+
+class ReferenceCacheTest(TestCase):
+    def setUp(self):
+        application_statuses.invalidate()
+
+    def test_status_name_served_from_snapshot(self):
+        ApplicationStatusDefinition.objects.create(
+            status_id=9901, product_type='bank_guarantee', name='Черновик'
+        )
+        self.assertEqual(get_status_name(9901, 'bank_guarantee'), 'Черновик')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_status_name(9901, 'bank_guarantee'), 'Черновик')
+
+    def test_save_invalidates_snapshot(self):
+        status_def = ApplicationStatusDefinition.objects.create(
+            status_id=9902, product_type='bank_guarantee', name='Старое'
+        )
+        self.assertEqual(get_status_name(9902, 'bank_guarantee'), 'Старое')
+
+        status_def.name = 'Новое'
+        with self.captureOnCommitCallbacks(execute=True):
+            status_def.save()
+            # Not rebuilt from uncommitted data
+            self.assertEqual(get_status_name(9902, 'bank_guarantee'), 'Старое')
+        self.assertEqual(get_status_name(9902, 'bank_guarantee'), 'Новое')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            status_def.delete()
+        self.assertIsNone(get_status_name(9902, 'bank_guarantee'))
+
+
+class DictionaryApiTest(APITestCase):
+    def setUp(self):
+        from apps.users.models import User
+
+        ApplicationStatusDefinition.objects.create(
+            status_id=9911, product_type='test_product', name='Анкета', order=1
+        )
+        ApplicationStatusDefinition.objects.create(
+            status_id=9912, product_type='test_product', name='Выдан', order=2, is_terminal=True
+        )
+        application_statuses.invalidate()
+        self.client.force_authenticate(User.objects.create_user(email='dict@example.com', password='x'))
+
+    def test_statuses_served_from_snapshot(self):
+        url = '/api/dictionaries/statuses/'
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'product_type': 'test_product'})
+        self.assertEqual([item['status_id'] for item in response.data['results']], [9911, 9912])
+
+        funnel = self.client.get(f'{url}funnel/', {'product_type': 'test_product'}).data
+        self.assertEqual([item['name'] for item in funnel], ['Анкета'])
+        detail = self.client.get(f"{url}{response.data['results'][0]['id']}/")
+        self.assertEqual(detail.data['name'], 'Анкета')
@@ -8,130 +8,102 @@ Provides read-only access to:
 Endpoints:
 - GET /api/v1/dictionaries/document-types/?product_type=bank_guarantee
 - GET /api/v1/dictionaries/statuses/?product_type=contract_loan
+
+Served from the process-local reference snapshots (apps.dictionaries.cache),
+not from the tables: no queries once a worker has loaded them.
 """
-from rest_framework import viewsets, status
+from collections import defaultdict
+
+from django.http import Http404
+from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 
-from apps.documents.models import DocumentTypeDefinition
-from apps.applications.models import ApplicationStatusDefinition
+from .cache import active_document_types, active_statuses
 from .serializers import DocumentTypeDefinitionSerializer, ApplicationStatusDefinitionSerializer
 
 
-class DocumentTypeDictionaryViewSet(viewsets.ReadOnlyModelViewSet):
+class ReferenceViewSet(viewsets.GenericViewSet):
+    """Read-only list/retrieve over a reference snapshot (get_items)."""
+    permission_classes = [IsAuthenticated]
+
+    def get_items(self):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        items = self.get_items()
+        page = self.paginate_queryset(items)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(items, many=True).data)
+
+    def retrieve(self, request, pk=None, *args, **kwargs):
+        item = next((item for item in self.get_items() if str(item.id) == str(pk)), None)
+        if item is None:
+            raise Http404
+        return Response(self.get_serializer(item).data)
+
+    def _grouped(self, items):
+        result = defaultdict(list)
+        for item in items:
+            result[item.product_type].append(self.get_serializer(item).data)
+        return dict(result)
+
+
+class DocumentTypeDictionaryViewSet(ReferenceViewSet):
     """
     API endpoint for document type definitions.
-    
+
     GET /dictionaries/document-types/
     GET /dictionaries/document-types/?product_type=bank_guarantee
     GET /dictionaries/document-types/?source=agent
     """
     serializer_class = DocumentTypeDefinitionSerializer
-    permission_classes = [IsAuthenticated]
-    
-    def get_queryset(self):
+
+    def get_items(self):
         """Filter by product_type and/or source."""
-        queryset = DocumentTypeDefinition.objects.filter(is_active=True)
-        
-        product_type = self.request.query_params.get('product_type')
-        if product_type:
-            queryset = queryset.filter(product_type=product_type)
-            
-        source = self.request.query_params.get('source')
-        if source:
-            queryset = queryset.filter(source=source)
-            
-        return queryset.order_by('document_type_id')
-    
-    # Cache for 1 hour (3600 seconds) - these rarely change
-    @method_decorator(cache_page(3600))
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-    
-    @method_decorator(cache_page(3600))  # Cache for 1 hour (same as list)
+        items = active_document_types(
+            product_type=self.request.query_params.get('product_type'),
+            source=self.request.query_params.get('source'),
+        )
+        return sorted(items, key=lambda item: item.document_type_id)
+
     @action(detail=False, methods=['get'])
     def by_product(self, request):
         """
         Get document types grouped by product.
         GET /dictionaries/document-types/by_product/
-        
-        Optimized: single query instead of N+1 loop.
         """
-        from collections import defaultdict
-        
-        result = defaultdict(list)
-        
-        # Single query fetching all active types
-        all_types = DocumentTypeDefinition.objects.filter(
-            is_active=True
-        ).order_by('product_type', 'document_type_id')
-        
-        for doc_type in all_types:
-            result[doc_type.product_type].append(
-                DocumentTypeDefinitionSerializer(doc_type).data
-            )
-            
-        return Response(dict(result))
-
-
-class StatusDictionaryViewSet(viewsets.ReadOnlyModelViewSet):
+        return Response(self._grouped(active_document_types()))
+
+
+class StatusDictionaryViewSet(ReferenceViewSet):
     """
     API endpoint for application status definitions.
-    
+
     GET /dictionaries/statuses/
     GET /dictionaries/statuses/?product_type=bank_guarantee
     GET /dictionaries/statuses/?internal_status=approved
     """
     serializer_class = ApplicationStatusDefinitionSerializer
-    permission_classes = [IsAuthenticated]
-    
-    def get_queryset(self):
+
+    def get_items(self):
         """Filter by product_type and/or internal_status."""
-        queryset = ApplicationStatusDefinition.objects.filter(is_active=True)
-        
-        product_type = self.request.query_params.get('product_type')
-        if product_type:
-            queryset = queryset.filter(product_type=product_type)
-            
-        internal_status = self.request.query_params.get('internal_status')
-        if internal_status:
-            queryset = queryset.filter(internal_status=internal_status)
-            
-        return queryset.order_by('order', 'status_id')
-    
-    # Cache for 1 hour
-    @method_decorator(cache_page(3600))
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-    
-    @method_decorator(cache_page(3600))  # Cache for 1 hour (same as list)
+        items = active_statuses(
+            product_type=self.request.query_params.get('product_type'),
+            internal_status=self.request.query_params.get('internal_status'),
+        )
+        return sorted(items, key=lambda item: (item.order, item.status_id))
+
     @action(detail=False, methods=['get'])
     def by_product(self, request):
         """
         Get statuses grouped by product.
         GET /dictionaries/statuses/by_product/
-        
-        Optimized: single query instead of N+1 loop.
         """
-        from collections import defaultdict
-        
-        result = defaultdict(list)
-        
-        # Single query fetching all active statuses
-        all_statuses = ApplicationStatusDefinition.objects.filter(
-            is_active=True
-        ).order_by('product_type', 'order', 'status_id')
-        
-        for status in all_statuses:
-            result[status.product_type].append(
-                ApplicationStatusDefinitionSerializer(status).data
-            )
-            
-        return Response(dict(result))
-    
+        return Response(self._grouped(active_statuses()))
+
     @action(detail=False, methods=['get'])
     def funnel(self, request):
         """
@@ -139,11 +111,5 @@ class StatusDictionaryViewSet(viewsets.ReadOnlyModelViewSet):
         GET /dictionaries/statuses/funnel/?product_type=bank_guarantee
         """
         product_type = request.query_params.get('product_type', 'bank_guarantee')
-        
-        statuses = ApplicationStatusDefinition.objects.filter(
-            product_type=product_type,
-            is_active=True,
-            is_terminal=False
-        ).order_by('order', 'status_id')
-        
-        return Response(ApplicationStatusDefinitionSerializer(statuses, many=True).data)
+        statuses = active_statuses(product_type=product_type, is_terminal=False)
+        return Response(self.get_serializer(statuses, many=True).data)
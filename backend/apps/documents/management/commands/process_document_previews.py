@@ -0,0 +1,71 @@
+"""
+Generate thumbnails and page counts for uploaded documents.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.documents.models import Document, DocumentPreviewStatus
+from apps.documents.previews import process_preview_batch
+
+
+class Command(BaseCommand):
+    help = 'Build first-page thumbnails and page counts for pending documents.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Run continuously as worker.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=int,
+            default=int(getattr(settings, 'DOCUMENT_PREVIEW_WORKER_SLEEP_SECONDS', 10)),
+            help='Sleep seconds between worker iterations.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=int(getattr(settings, 'DOCUMENT_PREVIEW_BATCH_SIZE', 20)),
+            help='Max documents processed per iteration.',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Re-queue documents whose preview generation failed before starting.',
+        )
+
+    def handle(self, *args, **options):
+        loop = options['loop']
+        sleep_seconds = max(1, int(options['sleep']))
+        batch_size = max(1, int(options['batch_size']))
+
+        if options['retry_failed']:
+            requeued = Document.objects.filter(
+                preview_status=DocumentPreviewStatus.FAILED,
+            ).update(preview_status=DocumentPreviewStatus.PENDING)
+            self.stdout.write(f"requeued_failed={requeued}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Document preview processor started (loop={loop}, batch_size={batch_size})"
+        ))
+
+        try:
+            while True:
+                stats = process_preview_batch(batch_size=batch_size)
+                self.stdout.write(
+                    f"processed={stats['processed']} ready={stats['ready']} "
+                    f"unsupported={stats['unsupported']} failed={stats['failed']} "
+                    f"deleted={stats['deleted']}"
+                )
+
+                if not loop:
+                    break
+
+                if stats['processed'] == 0:
+                    time.sleep(sleep_seconds)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Document preview processor stopped.'))
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.4 on 2026-10-19 02:28
+
+import apps.documents.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0013_alter_document_company_alter_document_owner_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='page_count',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Количество страниц'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='preview_status',
+            field=models.CharField(choices=[('pending', 'Ожидает обработки'), ('ready', 'Готово'), ('unsupported', 'Формат не поддерживается'), ('failed', 'Ошибка обработки')], db_index=True, default='pending', max_length=20, verbose_name='Статус превью'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='thumbnail',
+            field=models.ImageField(blank=True, help_text='Превью первой страницы (JPEG)', null=True, upload_to=apps.documents.models.document_thumbnail_path, verbose_name='Миниатюра'),
+        ),
+    ]
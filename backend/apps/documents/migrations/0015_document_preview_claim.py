@@ -0,0 +1,23 @@
+# Generated by Django 5.0.4 on 2026-10-19 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0014_document_previews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='preview_claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Превью взято в обработку'),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='preview_status',
+            field=models.CharField(choices=[('pending', 'Ожидает обработки'), ('processing', 'Обрабатывается'), ('ready', 'Готово'), ('unsupported', 'Формат не поддерживается'), ('failed', 'Ошибка обработки')], db_index=True, default='pending', max_length=20, verbose_name='Статус превью'),
+        ),
+    ]
@@ -9,6 +9,8 @@ Document Type IDs are PRODUCT-SPECIFIC:
 - ID 21 for Bank Guarantee = "Паспорт генерального директора"
 - ID 74 for Contract Loan = "Паспорт генерального директора" (same meaning, different ID)
 """
+import os
+
 from django.db import models
 from django.conf import settings
 
@@ -29,6 +31,15 @@ class DocumentStatus(models.TextChoices):
     NOT_ALLOWED = 'not_allowed', 'Не допущен'  # Per ТЗ requirement
 
 
+class DocumentPreviewStatus(models.TextChoices):
+    """State of the background thumbnail / page count generation."""
+    PENDING = 'pending', 'Ожидает обработки'
+    PROCESSING = 'processing', 'Обрабатывается'
+    READY = 'ready', 'Готово'
+    UNSUPPORTED = 'unsupported', 'Формат не поддерживается'
+    FAILED = 'failed', 'Ошибка обработки'
+
+
 class DocumentTypeDefinition(models.Model):
     """
     Reference table for Document Types per Appendix B (Приложение Б).
@@ -89,6 +100,17 @@ def document_upload_path(instance, filename):
     return f'documents/{instance.owner.id}/{filename}'
 
 
+def document_thumbnail_path(instance, filename):
+    """
+    Store thumbnails next to the original file:
+    documents/{owner_id}/{name}.thumb.jpg
+    """
+    if instance.file and instance.file.name:
+        base, _ = os.path.splitext(instance.file.name)
+        return f'{base}.thumb.jpg'
+    return f'documents/{instance.owner_id}/{filename}'
+
+
 class Document(models.Model):
     """
     Document model for the Document Library.
@@ -147,6 +169,29 @@ class Document(models.Model):
         default=DocumentStatus.VERIFIED
     )
     
+    # Precomputed preview (filled by process_document_previews worker)
+    thumbnail = models.ImageField(
+        'Миниатюра',
+        upload_to=document_thumbnail_path,
+        blank=True,
+        null=True,
+        help_text='Превью первой страницы (JPEG)'
+    )
+    page_count = models.PositiveIntegerField(
+        'Количество страниц',
+        null=True,
+        blank=True
+    )
+    preview_status = models.CharField(
+        'Статус превью',
+        max_length=20,
+        choices=DocumentPreviewStatus.choices,
+        default=DocumentPreviewStatus.PENDING,
+        db_index=True
+    )
+    # Set when a worker claims the document; stale claims are retried
+    preview_claimed_at = models.DateTimeField('Превью взято в обработку', null=True, blank=True)
+
     # Timestamps
     uploaded_at = models.DateTimeField('Дата загрузки', auto_now_add=True)
     updated_at = models.DateTimeField('Дата обновления', auto_now=True)
@@ -171,18 +216,12 @@ class Document(models.Model):
 
     def get_type_definition(self):
         """
-        Get the DocumentTypeDefinition for this document.
+        Get the cached DocumentTypeDefinition entry for this document.
         Returns None if not found in reference table.
         """
-        if not self.document_type_id or not self.product_type:
-            return None
-        try:
-            return DocumentTypeDefinition.objects.get(
-                document_type_id=self.document_type_id,
-                product_type=self.product_type
-            )
-        except DocumentTypeDefinition.DoesNotExist:
-            return None
+        from apps.dictionaries.cache import get_document_type
+
+        return get_document_type(self.document_type_id, self.product_type)
     
     @property
     def type_display(self):
@@ -190,23 +229,18 @@ class Document(models.Model):
         Get human-readable document type name from reference table.
         Falls back to ID if not found.
         """
-        type_def = self.get_type_definition()
-        if type_def:
-            return type_def.name
-        # Fallback for documents without proper type definition
-        if self.document_type_id == 0:
-            return "Дополнительный документ"
-        return f"Документ (ID: {self.document_type_id})"
+        from apps.dictionaries.cache import get_document_type_name
+
+        return get_document_type_name(self.document_type_id, self.product_type)
     
     @property
     def source_display(self):
         """
         Get source information from reference table.
         """
-        type_def = self.get_type_definition()
-        if type_def:
-            return type_def.get_source_display()
-        return "Неизвестно"
+        from apps.dictionaries.cache import get_document_source_display
+
+        return get_document_source_display(self.document_type_id, self.product_type)
 
 
 class DocumentRequestStatus(models.TextChoices):
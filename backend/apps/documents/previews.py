@@ -0,0 +1,230 @@
+"""
+Background generation of document thumbnails and page counts.
+
+Images are rendered with Pillow. PDFs get a page count from the file
+structure and a first-page thumbnail via ``pdftoppm`` (poppler-utils)
+when it is available on the host.
+"""
+
+from __future__ import annotations
+
+from io import BytesIO
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Document, DocumentPreviewStatus
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png'}
+PDF_EXTENSIONS = {'pdf'}
+
+_PDF_PAGE_RE = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+_PDF_COUNT_RE = re.compile(rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)', re.S)
+
+
+def _thumbnail_size() -> tuple[int, int]:
+    size = int(getattr(settings, 'DOCUMENT_THUMBNAIL_MAX_SIZE', 320))
+    return (size, size)
+
+
+def _render_thumbnail(image) -> bytes:
+    from PIL import Image, ImageOps
+
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(_thumbnail_size(), Image.LANCZOS)
+    if image.mode not in ('RGB', 'L'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.split()[-1])
+        image = background
+
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=80, optimize=True)
+    return buffer.getvalue()
+
+
+def _image_preview(path: str) -> tuple[bytes, int]:
+    from PIL import Image
+
+    with Image.open(path) as image:
+        page_count = int(getattr(image, 'n_frames', 1) or 1)
+        image.seek(0)
+        return _render_thumbnail(image), page_count
+
+
+def count_pdf_pages(data: bytes) -> int | None:
+    """
+    Count pages without a PDF library.
+
+    Prefers the largest /Count of a /Pages node (the root tree), falling
+    back to counting /Type /Page objects for files with compressed trees.
+    """
+    counts = [int(value) for value in _PDF_COUNT_RE.findall(data)]
+    if counts:
+        return max(counts)
+    pages = len(_PDF_PAGE_RE.findall(data))
+    return pages or None
+
+
+def _render_pdf_first_page(path: str) -> bytes | None:
+    pdftoppm = shutil.which('pdftoppm')
+    if not pdftoppm:
+        return None
+
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        prefix = os.path.join(tmp_dir, 'page')
+        subprocess.run(
+            [
+                pdftoppm, '-f', '1', '-l', '1', '-singlefile',
+                '-scale-to', str(max(_thumbnail_size())),
+                '-jpeg', path, prefix,
+            ],
+            check=True,
+            capture_output=True,
+            timeout=int(getattr(settings, 'DOCUMENT_PREVIEW_RENDER_TIMEOUT_SECONDS', 30)),
+        )
+        with Image.open(f'{prefix}.jpg') as image:
+            return _render_thumbnail(image)
+
+
+def _pdf_preview(path: str) -> tuple[bytes | None, int | None]:
+    with open(path, 'rb') as pdf_file:
+        page_count = count_pdf_pages(pdf_file.read())
+    return _render_pdf_first_page(path), page_count
+
+
+def _local_copy(document: Document) -> tuple[str, bool]:
+    """
+    Return a filesystem path for the document file and whether it is a
+    temporary copy (for storages without local paths).
+    """
+    try:
+        return document.file.path, False
+    except NotImplementedError:
+        suffix = f'.{document.file_extension}' if document.file_extension else ''
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            with document.file.open('rb') as source:
+                for chunk in source.chunks():
+                    tmp.write(chunk)
+            return tmp.name, True
+
+
+def _store_preview(document: Document, **fields) -> bool:
+    """
+    Write preview fields with a plain UPDATE; False if the document was
+    deleted while it was being rendered.
+    """
+    return Document.objects.filter(pk=document.pk).update(**fields) > 0
+
+
+def generate_document_preview(document: Document) -> str | None:
+    """
+    Build thumbnail and page count for a single document.
+    Returns the resulting preview status, or None if the document was
+    deleted in the meantime.
+    """
+    extension = document.file_extension
+    if not document.file or extension not in IMAGE_EXTENSIONS | PDF_EXTENSIONS:
+        status = DocumentPreviewStatus.UNSUPPORTED
+        return status if _store_preview(document, preview_status=status) else None
+
+    path, is_temporary = None, False
+    try:
+        path, is_temporary = _local_copy(document)
+        if extension in IMAGE_EXTENSIONS:
+            thumbnail, page_count = _image_preview(path)
+        else:
+            thumbnail, page_count = _pdf_preview(path)
+    except Exception as exc:
+        logger.warning("Preview generation failed for document %s: %s", document.id, exc)
+        status = DocumentPreviewStatus.FAILED
+        return status if _store_preview(document, preview_status=status) else None
+    finally:
+        if path and is_temporary:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    fields = {'page_count': page_count, 'preview_status': DocumentPreviewStatus.READY}
+    previous_thumbnail = document.thumbnail.name if document.thumbnail else None
+    if thumbnail:
+        document.thumbnail.save('thumb.jpg', ContentFile(thumbnail), save=False)
+        fields['thumbnail'] = document.thumbnail.name
+
+    if not _store_preview(document, **fields):
+        logger.info("Document %s was deleted during preview generation", document.id)
+        if thumbnail:
+            # Nothing references the new file any more
+            document.thumbnail.delete(save=False)
+        return None
+    if thumbnail and previous_thumbnail:
+        document.thumbnail.storage.delete(previous_thumbnail)
+    return DocumentPreviewStatus.READY
+
+
+def claim_pending_document() -> Document | None:
+    """
+    Claim the oldest pending document (or one whose claim went stale) in a
+    short transaction; rendering then runs without a DB transaction or row lock.
+    """
+    stale_before = timezone.now() - timedelta(
+        seconds=int(getattr(settings, 'DOCUMENT_PREVIEW_CLAIM_TIMEOUT_SECONDS', 600))
+    )
+    with transaction.atomic():
+        document = (
+            Document.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(preview_status=DocumentPreviewStatus.PENDING)
+                | Q(preview_status=DocumentPreviewStatus.PROCESSING, preview_claimed_at__lt=stale_before)
+            )
+            .order_by('uploaded_at')
+            .first()
+        )
+        if document is None:
+            return None
+        document.preview_status = DocumentPreviewStatus.PROCESSING
+        document.preview_claimed_at = timezone.now()
+        document.save(update_fields=['preview_status', 'preview_claimed_at'])
+    return document
+
+
+def process_preview_batch(batch_size: int = 20) -> dict[str, int]:
+    """
+    Generate previews for pending documents.
+    """
+    stats = {
+        'processed': 0,
+        'ready': 0,
+        'unsupported': 0,
+        'failed': 0,
+        'deleted': 0,
+    }
+
+    for _ in range(batch_size):
+        document = claim_pending_document()
+        if not document:
+            break
+
+        result = generate_document_preview(document)
+
+        stats['processed'] += 1
+        stats[result or 'deleted'] += 1
+
+    return stats
@@ -3,61 +3,11 @@ API Serializers for Document Library.
 
 BREAKING CHANGE: Updated to use numeric document_type_id per Appendix B.
 """
-from functools import lru_cache
 from rest_framework import serializers
+from apps.dictionaries.cache import get_document_source_display, get_document_type_name
 from .models import Document, DocumentTypeDefinition, DocumentSource, DocumentRequest, DocumentRequestStatus
 
 
-# Cache for DocumentTypeDefinition lookup (avoids N+1 queries in serializers)
-# Cache is module-level and refreshed on server restart
-@lru_cache(maxsize=512)
-def get_document_type_name_cached(document_type_id: int, product_type: str) -> str:
-    """
-    Get human-readable document type name from DocumentTypeDefinition.
-    Cached to avoid repeated database queries in list serialization.
-    """
-    if not document_type_id or not product_type:
-        if document_type_id == 0:
-            return "Дополнительный документ"
-        return f"Документ (ID: {document_type_id})"
-    
-    try:
-        type_def = DocumentTypeDefinition.objects.filter(
-            document_type_id=document_type_id,
-            product_type=product_type
-        ).first()
-        if type_def:
-            return type_def.name
-    except Exception:
-        pass
-    
-    if document_type_id == 0:
-        return "Дополнительный документ"
-    return f"Документ (ID: {document_type_id})"
-
-
-@lru_cache(maxsize=512)
-def get_document_source_display_cached(document_type_id: int, product_type: str) -> str:
-    """
-    Get source display from DocumentTypeDefinition.
-    Cached to avoid repeated database queries.
-    """
-    if not document_type_id or not product_type:
-        return "Неизвестно"
-    
-    try:
-        type_def = DocumentTypeDefinition.objects.filter(
-            document_type_id=document_type_id,
-            product_type=product_type
-        ).first()
-        if type_def:
-            return type_def.get_source_display()
-    except Exception:
-        pass
-    
-    return "Неизвестно"
-
-
 class DocumentTypeDefinitionSerializer(serializers.ModelSerializer):
     """Serializer for DocumentTypeDefinition reference table."""
     source_display = serializers.CharField(source='get_source_display', read_only=True)
@@ -134,11 +84,11 @@ class DocumentSerializer(serializers.ModelSerializer):
     
     def get_type_display(self, obj):
         """Get document type name from reference table (cached)."""
-        return get_document_type_name_cached(obj.document_type_id, obj.product_type)
+        return get_document_type_name(obj.document_type_id, obj.product_type)
     
     def get_source_display(self, obj):
         """Get source information from reference table (cached)."""
-        return get_document_source_display_cached(obj.document_type_id, obj.product_type)
+        return get_document_source_display(obj.document_type_id, obj.product_type)
 
 
 class DocumentUploadSerializer(serializers.ModelSerializer):
@@ -191,10 +141,12 @@ class DocumentListSerializer(serializers.ModelSerializer):
     Lightweight serializer for listing documents.
     Includes file and file_url for download functionality.
     Includes owner_email for admin document verification view.
+    Includes precomputed thumbnail_url/page_count so lists never need the full file.
     """
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     type_display = serializers.SerializerMethodField()
     file_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
     owner_email = serializers.EmailField(source='owner.email', read_only=True)
     owner_id = serializers.IntegerField(source='owner.id', read_only=True)
 
@@ -205,6 +157,9 @@ class DocumentListSerializer(serializers.ModelSerializer):
             'name',
             'file',
             'file_url',
+            'thumbnail_url',
+            'page_count',
+            'preview_status',
             'document_type_id',  # NEW: Numeric ID
             'product_type',      # NEW: Product context
             'type_display',
@@ -224,10 +179,19 @@ class DocumentListSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.file.url)
             return obj.file.url
         return None
+
+    def get_thumbnail_url(self, obj):
+        """Get full URL for the precomputed first-page thumbnail."""
+        if obj.thumbnail:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.thumbnail.url)
+            return obj.thumbnail.url
+        return None
     
     def get_type_display(self, obj):
         """Get document type name from reference table (cached)."""
-        return get_document_type_name_cached(obj.document_type_id, obj.product_type)
+        return get_document_type_name(obj.document_type_id, obj.product_type)
 
 
 class DocumentSelectSerializer(serializers.Serializer):
@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.documents import previews
+from apps.documents.models import Document, DocumentPreviewStatus
+from apps.users.models import User, UserRole
+
+PDF_BYTES = (
+    b'%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n'
+    b'2 0 obj << /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >> endobj\n'
+    b'3 0 obj << /Type /Page /Parent 2 0 R >> endobj\n'
+    b'4 0 obj << /Type /Page /Parent 2 0 R >> endobj\n%%EOF\n'
+)
+
+
+def _png_bytes(size=(800, 600)):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new('RGBA', size, (10, 120, 200, 255)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class DocumentPreviewTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.settings_override = override_settings(MEDIA_ROOT=media_root, DOCUMENT_THUMBNAIL_MAX_SIZE=100)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.owner = User.objects.create_user(email='docs@example.com', password='x', role=UserRole.AGENT)
+
+    def _document(self, filename, content):
+        document = Document(owner=self.owner, name=filename)
+        document.file.save(filename, ContentFile(content), save=False)
+        document.save()
+        return document
+
+    def test_image_gets_thumbnail_and_is_rendered_after_claim(self):
+        document = self._document('scan.png', _png_bytes())
+        render = previews._image_preview
+
+        def render_claimed(path):
+            # Rendering runs on an already committed claim
+            self.assertEqual(
+                Document.objects.get(pk=document.pk).preview_status, DocumentPreviewStatus.PROCESSING,
+            )
+            return render(path)
+
+        with mock.patch('apps.documents.previews._image_preview', side_effect=render_claimed):
+            stats = previews.process_preview_batch(batch_size=5)
+
+        self.assertEqual((stats['processed'], stats['ready']), (1, 1))
+        document.refresh_from_db()
+        self.assertEqual((document.preview_status, document.page_count), (DocumentPreviewStatus.READY, 1))
+        from PIL import Image
+
+        with Image.open(document.thumbnail.path) as thumbnail:
+            self.assertLessEqual(max(thumbnail.size), 100)
+
+    def test_pdf_page_count_without_pdftoppm(self):
+        document = self._document('contract.pdf', PDF_BYTES)
+        with mock.patch('apps.documents.previews.shutil.which', return_value=None):
+            previews.process_preview_batch()
+        document.refresh_from_db()
+        self.assertEqual((document.preview_status, document.page_count), (DocumentPreviewStatus.READY, 2))
+        self.assertFalse(document.thumbnail)
+
+    def test_unsupported_and_broken_files(self):
+        unsupported = self._document('notes.docx', b'PK\x03\x04')
+        broken = self._document('broken.jpg', b'not an image')
+        stats = previews.process_preview_batch()
+        self.assertEqual((stats['unsupported'], stats['failed']), (1, 1))
+        unsupported.refresh_from_db()
+        broken.refresh_from_db()
+        self.assertEqual(unsupported.preview_status, DocumentPreviewStatus.UNSUPPORTED)
+        self.assertEqual(broken.preview_status, DocumentPreviewStatus.FAILED)
+
+    def test_document_deleted_while_rendering(self):
+        document = self._document('scan.png', _png_bytes())
+        render = previews._image_preview
+
+        def render_and_delete(path):
+            result = render(path)
+            Document.objects.filter(pk=document.pk).delete()
+            return result
+
+        with mock.patch('apps.documents.previews._image_preview', side_effect=render_and_delete):
+            stats = previews.process_preview_batch()
+
+        self.assertEqual((stats['processed'], stats['deleted'], stats['ready']), (1, 1, 0))
+        thumbnails = Path(settings.MEDIA_ROOT).rglob('*.thumb.jpg')
+        self.assertEqual(list(thumbnails), [])
+
+    def test_stale_claims_are_taken_again(self):
+        fresh = self._document('fresh.png', _png_bytes())
+        stale = self._document('stale.png', _png_bytes())
+        Document.objects.filter(pk=fresh.pk).update(
+            preview_status=DocumentPreviewStatus.PROCESSING, preview_claimed_at=timezone.now(),
+        )
+        Document.objects.filter(pk=stale.pk).update(
+            preview_status=DocumentPreviewStatus.PROCESSING,
+            preview_claimed_at=timezone.now() - timedelta(hours=1),
+        )
+        self.assertEqual(previews.process_preview_batch()['processed'], 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.preview_status, DocumentPreviewStatus.READY)
+        self.assertEqual(fresh.preview_status, DocumentPreviewStatus.PROCESSING)
+
+    def test_command_requeues_failed_and_processes(self):
+        document = self._document('scan.png', _png_bytes())
+        Document.objects.filter(pk=document.pk).update(preview_status=DocumentPreviewStatus.FAILED)
+        out = StringIO()
+        call_command('process_document_previews', '--retry-failed', stdout=out)
+        self.assertIn('requeued_failed=1', out.getvalue())
+        self.assertIn('processed=1 ready=1', out.getvalue())
+        document.refresh_from_db()
+        self.assertEqual(document.preview_status, DocumentPreviewStatus.READY)
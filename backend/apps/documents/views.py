@@ -116,6 +116,8 @@ class DocumentViewSet(viewsets.ModelViewSet):
         # Delete file from storage
         if document.file:
             document.file.delete(save=False)
+        if document.thumbnail:
+            document.thumbnail.delete(save=False)
         
         return super().destroy(request, *args, **kwargs)
 
@@ -0,0 +1,150 @@
+"""
+Local stand-in for the Realist Bank agent API (load tests, Phase 2 dry runs).
+
+Serves the two endpoints BankIntegrationService calls in Phase 2 mode:
+
+- POST {BANK_API_URL}/add_ticket       -> new ticket id + initial status
+- POST {BANK_API_URL}/get_ticket_info  -> ticket status, advancing one step
+                                          along STATUS_FLOW per poll
+
+Each request waits a configurable latency (mean + uniform jitter) and fails
+with the configured probability, half as HTTP 500 and half as a
+{"status": "error"} body, so both error paths of the service are exercised.
+
+Point the backend at it with
+    BANK_API_URL=http://127.0.0.1:8099/agent_api1_1 BANK_API_PHASE1_MODE=False
+and run `python manage.py run_bank_stub`.
+"""
+
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+# Bank guarantee status model (Appendix A.1), in the order tickets move through it
+STATUS_FLOW = [
+    (101, 'Анкета'),
+    (110, 'Прескоринг'),
+    (210, 'Проверка документов'),
+    (710, 'Ожидается согласование БГ'),
+    (810, 'Ожидается оплата'),
+    (910, 'Гарантия выпущена'),
+]
+
+
+class BankStubState:
+    """Tickets and counters shared by the request handler threads."""
+
+    def __init__(self, latency_ms=200, jitter_ms=100, error_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.tickets = {}
+        self.requests = 0
+        self.errors = 0
+        self._ids = itertools.count(100000)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        with self._lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def roll_error(self):
+        """None, 'http' or 'body'."""
+        with self._lock:
+            self.requests += 1
+            if self.rng.random() >= self.error_rate:
+                return None
+            self.errors += 1
+            return 'http' if self.rng.random() < 0.5 else 'body'
+
+    def add_ticket(self, inn):
+        with self._lock:
+            ticket_id = next(self._ids)
+            self.tickets[ticket_id] = {'step': 0, 'inn': inn}
+        return ticket_id
+
+    def advance(self, ticket_id):
+        with self._lock:
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None:
+                return None
+            ticket['step'] = min(ticket['step'] + 1, len(STATUS_FLOW) - 1)
+            return ticket['step']
+
+
+def _ticket(ticket_id, step):
+    status_id, name = STATUS_FLOW[step]
+    return {
+        'id': ticket_id,
+        'status': {'id': status_id, 'name': name, 'comment': ''},
+        'manager': {'full_name': 'Менеджер Банка'},
+        'payment_status': {'name': 'Оплачено' if status_id >= 910 else 'Не оплачено'},
+    }
+
+
+class BankStubHandler(BaseHTTPRequestHandler):
+    server_version = 'RealistBankStub/1.0'
+
+    @property
+    def state(self) -> BankStubState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        logger.debug("Bank stub: " + format, *args)
+
+    def _reply(self, status_code, body):
+        payload = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = {key: values[-1] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+        endpoint = self.path.rstrip('/').rsplit('/', 1)[-1]
+
+        self.state.delay()
+        error = self.state.roll_error()
+        if error == 'http':
+            return self._reply(500, {'status': 'error', 'message': 'Internal Server Error'})
+        if error == 'body':
+            return self._reply(200, {'status': 'error', 'message': 'Сервис временно недоступен'})
+
+        if endpoint == 'add_ticket':
+            if not form.get('client[inn]'):
+                return self._reply(200, {'status': 'error', 'message': 'Не указан ИНН клиента'})
+            ticket_id = self.state.add_ticket(form['client[inn]'])
+            return self._reply(200, {
+                'status': 'success',
+                'message': 'Заявка создана',
+                'data': {'ticket': _ticket(ticket_id, 0)},
+            })
+        if endpoint == 'get_ticket_info':
+            try:
+                ticket_id = int(form.get('ticket_id', ''))
+            except ValueError:
+                ticket_id = None
+            step = self.state.advance(ticket_id)
+            if step is None:
+                return self._reply(200, {'status': 'error', 'message': 'Заявка не найдена'})
+            return self._reply(200, {'status': 'success', 'data': {'ticket': _ticket(ticket_id, step)}})
+        return self._reply(404, {'status': 'error', 'message': f'Unknown endpoint: {endpoint}'})
+
+
+def make_server(host='127.0.0.1', port=8099, **options) -> ThreadingHTTPServer:
+    """Threaded stub server; call serve_forever() (or run it in a thread)."""
+    server = ThreadingHTTPServer((host, port), BankStubHandler)
+    server.daemon_threads = True
+    server.state = BankStubState(**options)
+    return server
@@ -0,0 +1,60 @@
+"""
+Serve the local Realist Bank stub (see apps.integrations.bank_stub).
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.integrations.bank_stub import make_server
+
+
+class Command(BaseCommand):
+    help = 'Run a local stub of the Realist Bank add_ticket/get_ticket_info API for load tests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Bind address.')
+        parser.add_argument('--port', type=int, default=8099, help='Bind port.')
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=200,
+            help='Mean response latency in milliseconds.',
+        )
+        parser.add_argument(
+            '--jitter-ms',
+            type=float,
+            default=100,
+            help='Uniform +/- jitter around the mean latency.',
+        )
+        parser.add_argument(
+            '--error-rate',
+            type=float,
+            default=0.0,
+            help='Share of requests answered with an error (0..1).',
+        )
+        parser.add_argument('--seed', type=int, default=None, help='Random seed.')
+
+    def handle(self, *args, **options):
+        server = make_server(
+            options['host'],
+            options['port'],
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            error_rate=min(1.0, max(0.0, options['error_rate'])),
+            seed=options['seed'],
+        )
+        host, port = server.server_address[:2]
+        self.stdout.write(
+            f"Bank stub on http://{host}:{port}/agent_api1_1 "
+            f"(latency {options['latency_ms']}±{options['jitter_ms']} ms, errors {options['error_rate']:.0%})"
+        )
+        self.stdout.write(f'Backend: BANK_API_URL=http://{host}:{port}/agent_api1_1 BANK_API_PHASE1_MODE=False')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            state = server.state
+            self.stdout.write(self.style.WARNING(
+                f'Bank stub stopped: {state.requests} requests, {state.errors} errors, '
+                f'{len(state.tickets)} tickets.'
+            ))
+        finally:
+            server.server_close()
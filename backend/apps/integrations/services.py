@@ -15,6 +15,7 @@ from django.conf import settings
 from django.db import transaction
 
 from apps.applications.models import Application, ProductType, GuaranteeType
+from apps.companies.client_snapshots import compact_client_snapshot
 from apps.companies.models import CompanyProfile
 
 
@@ -195,7 +196,7 @@ class BankIntegrationService:
                 ...
             ]
         """
-        from apps.documents.models import DocumentTypeDefinition
+        from apps.dictionaries.cache import document_types
         
         try:
             application = Application.objects.prefetch_related('documents').get(id=application_id)
@@ -210,28 +211,19 @@ class BankIntegrationService:
         if not documents:
             return result
         
-        # Pre-fetch all document type definitions in ONE query to avoid N+1
-        type_ids = [getattr(doc, 'document_type_id', 0) or 0 for doc in documents]
-        definitions = {
-            (d.document_type_id, d.product_type): d.name
-            for d in DocumentTypeDefinition.objects.filter(
-                document_type_id__in=type_ids
-            )
-        }
+        # Document type definitions come from the reference-data cache (no query)
+        definitions = document_types.get_map()
         
         for doc in documents:
             # Get document type_id (default to 0 if not set)
             type_id = getattr(doc, 'document_type_id', 0) or 0
             doc_product_type = getattr(doc, 'product_type', '') or product_type
             
-            # Look up type name from pre-fetched dictionary
-            type_name = definitions.get(
-                (type_id, doc_product_type),
-                definitions.get(
-                    (type_id, ''), 
-                    'Дополнительный документ' if type_id == 0 else f'Документ (ID: {type_id})'
-                )
-            )
+            type_info = definitions.get((type_id, doc_product_type)) or definitions.get((type_id, ''))
+            if type_info:
+                type_name = type_info.name
+            else:
+                type_name = 'Дополнительный документ' if type_id == 0 else f'Документ (ID: {type_id})'
             
             result.append({
                 'type_id': type_id,
@@ -768,7 +760,9 @@ class BankIntegrationService:
                     # This preserves the company data at the time of submission
                     company = application.company
                     if company and not application.full_client_data:
-                        application.full_client_data = self._create_company_snapshot(company)
+                        application.full_client_data = compact_client_snapshot(
+                            company.id, self._create_company_snapshot(company)
+                        )
                         logger.info(f"[PHASE 1] Saved full_client_data snapshot for application {application_id}")
                     
                     application.save()
@@ -988,7 +982,8 @@ class BankIntegrationService:
                 status_id=710,  # "Одобрено, ожидается согласование БГ"
             )
         """
-        from apps.applications.models import ApplicationStatus, ApplicationStatusDefinition
+        from apps.applications.models import ApplicationStatus
+        from apps.dictionaries.cache import get_status
         
         logger.info(f"Processing bank webhook: ticket={external_id}, status_id={status_id}")
         
@@ -1006,19 +1001,11 @@ class BankIntegrationService:
                     'error': f'Application with external_id {external_id} not found'
                 }
             
-            try:
-                status_def = ApplicationStatusDefinition.objects.get(
-                    status_id=status_id,
-                    product_type=application.product_type
-                )
-            except ApplicationStatusDefinition.DoesNotExist:
+            status_def = (
+                get_status(status_id, application.product_type)
                 # Try without product filter (for general statuses)
-                try:
-                    status_def = ApplicationStatusDefinition.objects.filter(
-                        status_id=status_id
-                    ).first()
-                except:
-                    pass
+                or get_status(status_id)
+            )
             
             # Update application
             old_status = application.status
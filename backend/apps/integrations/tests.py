@@ -0,0 +1,54 @@
+import threading
+
+from django.test import TestCase, override_settings
+
+from apps.applications.models import Application, ApplicationStatus, ProductType
+from apps.companies.models import CompanyProfile
+from apps.integrations.bank_stub import STATUS_FLOW, make_server
+from apps.integrations.services import BankIntegrationService
+from apps.users.models import User, UserRole
+
+
+class BankStubTest(TestCase):
+    def setUp(self):
+        self.server = make_server('127.0.0.1', 0, latency_ms=0, jitter_ms=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        host, port = self.server.server_address[:2]
+        self.settings_override = override_settings(
+            BANK_API_PHASE1_MODE=False,
+            BANK_API_URL=f'http://{host}:{port}/agent_api1_1',
+            BANK_API_LOGIN='agent',
+            BANK_API_PASSWORD='secret',
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        agent = User.objects.create_user(email='agent@example.com', password='x', role=UserRole.AGENT)
+        company = CompanyProfile.objects.create(owner=agent, inn='7707123456', name='ООО Ромашка')
+        self.application = Application.objects.create(
+            created_by=agent,
+            company=company,
+            product_type=ProductType.BANK_GUARANTEE,
+            guarantee_type='contract_execution',
+            amount=1000000,
+            term_months=12,
+            status=ApplicationStatus.PENDING,
+        )
+
+    def test_send_and_sync_through_stub(self):
+        service = BankIntegrationService()
+        result = service.send_application(self.application.id)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.external_id, result['ticket_id'])
+
+        synced = service.sync_application_status(self.application.id)
+        self.assertEqual(synced['bank_status_id'], STATUS_FLOW[1][0])
+        self.assertTrue(synced['changed'])
+
+    def test_configured_errors_surface_as_value_errors(self):
+        self.server.state.error_rate = 1.0
+        with self.assertRaises(ValueError):
+            BankIntegrationService().send_application(self.application.id)
+        self.assertEqual(self.server.state.errors, 1)
@@ -0,0 +1,6 @@
+"""
+Buffered counters for news (see apps.core.counters).
+"""
+from apps.core.counters import BufferedCounter
+
+news_views = BufferedCounter('news_views', 'news.News', 'views_count')
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.4 on 2026-10-19 02:50
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# GIN index for News.search_vector plus a backfill matching
+# apps.news.search.search_vector_expression(). PostgreSQL only.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian'::regconfig, COALESCE(title, '')), 'A') || "
+    "setweight(to_tsvector('russian'::regconfig, COALESCE(summary, '')), 'B') || "
+    "setweight(to_tsvector('russian'::regconfig, COALESCE(content, '')), 'C')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'UPDATE news_news SET search_vector = {SEARCH_VECTOR_SQL}')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS news_search_vector_gin_idx ON news_news USING gin (search_vector)'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS news_search_vector_gin_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_add_image_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Заполняется автоматически при сохранении (PostgreSQL)', null=True, verbose_name='Поисковый индекс'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -2,6 +2,7 @@
 News models for Lider Garant.
 Categories and News articles for the platform.
 """
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 
@@ -113,6 +114,12 @@ class News(models.Model):
         'Дата обновления',
         auto_now=True,
     )
+    search_vector = SearchVectorField(
+        'Поисковый индекс',
+        null=True,
+        editable=False,
+        help_text='Заполняется автоматически при сохранении (PostgreSQL)',
+    )
 
     class Meta:
         verbose_name = 'Новость'
@@ -152,3 +159,8 @@ class News(models.Model):
                 counter += 1
         super().save(*args, **kwargs)
 
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'title', 'summary', 'content'} & set(update_fields):
+            from .search import refresh_search_vector
+            refresh_search_vector(News.objects.filter(pk=self.pk))
+
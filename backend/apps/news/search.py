@@ -0,0 +1,118 @@
+"""
+Full-text search over news (PostgreSQL, Russian configuration).
+
+News.search_vector stores setweight(title, A) || setweight(summary, B) ||
+setweight(content, C) and is refreshed on every save; migration 0003 adds the
+GIN index and backfills existing rows. Queries use websearch syntax
+("кредит -лизинг", "\"банковская гарантия\""), results are ordered by
+ts_rank and carry a ts_headline snippet built over the content with HTML
+tags stripped in SQL (plain_text), so snippets never contain markup.
+
+Other backends fall back to icontains over the same fields with a snippet
+cut around the first match.
+"""
+
+from __future__ import annotations
+
+import re
+
+from django.db import connection
+from django.db.models import F, Func, Q, QuerySet, TextField, Value
+from django.utils.html import strip_tags
+
+SEARCH_CONFIG = 'russian'
+MIN_QUERY_LENGTH = 2
+SNIPPET_START = '<mark>'
+SNIPPET_STOP = '</mark>'
+SNIPPET_RADIUS = 80
+HEADLINE_OPTIONS = {'max_fragments': 2, 'max_words': 30, 'min_words': 10, 'fragment_delimiter': ' … '}
+
+
+def normalize_query(query: str | None) -> str:
+    return ' '.join((query or '').split())
+
+
+def search_vector_expression():
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('summary', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('content', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def plain_text(field: str) -> Func:
+    """SQL expression: the field with HTML tags replaced by spaces (PostgreSQL regexp_replace)."""
+    return Func(
+        F(field), Value(r'<[^>]*>'), Value(' '), Value('g'),
+        function='regexp_replace',
+        output_field=TextField(),
+    )
+
+
+def refresh_search_vector(queryset: QuerySet) -> None:
+    """Recompute the stored tsvector for the given News rows (PostgreSQL only)."""
+    if connection.vendor != 'postgresql':
+        return
+    queryset.update(search_vector=search_vector_expression())
+
+
+def search_news(queryset: QuerySet, query: str | None) -> QuerySet:
+    """
+    Filter and rank a News queryset. Rows get `search_rank` and, on
+    PostgreSQL, `search_snippet` annotations.
+    """
+    query = normalize_query(query)
+    if len(query) < MIN_QUERY_LENGTH:
+        return queryset.none()
+
+    if connection.vendor == 'postgresql':
+        return ranked_search(queryset, query)
+
+    return queryset.filter(
+        Q(title__icontains=query) | Q(summary__icontains=query) | Q(content__icontains=query)
+    ).order_by('-published_at', '-id')
+
+
+def ranked_search(queryset: QuerySet, query: str) -> QuerySet:
+    """PostgreSQL full-text path of search_news (websearch query, ts_rank, ts_headline)."""
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    return (
+        queryset.filter(search_vector=search_query)
+        .annotate(
+            search_rank=SearchRank('search_vector', search_query),
+            search_snippet=SearchHeadline(
+                plain_text('content'),
+                search_query,
+                config=SEARCH_CONFIG,
+                start_sel=SNIPPET_START,
+                stop_sel=SNIPPET_STOP,
+                **HEADLINE_OPTIONS,
+            ),
+        )
+        .order_by('-search_rank', '-published_at', '-id')
+    )
+
+
+def build_snippet(news, query: str | None) -> str:
+    """Snippet around the first match in content (or summary), for non-PostgreSQL backends."""
+    query = normalize_query(query)
+    for text in (strip_tags(news.content or ''), news.summary or ''):
+        if not query:
+            break
+        match = re.search(re.escape(query), text, flags=re.IGNORECASE)
+        if match is None:
+            continue
+        start = max(0, match.start() - SNIPPET_RADIUS)
+        end = min(len(text), match.end() + SNIPPET_RADIUS)
+        return (
+            ('…' if start else '')
+            + text[start:match.start()]
+            + SNIPPET_START + match.group(0) + SNIPPET_STOP
+            + text[match.end():end]
+            + ('…' if end < len(text) else '')
+        )
+    return news.summary or strip_tags(news.content or '')[:2 * SNIPPET_RADIUS]
@@ -3,6 +3,7 @@ News serializers.
 """
 from rest_framework import serializers
 from .models import NewsCategory, News
+from .search import build_snippet
 
 
 class NewsCategorySerializer(serializers.ModelSerializer):
@@ -52,6 +53,25 @@ class NewsDetailSerializer(NewsListSerializer):
         fields = NewsListSerializer.Meta.fields + ['content', 'updated_at']
 
 
+class NewsSearchResultSerializer(NewsListSerializer):
+    """Search hit: list fields plus rank and a highlighted snippet."""
+    rank = serializers.SerializerMethodField()
+    snippet = serializers.SerializerMethodField()
+
+    class Meta(NewsListSerializer.Meta):
+        fields = NewsListSerializer.Meta.fields + ['rank', 'snippet']
+
+    def get_rank(self, obj):
+        rank = getattr(obj, 'search_rank', None)
+        return round(float(rank), 6) if rank is not None else None
+
+    def get_snippet(self, obj):
+        snippet = getattr(obj, 'search_snippet', None)
+        if snippet is not None:
+            return snippet
+        return build_snippet(obj, self.context.get('query'))
+
+
 class NewsCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating news (admin only)."""
     category_id = serializers.PrimaryKeyRelatedField(
@@ -0,0 +1,43 @@
+from rest_framework.test import APITestCase
+
+from apps.news.models import News
+from apps.users.models import User, UserRole
+
+
+class NewsSearchTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='news_reader@example.com', password='x', role=UserRole.CLIENT)
+        News.objects.create(
+            title='Банковские гарантии в 2026 году',
+            summary='Обзор изменений',
+            content='<p>Новые требования к гарантиям по 44-ФЗ вступают в силу.</p>',
+        )
+        News.objects.create(title='Лизинг оборудования', content='Условия лизинга для малого бизнеса.')
+        News.objects.create(title='Черновик: гарантии', content='Не опубликовано.', is_published=False)
+        self.client.force_authenticate(self.user)
+
+    def test_search_returns_published_matches_with_snippet(self):
+        response = self.client.get('/api/news/search/', {'q': '44-ФЗ'})
+        self.assertEqual(response.status_code, 200, response.data)
+        results = response.data['results']
+        self.assertEqual([row['title'] for row in results], ['Банковские гарантии в 2026 году'])
+        self.assertIn('<mark>44-ФЗ</mark>', results[0]['snippet'])
+        self.assertNotIn('<p>', results[0]['snippet'])
+
+    def test_short_query_rejected(self):
+        response = self.client.get('/api/news/search/', {'q': 'a'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_postgres_headline_runs_over_tag_stripped_content(self):
+        from django.db import connections
+        from django.db.backends.postgresql.base import DatabaseWrapper
+        from apps.news.search import ranked_search
+
+        queryset = ranked_search(News.objects.all(), 'гарантии')
+        headline = queryset.query.annotations['search_snippet']
+        # Compiled only, never executed: no PostgreSQL server needed
+        pg = DatabaseWrapper({**connections['default'].settings_dict, 'ENGINE': 'django.db.backends.postgresql'})
+        config, document, query = headline.get_source_expressions()
+        sql, params = queryset.query.get_compiler(connection=pg).compile(document)
+        self.assertEqual(sql, 'regexp_replace("news_news"."content", %s, %s, %s)')
+        self.assertEqual(params, ['<[^>]*>', ' ', 'g'])
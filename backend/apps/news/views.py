@@ -5,14 +5,16 @@ from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import F
+from .counters import news_views
 from .models import NewsCategory, News
 from .serializers import (
     NewsCategorySerializer,
     NewsListSerializer,
     NewsDetailSerializer,
     NewsCreateUpdateSerializer,
+    NewsSearchResultSerializer,
 )
+from .search import MIN_QUERY_LENGTH, normalize_query, search_news
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -87,9 +89,8 @@ class NewsViewSet(viewsets.ModelViewSet):
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        # Atomic increment of view count (avoids race conditions)
-        # Uses F() expression for atomic update without fetching the value
-        News.objects.filter(pk=instance.pk).update(views_count=F('views_count') + 1)
+        # Buffered increment: applied in bulk by the counter flusher
+        news_views.incr(instance.pk)
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -103,6 +104,28 @@ class NewsViewSet(viewsets.ModelViewSet):
             'recent': NewsListSerializer(recent, many=True).data,
         })
 
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search: GET /api/news/search/?q=<text>[&category=<id>].
+        Ranked, paginated results with highlighted snippets.
+        """
+        query = normalize_query(request.query_params.get('q'))
+        if len(query) < MIN_QUERY_LENGTH:
+            return Response(
+                {'error': f'Минимальная длина запроса — {MIN_QUERY_LENGTH} символа'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = search_news(self.get_queryset(), query)
+        context = {**self.get_serializer_context(), 'query': query}
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = NewsSearchResultSerializer(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+        serializer = NewsSearchResultSerializer(queryset, many=True, context=context)
+        return Response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def by_category(self, request):
         """
@@ -477,21 +477,30 @@ def create_application_notifications(sender, instance, created, **kwargs):
     new_partner = application.assigned_partner
     
     if new_partner and (not old_partner_id or old_partner_id != new_partner.id):
-        data = get_application_data(application)
-        
-        try:
-            notification = Notification.create_notification(
-                user=new_partner,
-                notification_type=NotificationType.NEW_APPLICATION,
-                title='Новая заявка',
-                message=f"Вам назначена заявка от {data.get('company_name', 'Компании')}",
-                data=data,
-                source_object=application
-            )
-            send_notification_email(notification)
-            logger.info(f"Created new_application notification for partner {new_partner.id}")
-        except Exception as e:
-            logger.error(f"Failed to create new_application notification: {e}")
+        notify_partner_assigned(application)
+
+
+def notify_partner_assigned(application):
+    """
+    Notify the assigned partner about a new application.
+    Also used by bulk creation, which bypasses post_save.
+    """
+    partner = application.assigned_partner
+    data = get_application_data(application)
+
+    try:
+        notification = Notification.create_notification(
+            user=partner,
+            notification_type=NotificationType.NEW_APPLICATION,
+            title='Новая заявка',
+            message=f"Вам назначена заявка от {data.get('company_name', 'Компании')}",
+            data=data,
+            source_object=application
+        )
+        send_notification_email(notification)
+        logger.info(f"Created new_application notification for partner {partner.id}")
+    except Exception as e:
+        logger.error(f"Failed to create new_application notification: {e}")
 
 
 # ==========================================
@@ -685,104 +694,22 @@ def create_admin_user_notification(sender, instance, created, **kwargs):
 # Chat Message Signals
 # ==========================================
 
-@receiver(post_save, sender='chat.ApplicationMessage')
-def create_chat_message_notification(sender, instance, created, **kwargs):
-    """
-    Create notification when new chat message is sent.
-    
-    Notifies: All participants except sender
-    """
-    if not created:
-        return
-    
-    message = instance
-    application = message.application
-    sender_user = message.sender
-    
-    # Skip notification if sender was deleted
-    if not sender_user:
-        return
-    
-    # Get sender display name
-    sender_name = sender_user.first_name or sender_user.email
-    if sender_user.first_name and sender_user.last_name:
-        sender_name = f"{sender_user.first_name} {sender_user.last_name}"
-    
-    # Preview text (first 100 chars)
-    preview = message.text[:100] + "..." if len(message.text) > 100 else message.text
-    
-    data = {
-        'application_id': application.id,
-        'message_id': message.id,
-        'sender_name': sender_name,
-        'sender_role': sender_user.role,
-        'preview_text': preview,
-    }
-    
-    # Collect all participants
-    participants = set()
-    
-    # Application owner
-    if application.created_by:
-        participants.add(application.created_by)
-    
-    # Company owner
-    if application.company and application.company.owner:
-        participants.add(application.company.owner)
-    
-    # Assigned partner
-    if application.assigned_partner:
-        participants.add(application.assigned_partner)
-    
-    # Remove sender from recipients
-    participants.discard(sender_user)
-    
-    # Create notifications for all participants
-    for user in participants:
-        try:
-            notification = Notification.create_notification(
-                user=user,
-                notification_type=NotificationType.CHAT_MESSAGE,
-                title='Новое сообщение',
-                message=f"{sender_name}: {preview}",
-                data=data,
-                source_object=message
-            )
-            send_notification_email(notification)
-            logger.info(f"Created chat notification for user {user.id}")
-        except Exception as e:
-            logger.error(f"Failed to create chat notification for user {user.id}: {e}")
-
-    # Notify all admins (even if not participants)
-    admin_users = get_admin_users()
-    for admin in admin_users:
-        if admin in participants:
-            continue
-        try:
-            notification = Notification.create_notification(
-                user=admin,
-                notification_type=NotificationType.CHAT_MESSAGE,
-                title='Новое сообщение',
-                message=f"{sender_name}: {preview}",
-                data=data,
-                source_object=message
-            )
-            send_notification_email(notification)
-            logger.info(f"Created admin chat notification for user {admin.id}")
-        except Exception as e:
-            logger.error(f"Failed to create admin chat notification for user {admin.id}: {e}")
-
-
-# Also handle TicketMessage from applications app
+# TicketMessage is the single chat store (REST and WebSocket both
+# write through apps.applications.messaging), so this is the only receiver.
 @receiver(post_save, sender='applications.TicketMessage')
 def create_ticket_message_notification(sender, instance, created, **kwargs):
     """
-    Create notification when new ticket message is sent.
-    Uses same logic as ApplicationMessage.
+    Create notification when new chat message is sent.
+
+    Notifies: All participants except sender, plus admins. Users online in
+    the chat room (apps.chat.presence) see the message live and get nothing;
+    admins online in the admin inbox get the in-app notification but no email.
     """
     if not created:
         return
     
+    from apps.chat import presence
+    
     message = instance
     application = message.application
     sender_user = message.sender
@@ -821,8 +748,11 @@ def create_ticket_message_notification(sender, instance, created, **kwargs):
         participants.add(application.assigned_partner)
     
     participants.discard(sender_user)
+    online_in_room = presence.online_user_ids(presence.chat_room(application.id))
     
     for user in participants:
+        if user.id in online_in_room:
+            continue
         try:
             notification = Notification.create_notification(
                 user=user,
@@ -837,9 +767,10 @@ def create_ticket_message_notification(sender, instance, created, **kwargs):
         except Exception as e:
             logger.error(f"Failed to create ticket notification for user {user.id}: {e}")
 
-    admin_users = get_admin_users()
+    admin_users = list(get_admin_users())
+    online_in_inbox = presence.online_user_ids(presence.ADMIN_INBOX_ROOM) if admin_users else set()
     for admin in admin_users:
-        if admin in participants:
+        if admin in participants or admin == sender_user or admin.id in online_in_room:
             continue
         try:
             notification = Notification.create_notification(
@@ -850,7 +781,8 @@ def create_ticket_message_notification(sender, instance, created, **kwargs):
                 data=data,
                 source_object=message
             )
-            send_notification_email(notification)
+            if admin.id not in online_in_inbox:
+                send_notification_email(notification)
             logger.info(f"Created admin ticket notification for user {admin.id}")
         except Exception as e:
             logger.error(f"Failed to create admin ticket notification for user {admin.id}: {e}")
@@ -1,17 +1,17 @@
 from django.contrib import admin, messages
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
-from .models import SeoPage
+from .models import SeoPage, normalize_slug
 from .utils.templates import SEO_TEMPLATES
 
 
 @admin.register(SeoPage)
 class SeoPageAdmin(admin.ModelAdmin):
-    list_display = ('slug', 'meta_title', 'page_type', 'is_published', 'updated_at', 'preview_link')
+    list_display = ('slug', 'meta_title', 'page_type', 'is_published', 'views_count', 'leads_count', 'updated_at', 'preview_link')
     list_filter = ('is_published', 'page_type', 'template_name', 'autofill_template')
     search_fields = ('slug', 'meta_title', 'h1_title')
     prepopulated_fields = {'slug': ('h1_title',)}
-    readonly_fields = ('created_at', 'updated_at', 'preview_link')
+    readonly_fields = ('views_count', 'leads_count', 'created_at', 'updated_at', 'preview_link')
     
     fieldsets = (
         ('Основное', {
@@ -43,7 +43,7 @@ class SeoPageAdmin(admin.ModelAdmin):
             'description': 'JSON поля для структурированных данных. Формат: [{"ключ": "значение"}]'
         }),
         ('Системная информация', {
-            'fields': ('created_at', 'updated_at', 'preview_link'),
+            'fields': ('views_count', 'leads_count', 'created_at', 'updated_at', 'preview_link'),
             'classes': ('collapse',)
         }),
     )
@@ -80,6 +80,7 @@ class SeoPageAdmin(admin.ModelAdmin):
             # Create new SeoPage instance with copied fields
             pages_to_create.append(SeoPage(
                 slug=f"{page.slug}-copy",
+                lookup_slug=normalize_slug(f"{page.slug}-copy"),
                 meta_title=page.meta_title,
                 meta_description=page.meta_description,
                 meta_keywords=page.meta_keywords,
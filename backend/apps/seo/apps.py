@@ -0,0 +1,20 @@
+"""
+SEO app configuration.
+"""
+from django.apps import AppConfig
+
+
+class SeoConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.seo'
+    verbose_name = 'SEO'
+
+    def ready(self):
+        """Register shared cache invalidation for public SEO reads."""
+        from apps.bank_conditions.models import Bank
+        from apps.core.caching import invalidate_on
+        from .models import SeoPage
+
+        invalidate_on(SeoPage, 'seo')
+        invalidate_on(SeoPage.banks.through, 'seo')
+        invalidate_on(Bank, 'seo')
@@ -0,0 +1,26 @@
+"""
+Buffered counters for SEO pages (see apps.core.counters).
+"""
+from urllib.parse import urlsplit
+
+from apps.core.counters import BufferedCounter
+
+from .models import SeoPage, normalize_slug
+
+seo_page_views = BufferedCounter('seo_page_views', 'seo.SeoPage', 'views_count')
+seo_page_leads = BufferedCounter('seo_page_leads', 'seo.SeoPage', 'leads_count')
+
+
+def record_lead(page_url: str) -> None:
+    """Attribute a lead to the published SEO page it was submitted from, if any."""
+    slug = normalize_slug(urlsplit(page_url or '').path)
+    if not slug:
+        return
+    page_id = (
+        SeoPage.objects.filter(is_published=True, lookup_slug=slug)
+        .order_by('-priority', 'slug')
+        .values_list('pk', flat=True)
+        .first()
+    )
+    if page_id is not None:
+        seo_page_leads.incr(page_id)
@@ -0,0 +1,52 @@
+"""
+Write static sitemap shards and the prerender manifest for SEO pages and news.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.seo.sitemap_builder import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Regenerate changed sitemap / manifest shards (SEO pages, news).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Run continuously as worker.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=int,
+            default=int(getattr(settings, 'SITEMAP_WORKER_SLEEP_SECONDS', 60)),
+            help='Sleep seconds between worker iterations.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rewrite every shard on the first run.',
+        )
+
+    def handle(self, *args, **options):
+        loop = options['loop']
+        sleep_seconds = max(1, int(options['sleep']))
+        force = options['force']
+
+        try:
+            while True:
+                stats = build_sitemaps(force=force)
+                force = False
+                if stats['rebuilt'] or stats['removed'] or not loop:
+                    self.stdout.write(
+                        f"rebuilt={','.join(stats['rebuilt']) or '-'} "
+                        f"removed={','.join(stats['removed']) or '-'} unchanged={stats['unchanged']}"
+                    )
+                if not loop:
+                    break
+                time.sleep(sleep_seconds)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Sitemap builder stopped.'))
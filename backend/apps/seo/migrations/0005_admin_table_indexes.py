@@ -0,0 +1,22 @@
+# Generated by Django 5.0.4 on 2026-10-19 02:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_conditions', '0004_admin_table_indexes'),
+        ('seo', '0004_add_autofill_template_and_migrate_legacy'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seopage',
+            index=models.Index(fields=['priority', 'id'], name='seo_page_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seopage',
+            index=models.Index(fields=['updated_at', 'id'], name='seo_page_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.4 on 2026-10-19 02:51
+
+from django.db import migrations, models
+
+
+def backfill_lookup_slug(apps, schema_editor):
+    SeoPage = apps.get_model('seo', 'SeoPage')
+    pages = list(SeoPage.objects.only('id', 'slug'))
+    for page in pages:
+        page.lookup_slug = str(page.slug or '').strip().strip('/')
+    SeoPage.objects.bulk_update(pages, ['lookup_slug'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seo', '0005_admin_table_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seopage',
+            name='lookup_slug',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255, verbose_name='Lookup Slug'),
+        ),
+        migrations.RunPython(backfill_lookup_slug, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.4 on 2026-10-19 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seo', '0006_lookup_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seopage',
+            name='leads_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Leads submitted from this page', verbose_name='Leads'),
+        ),
+        migrations.AddField(
+            model_name='seopage',
+            name='views_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Views'),
+        ),
+    ]
@@ -1,8 +1,16 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+
+def normalize_slug(slug) -> str:
+    """Public lookup form of a slug: no surrounding whitespace or slashes."""
+    return str(slug or '').strip().strip('/')
+
+
 class SeoPage(models.Model):
     slug = models.CharField(_("URL Path"), max_length=255, unique=True, help_text=_("e.g. /credit-for-business. Do not include domain."))
+    # normalize_slug(slug), kept in sync on save: legacy "/slug" rows resolve in one indexed lookup
+    lookup_slug = models.CharField(_("Lookup Slug"), max_length=255, db_index=True, editable=False, default='')
     
     # Meta Tags
     meta_title = models.CharField(_("Meta Title"), max_length=255, blank=True)
@@ -74,6 +82,10 @@ class SeoPage(models.Model):
         verbose_name=_("Banks to Display")
     )
 
+    # Buffered counters (apps.seo.counters), applied in bulk by the flusher
+    views_count = models.PositiveIntegerField(_("Views"), default=0, editable=False)
+    leads_count = models.PositiveIntegerField(_("Leads"), default=0, editable=False, help_text=_("Leads submitted from this page"))
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -81,6 +93,17 @@ class SeoPage(models.Model):
         verbose_name = _("SEO Page")
         verbose_name_plural = _("SEO Pages")
         ordering = ['-priority', 'slug']
+        indexes = [
+            models.Index(fields=['priority', 'id'], name='seo_page_priority_idx'),
+            models.Index(fields=['updated_at', 'id'], name='seo_page_updated_idx'),
+        ]
 
     def __str__(self):
         return self.slug
+
+    def save(self, *args, **kwargs):
+        self.lookup_slug = normalize_slug(self.slug)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'slug' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'lookup_slug'}
+        super().save(*args, **kwargs)
@@ -0,0 +1,230 @@
+"""
+Static sitemap / prerender manifest for public SEO pages and news.
+
+News is included only when SITEMAP_NEWS_PATH is set (lider-garant has no
+news detail route yet, so the default is empty).
+
+Rows are sharded by primary key (pk // SITEMAP_SHARD_SIZE, at most 50k URLs
+per shard as the sitemap protocol requires). Each shard is written as
+
+    <kind>-<n>.xml   sitemap urlset
+    <kind>-<n>.json  [{"slug", "path", "lastmod"}, ...] for frontend prerendering
+
+plus sitemap-index.xml and manifest.json listing every shard. A shard is
+rebuilt only when its fingerprint (row count, pk sum, max updated_at — one
+grouped query per kind) differs from the one recorded in manifest.json, so a
+regular run after a page edit rewrites a single shard.
+
+Files go to SITEMAP_ROOT and are served statically by nginx (/sitemaps/).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, F, Max, QuerySet, Sum
+from django.utils import timezone
+
+MANIFEST_FILE = 'manifest.json'
+INDEX_FILE = 'sitemap-index.xml'
+MAX_SHARD_SIZE = 50000
+SITEMAP_XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+@dataclass(frozen=True)
+class SitemapSource:
+    kind: str
+    queryset: Callable[[], QuerySet]
+    slug_field: str
+    path_template: str
+
+    def path(self, slug: str) -> str:
+        return self.path_template.format(slug=slug)
+
+
+def _seo_pages() -> QuerySet:
+    from .models import SeoPage
+
+    return SeoPage.objects.filter(is_published=True).exclude(lookup_slug='')
+
+
+def _news() -> QuerySet:
+    from apps.news.models import News
+
+    return News.objects.filter(is_published=True).exclude(slug='')
+
+
+def get_sources() -> list[SitemapSource]:
+    sources = [SitemapSource('seo', _seo_pages, 'lookup_slug', '/{slug}')]
+    # News is listed only once the public site has a detail route for it
+    news_path = getattr(settings, 'SITEMAP_NEWS_PATH', '')
+    if news_path:
+        sources.append(SitemapSource('news', _news, 'slug', news_path))
+    return sources
+
+
+def _shard_size() -> int:
+    return max(1, min(int(getattr(settings, 'SITEMAP_SHARD_SIZE', MAX_SHARD_SIZE)), MAX_SHARD_SIZE))
+
+
+def _root() -> Path:
+    return Path(getattr(settings, 'SITEMAP_ROOT', Path(settings.MEDIA_ROOT) / 'sitemaps'))
+
+
+def _site_url() -> str:
+    return str(getattr(settings, 'SITEMAP_SITE_URL', '')).rstrip('/')
+
+
+def _public_url() -> str:
+    return str(getattr(settings, 'SITEMAP_PUBLIC_URL', '') or f'{_site_url()}/sitemaps/').rstrip('/') + '/'
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    """Write via a temp file + rename so nginx never serves a half-written file."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def shard_fingerprints(source: SitemapSource, shard_size: int) -> dict[int, dict]:
+    """{shard: {'fingerprint', 'count', 'lastmod'}} from one grouped query."""
+    rows = (
+        source.queryset()
+        .annotate(shard=F('pk') / shard_size)
+        .values('shard')
+        .annotate(count=Count('pk'), id_sum=Sum('pk'), lastmod=Max('updated_at'))
+        .order_by('shard')
+    )
+    result = {}
+    for row in rows:
+        lastmod = row['lastmod'].isoformat() if row['lastmod'] else ''
+        result[int(row['shard'])] = {
+            'fingerprint': f"{row['count']}:{row['id_sum']}:{lastmod}",
+            'count': row['count'],
+            'lastmod': lastmod,
+        }
+    return result
+
+
+def _shard_entries(source: SitemapSource, shard: int, shard_size: int) -> list[dict]:
+    rows = (
+        source.queryset()
+        .filter(pk__gte=shard * shard_size, pk__lt=(shard + 1) * shard_size)
+        .order_by('pk')
+        .values_list(source.slug_field, 'updated_at')
+    )
+    return [
+        {
+            'slug': slug,
+            'path': source.path(slug),
+            'lastmod': updated_at.isoformat() if updated_at else None,
+        }
+        for slug, updated_at in rows
+    ]
+
+
+def render_urlset(entries: list[dict], site_url: str) -> str:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{SITEMAP_XMLNS}">']
+    for entry in entries:
+        lines.append('  <url>')
+        lines.append(f"    <loc>{escape(site_url + entry['path'])}</loc>")
+        if entry['lastmod']:
+            lines.append(f"    <lastmod>{entry['lastmod']}</lastmod>")
+        lines.append('  </url>')
+    lines.append('</urlset>')
+    return '\n'.join(lines) + '\n'
+
+
+def render_index(shards: list[dict]) -> str:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{SITEMAP_XMLNS}">']
+    for shard in shards:
+        lines.append('  <sitemap>')
+        lines.append(f"    <loc>{escape(shard['sitemap'])}</loc>")
+        if shard['lastmod']:
+            lines.append(f"    <lastmod>{shard['lastmod']}</lastmod>")
+        lines.append('  </sitemap>')
+    lines.append('</sitemapindex>')
+    return '\n'.join(lines) + '\n'
+
+
+def load_manifest(root: Path | None = None) -> dict:
+    path = (root or _root()) / MANIFEST_FILE
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def build_sitemaps(force: bool = False) -> dict:
+    """
+    Bring the sitemap files up to date. Returns
+    {'rebuilt': [...], 'removed': [...], 'unchanged': n}.
+    """
+    root = _root()
+    root.mkdir(parents=True, exist_ok=True)
+    shard_size = _shard_size()
+    site_url = _site_url()
+    public_url = _public_url()
+
+    previous = load_manifest(root)
+    if previous.get('shard_size') != shard_size or previous.get('site_url') != site_url:
+        force = True
+    known = {(item['kind'], item['index']): item for item in previous.get('shards', [])}
+
+    shards, rebuilt = [], []
+    for source in get_sources():
+        for index, state in shard_fingerprints(source, shard_size).items():
+            name = f'{source.kind}-{index}'
+            shard = {
+                'kind': source.kind,
+                'index': index,
+                'count': state['count'],
+                'lastmod': state['lastmod'],
+                'fingerprint': state['fingerprint'],
+                'sitemap': f'{public_url}{name}.xml',
+                'manifest': f'{public_url}{name}.json',
+            }
+            shards.append(shard)
+            old = known.get((source.kind, index))
+            if not force and old and old.get('fingerprint') == state['fingerprint']:
+                continue
+            entries = _shard_entries(source, index, shard_size)
+            _write_atomic(root / f'{name}.xml', render_urlset(entries, site_url))
+            _write_atomic(root / f'{name}.json', json.dumps(entries, ensure_ascii=False))
+            rebuilt.append(name)
+
+    current = {(shard['kind'], shard['index']) for shard in shards}
+    removed = []
+    for kind, index in known:
+        if (kind, index) in current:
+            continue
+        name = f'{kind}-{index}'
+        for suffix in ('.xml', '.json'):
+            (root / f'{name}{suffix}').unlink(missing_ok=True)
+        removed.append(name)
+
+    if rebuilt or removed or not (root / MANIFEST_FILE).exists():
+        _write_atomic(root / INDEX_FILE, render_index(shards))
+        _write_atomic(root / MANIFEST_FILE, json.dumps({
+            'generated_at': timezone.now().isoformat(),
+            'site_url': site_url,
+            'shard_size': shard_size,
+            'sitemap_index': f'{public_url}{INDEX_FILE}',
+            'shards': shards,
+        }, ensure_ascii=False, indent=2))
+
+    return {'rebuilt': rebuilt, 'removed': removed, 'unchanged': len(shards) - len(rebuilt)}
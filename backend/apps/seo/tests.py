@@ -1,7 +1,17 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.cache import cache
 from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from apps.news.models import News
 
 from .models import SeoPage
 from .serializers import SeoPageSerializer
+from .sitemap_builder import build_sitemaps, load_manifest
 
 
 @override_settings(MEDIA_URL='/media/')
@@ -68,3 +78,105 @@ class SeoPageSerializerTest(TestCase):
         self.assertEqual(updated.best_offers_title, 'Лучшие предложения — Новый H1')
         self.assertEqual(updated.application_form_title, 'Оставьте заявку — Новый H1')
         self.assertEqual(updated.application_button_text, 'Оставить заявку')
+
+
+class PublicSeoPageCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.page = SeoPage.objects.create(slug='kredity', h1_title='Кредиты')
+        # Legacy row saved with a leading slash before slugs were normalized
+        SeoPage.objects.create(slug='/garantii', h1_title='Гарантии')
+
+    def test_legacy_slug_and_etag_revalidation(self):
+        response = self.client.get('/api/seo/pages/garantii/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['h1_title'], 'Гарантии')
+
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/seo/pages/garantii/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+    def test_snapshot_invalidated_on_save(self):
+        etag = self.client.get('/api/seo/pages/kredity/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.h1_title = 'Кредиты для бизнеса'
+            self.page.save()
+        response = self.client.get('/api/seo/pages/kredity/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_unknown_slug_is_404(self):
+        self.assertEqual(self.client.get('/api/seo/pages/missing/').status_code, 404)
+
+
+class SitemapBuilderTest(TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.settings_override = override_settings(
+            SITEMAP_ROOT=str(self.root), SITEMAP_SITE_URL='https://example.test', SITEMAP_SHARD_SIZE=1000,
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.page = SeoPage.objects.create(slug='/kredity', is_published=True)
+        SeoPage.objects.create(slug='draft', is_published=False)
+        News.objects.create(title='Новость', slug='novost', content='Текст')
+
+    def test_news_left_out_without_detail_route(self):
+        with override_settings(SITEMAP_NEWS_PATH=''):
+            self.assertEqual(build_sitemaps()['rebuilt'], ['seo-0'])
+            self.assertFalse((self.root / 'news-0.xml').exists())
+
+    @override_settings(SITEMAP_NEWS_PATH='/novosti/{slug}')
+    def test_writes_shards_and_rebuilds_only_changed(self):
+        stats = build_sitemaps()
+        self.assertEqual(sorted(stats['rebuilt']), ['news-0', 'seo-0'])
+        xml = (self.root / 'seo-0.xml').read_text(encoding='utf-8')
+        self.assertIn('<loc>https://example.test/kredity</loc>', xml)
+        self.assertNotIn('draft', xml)
+        entries = json.loads((self.root / 'news-0.json').read_text(encoding='utf-8'))
+        self.assertEqual(entries[0]['path'], '/novosti/novost')
+        self.assertEqual(len(load_manifest(self.root)['shards']), 2)
+
+        self.assertEqual(build_sitemaps()['rebuilt'], [])
+
+        self.page.h1_title = 'Кредиты'
+        self.page.save()
+        self.assertEqual(build_sitemaps()['rebuilt'], ['seo-0'])
+
+        self.page.delete()
+        stats = build_sitemaps()
+        self.assertEqual(stats['removed'], ['seo-0'])
+        self.assertFalse((self.root / 'seo-0.xml').exists())
+
+
+class SeoPageCountersTest(APITestCase):
+    def setUp(self):
+        from .counters import seo_page_leads, seo_page_views
+
+        cache.clear()
+        self.counters = (seo_page_views, seo_page_leads)
+        for counter in self.counters:
+            counter.flush()
+            # Hold the opportunistic flush lock so increments stay buffered
+            cache.add(f'counters:{counter.name}:flush-lock', 1, timeout=60)
+        self.page = SeoPage.objects.create(slug='kredity', h1_title='Кредиты')
+
+    def test_views_and_leads_are_buffered_per_page(self):
+        etag = self.client.get('/api/seo/pages/kredity/')['ETag']
+        self.client.get('/api/seo/pages/kredity/', HTTP_IF_NONE_MATCH=etag)
+        self.client.get('/api/seo/pages/missing/')
+        for page_url in ('https://lider-garant.ru/kredity/?utm_source=yandex', 'https://lider-garant.ru/contacts'):
+            response = self.client.post(
+                '/api/applications/leads/',
+                {'full_name': 'Иван Иванов', 'phone': '+79001234567', 'page_url': page_url},
+                format='json',
+            )
+            self.assertEqual(response.status_code, 201, response.data)
+        self.page.refresh_from_db()
+        self.assertEqual((self.page.views_count, self.page.leads_count), (0, 0))
+
+        self.assertEqual([counter.flush() for counter in self.counters], [1, 1])
+        self.page.refresh_from_db()
+        self.assertEqual((self.page.views_count, self.page.leads_count), (2, 1))
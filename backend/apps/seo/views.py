@@ -1,15 +1,24 @@
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
 
-from .models import SeoPage
+from .counters import seo_page_views
+from .models import SeoPage, normalize_slug
 from .serializers import SeoPageSerializer
 from .utils.templates import get_template
+from apps.core.caching import get_or_compute, request_key
+from apps.core.json_snapshots import build_json_snapshot, snapshot_response
+from apps.core.tables import AdminTableMixin
 from apps.users.permissions import IsSeoManagerOrAdmin
 
+# Shared cache namespace for public SEO reads; bumped on SeoPage/Bank changes (see apps.py)
+CACHE_NAMESPACE = 'seo'
+
 
-class SeoPageViewSet(viewsets.ModelViewSet):
+class SeoPageViewSet(AdminTableMixin, viewsets.ModelViewSet):
     """
     ViewSet для SEO страниц с поддержкой:
     - Получение по slug
@@ -26,7 +35,12 @@ class SeoPageViewSet(viewsets.ModelViewSet):
     serializer_class = SeoPageSerializer
     lookup_field = 'slug'
     lookup_value_regex = '.*'
-    pagination_class = None  # Disable pagination for admin dashboard simplicity
+    # Table protocol (search / ordering / cursor paging) for the admin list only
+    table_actions = ('admin_list',)
+    table_filter_fields = {'page_type': 'page_type', 'is_published': 'is_published'}
+    table_search_fields = ('slug', 'meta_title', 'h1_title')
+    table_ordering_fields = {'priority': 'priority', 'slug': 'slug', 'updated_at': 'updated_at'}
+    table_default_ordering = '-priority'
     
     def get_permissions(self):
         """
@@ -44,44 +58,41 @@ class SeoPageViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """
-        Improved queryset with proper 404 handling.
-        
-        For SEO managers and admins: show all pages (including drafts)
-        For public: show only published pages
-        
-        FIXED: Returns empty queryset for unknown slugs instead of fallback,
-        allowing proper 404 responses from retrieve().
+        SEO managers and admins see all pages (including drafts),
+        public users only published ones.
         """
-        # Check if user is authenticated and has SEO/admin access
-        user = self.request.user
-        if user.is_authenticated and (user.role in ['admin', 'seo'] or user.is_superuser):
-            # SEO managers and admins see all pages including drafts
+        if self._is_manager(self.request.user):
             base_queryset = SeoPage.objects.all()
         else:
-            # Public users see only published pages
             base_queryset = SeoPage.objects.filter(is_published=True)
-        
-        slug = self.kwargs.get('slug')
-        
-        if slug:
-            # Normalize slug and support legacy values saved with leading slash
-            clean_slug = str(slug).strip().strip('/')
-            slug_variants = [clean_slug]
-            if clean_slug:
-                slug_variants.append(f'/{clean_slug}')
-            
-            # Look for exact match only - no fallback to priority page
-            # This ensures proper 404 for unknown slugs
-            exact_match = base_queryset.filter(slug__in=slug_variants).first()
-            if exact_match:
-                return SeoPage.objects.filter(id=exact_match.id)
-            
-            # SECURITY FIX: Return empty queryset for unknown slugs
-            # This allows retrieve() to return proper 404 response
-            # instead of serving wrong content for incorrect URLs
-            return SeoPage.objects.none()
-        
         return base_queryset.order_by('-priority', 'slug')
+
+    def get_object(self):
+        """
+        Exact match on the normalized slug (legacy values saved with a leading
+        slash included) in one query; unknown slugs are a 404, never a
+        fallback to another page.
+        """
+        page = find_page(self.get_queryset(), self.kwargs.get(self.lookup_field))
+        if page is None:
+            raise Http404
+        self.check_object_permissions(self.request, page)
+        return page
+
+    @staticmethod
+    def _is_manager(user):
+        """SEO managers and admins see drafts, so their reads bypass the shared cache."""
+        return user.is_authenticated and (user.role in ['admin', 'seo'] or user.is_superuser)
+
+    def list(self, request, *args, **kwargs):
+        if self._is_manager(request.user):
+            return super().list(request, *args, **kwargs)
+        data = get_or_compute(
+            CACHE_NAMESPACE,
+            request_key(request),
+            lambda: super(SeoPageViewSet, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
     
     @action(detail=False, methods=['get'])
     def by_type(self, request):
@@ -93,9 +104,11 @@ class SeoPageViewSet(viewsets.ModelViewSet):
         """
         page_type = request.query_params.get('type')
         if page_type:
-            pages = self.queryset.filter(page_type=page_type)
-            serializer = self.get_serializer(pages, many=True)
-            return Response(serializer.data)
+            def compute():
+                pages = self.queryset.filter(page_type=page_type)
+                return self.get_serializer(pages, many=True).data
+
+            return Response(get_or_compute(CACHE_NAMESPACE, f'by_type:{page_type}', compute))
         
         return Response(
             {'error': 'Параметр type обязателен'},
@@ -130,7 +143,10 @@ class SeoPageViewSet(viewsets.ModelViewSet):
 
         Unlike public list(), this endpoint includes drafts and unpublished pages.
         """
-        pages = SeoPage.objects.all().order_by('-priority', 'slug')
+        pages = self.filter_queryset(SeoPage.objects.all().order_by('-priority', 'slug'))
+        page = self.paginate_queryset(pages)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
         serializer = self.get_serializer(pages, many=True)
         return Response(serializer.data)
 
@@ -171,17 +187,50 @@ class SeoPageViewSet(viewsets.ModelViewSet):
     
     def retrieve(self, request, *args, **kwargs):
         """
-        Override retrieve for proper 404 handling.
-        
-        FIXED: Returns 404 for unknown slugs instead of fallback to priority page.
-        This prevents serving wrong content for incorrect URLs and ensures
-        proper SEO (search engines won't index wrong URLs).
+        Public pages are served from a per-slug render-ready snapshot (shared
+        cache, invalidated on SeoPage/Bank changes) with a strong ETag;
+        managers always read fresh data, drafts included.
         """
-        try:
+        if self._is_manager(request.user):
             return super().retrieve(request, *args, **kwargs)
-        except Exception:
-            # Return proper 404 - no fallback to priority page
+
+        clean_slug = normalize_slug(kwargs.get(self.lookup_field))
+        snapshot = get_or_compute(
+            CACHE_NAMESPACE,
+            f'page:{clean_slug}',
+            lambda: self._page_snapshot(clean_slug),
+        )
+        if snapshot is None:
+            # Misses are cached too; proper 404, no fallback to priority page
             return Response(
                 {'error': 'Страница не найдена', 'detail': 'Page not found'},
                 status=404
             )
+        if snapshot.get('page_id') is not None:
+            # Buffered increment: applied in bulk by the counter flusher
+            seo_page_views.incr(snapshot['page_id'])
+        max_age = int(getattr(settings, 'SEO_PAGE_MAX_AGE_SECONDS', 0))
+        return snapshot_response(
+            request, snapshot, cache_control=f'public, max-age={max_age}, must-revalidate'
+        )
+
+    def _page_snapshot(self, clean_slug):
+        page = find_page(SeoPage.objects.filter(is_published=True), clean_slug)
+        if page is None:
+            return None
+        snapshot = build_json_snapshot(self.get_serializer(page).data)
+        snapshot['page_id'] = page.pk
+        return snapshot
+
+
+def find_page(queryset, slug):
+    """Highest-priority page whose normalized slug matches, with banks prefetched."""
+    clean_slug = normalize_slug(slug)
+    if not clean_slug:
+        return None
+    return (
+        queryset.filter(lookup_slug=clean_slug)
+        .order_by('-priority', 'slug')
+        .prefetch_related('banks')
+        .first()
+    )
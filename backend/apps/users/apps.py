@@ -5,3 +5,7 @@ class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
     verbose_name = 'Users & Authentication'
+
+    def ready(self):
+        """Import signals to connect them when Django starts."""
+        import apps.users.signals  # noqa: F401
@@ -0,0 +1,133 @@
+"""
+JWT authentication with a cached user principal.
+
+The access token supplies the user id; the fields almost every request needs
+(role, is_active, accreditation status, ...) come from a short-TTL entry in
+the shared cache keyed by user id, so most requests do not read the users
+table. Token claims such as role are not trusted on their own because they
+stay stale for the token lifetime.
+
+The principal is a real User instance with the remaining columns deferred:
+FK assignment and ORM filters work as before, and touching any other field
+loads the full row once (User.refresh_from_db). Cache entries are dropped on
+every User save/delete (profile update, blocking, password change), see
+apps.users.signals.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_FIELDS = (
+    'id', 'email', 'role', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser', 'accreditation_status', 'email_verified',
+)
+
+
+def _enabled() -> bool:
+    return getattr(settings, 'USER_PRINCIPAL_CACHE_ENABLED', True)
+
+
+def _cache_key(user_id) -> str:
+    return f'user-principal:{user_id}'
+
+
+def load_principal_state(user_id) -> dict | None:
+    """Principal fields for `user_id` from the shared cache (DB on miss); None if no such user."""
+    key = _cache_key(user_id)
+    try:
+        state = cache.get(key)
+    except Exception as exc:
+        logger.warning("User principal cache unavailable: %s", exc)
+        state, key = None, None
+    if state is not None:
+        return state
+
+    User = get_user_model()
+    state = User.objects.filter(pk=user_id).values(*PRINCIPAL_FIELDS).first()
+    if state is not None and key is not None:
+        try:
+            cache.set(key, state, timeout=int(getattr(settings, 'USER_PRINCIPAL_CACHE_SECONDS', 60)))
+        except Exception:
+            pass
+    return state
+
+
+def invalidate_user_principal(user_id) -> None:
+    try:
+        cache.delete(_cache_key(user_id))
+    except Exception as exc:
+        logger.warning("User principal %s: cache invalidation failed: %s", user_id, exc)
+
+
+def build_principal(state: dict):
+    """User instance holding only the principal fields; the rest stay deferred."""
+    User = get_user_model()
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in state]
+    user = User.from_db(DEFAULT_DB_ALIAS, names, [state[name] for name in names])
+    user._principal = True
+    return user
+
+
+def principal_for_user_id(user_id):
+    """Active principal for `user_id`, or None if the user is missing or blocked."""
+    state = load_principal_state(user_id)
+    if state is None or not state['is_active']:
+        return None
+    return build_principal(state)
+
+
+def get_user_for_access_token(raw_token: str | None):
+    """Principal for a raw access token (WebSocket query string), or None."""
+    if not raw_token:
+        return None
+    try:
+        token = AccessToken(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return None
+    if not _enabled():
+        return get_user_model().objects.filter(pk=user_id, is_active=True).first()
+    return principal_for_user_id(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication returning a cached principal instead of loading the User row."""
+
+    def get_user(self, validated_token):
+        if not _enabled() or api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares the password hash, which needs the full row
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        state = load_principal_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not state['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return build_principal(state)
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """OpenAPI: same bearer scheme as the stock simplejwt authenticator."""
+    target_class = 'apps.users.authentication.CachedJWTAuthentication'
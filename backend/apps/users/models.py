@@ -203,10 +203,24 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ['-date_joined']
+        indexes = [
+            models.Index(fields=['date_joined', 'id'], name='user_date_joined_idx'),
+            models.Index(fields=['role', 'date_joined'], name='user_role_joined_idx'),
+            models.Index(fields=['role', 'id'], name='user_role_id_idx'),
+        ]
 
     def __str__(self):
         return self.email
 
+    def refresh_from_db(self, using=None, fields=None):
+        # Cached principals (apps.users.authentication) defer most columns:
+        # the first deferred access loads all of them in one query
+        if fields is not None and getattr(self, '_principal', False):
+            deferred = self.get_deferred_fields()
+            if deferred and set(fields) <= deferred:
+                fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields)
+
     def get_full_name(self):
         """Return the first_name plus the last_name, with a space in between."""
         full_name = f'{self.first_name} {self.last_name}'.strip()
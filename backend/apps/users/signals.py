@@ -0,0 +1,18 @@
+"""
+Drop cached user principals (apps.users.authentication) when a user changes.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user_principal
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_principal_on_user_change(sender, instance, **kwargs):
+    """Covers profile updates, blocking and password changes (all go through save())."""
+    invalidate_user_principal(instance.pk)
+    # Again after commit: a concurrent request may have re-cached the old row meanwhile
+    transaction.on_commit(lambda: invalidate_user_principal(instance.pk))
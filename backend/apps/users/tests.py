@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.authentication import CachedJWTAuthentication, get_user_for_access_token
+from apps.users.models import User, UserRole
+
+
+class CachedPrincipalTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='principal@example.com', password='x', role=UserRole.AGENT, first_name='Иван',
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.auth = CachedJWTAuthentication()
+
+    def test_cached_principal_needs_no_user_query(self):
+        self.auth.get_user(self.token)
+        with self.assertNumQueries(0):
+            principal = self.auth.get_user(self.token)
+            self.assertEqual((principal.pk, principal.role, principal.first_name), (self.user.pk, UserRole.AGENT, 'Иван'))
+        # Other columns load once, together
+        with self.assertNumQueries(1):
+            self.assertTrue(principal.check_password('x'))
+            self.assertIsNotNone(principal.date_joined)
+
+    def test_blocking_invalidates_cache(self):
+        self.auth.get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+        self.assertIsNone(get_user_for_access_token(str(self.token)))
+
+    def test_role_change_is_picked_up(self):
+        self.auth.get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = UserRole.PARTNER
+            self.user.save()
+        self.assertEqual(self.auth.get_user(self.token).role, UserRole.PARTNER)
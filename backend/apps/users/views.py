@@ -28,6 +28,7 @@ from .serializers import (
     AdminUserUpdateSerializer,
 )
 from .permissions import IsAdmin
+from apps.core.tables import AdminTableMixin
 from apps.notifications.email_service import send_reliable_email
 
 User = get_user_model()
@@ -460,14 +461,16 @@ class PartnerAcceptInviteView(APIView):
 
 
 @extend_schema(tags=['Admin - User Management'])
-class UserListView(generics.ListAPIView):
+class UserListView(AdminTableMixin, generics.ListAPIView):
     """
     List all users (Admin only).
     GET /api/auth/admin/users/
     """
     serializer_class = UserListSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
-    pagination_class = None  # Frontend expects full list without pagination
+    table_search_fields = ('email', 'first_name', 'last_name', 'phone')
+    table_ordering_fields = {'date_joined': 'date_joined', 'email': 'email', 'role': 'role'}
+    table_default_ordering = '-date_joined'
 
     def get_queryset(self):
         queryset = User.objects.all()
@@ -65,6 +65,7 @@ INSTALLED_APPS = [
     'djangorestframework_mcp',
     
     # Local apps
+    'apps.core',
     'apps.users',
     'apps.companies',
     'apps.documents',
@@ -190,7 +191,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -198,10 +199,17 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_RATES': {
+        'public_lead': os.getenv('PUBLIC_LEAD_THROTTLE_RATE', '30/min'),
+    },
 }
 
 
 # Simple JWT Configuration
+# Cached user principal for JWT requests (apps/users/authentication.py)
+USER_PRINCIPAL_CACHE_ENABLED = os.getenv('USER_PRINCIPAL_CACHE_ENABLED', 'True').lower() == 'true'
+USER_PRINCIPAL_CACHE_SECONDS = int(os.getenv('USER_PRINCIPAL_CACHE_SECONDS', '60'))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(
         minutes=int(os.getenv('ACCESS_TOKEN_LIFETIME_MINUTES', 60))
@@ -261,6 +269,65 @@ EMAIL_OUTBOX_RETRY_DELAYS_SECONDS = _parse_int_list(
     '30,120,300,900,1800,3600,7200,21600'
 ) or [30, 120, 300, 900, 1800, 3600, 7200, 21600]
 
+# Document previews (thumbnails + page counts, see process_document_previews)
+DOCUMENT_PREVIEW_BATCH_SIZE = int(os.getenv('DOCUMENT_PREVIEW_BATCH_SIZE', '20'))
+DOCUMENT_PREVIEW_WORKER_SLEEP_SECONDS = int(os.getenv('DOCUMENT_PREVIEW_WORKER_SLEEP_SECONDS', '10'))
+DOCUMENT_PREVIEW_RENDER_TIMEOUT_SECONDS = int(os.getenv('DOCUMENT_PREVIEW_RENDER_TIMEOUT_SECONDS', '30'))
+# Documents claimed longer ago than this (crashed worker) are claimed again
+DOCUMENT_PREVIEW_CLAIM_TIMEOUT_SECONDS = int(os.getenv('DOCUMENT_PREVIEW_CLAIM_TIMEOUT_SECONDS', '600'))
+DOCUMENT_THUMBNAIL_MAX_SIZE = int(os.getenv('DOCUMENT_THUMBNAIL_MAX_SIZE', '320'))
+
+# Mirror company founders / accounts / licenses JSON into child tables on save
+# (see apps/companies/relations.py and backfill_company_relations)
+COMPANY_RELATIONS_SYNC_ENABLED = os.getenv('COMPANY_RELATIONS_SYNC_ENABLED', 'True').lower() == 'true'
+
+# Shared cache: per-process memory for development, Redis in production.
+# Used by cache_page, DRF throttling and apps.core.caching.get_or_compute.
+CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', '300'))
+CACHE_STALE_GRACE_SECONDS = int(os.getenv('CACHE_STALE_GRACE_SECONDS', '60'))
+CACHE_LOCK_TIMEOUT_SECONDS = int(os.getenv('CACHE_LOCK_TIMEOUT_SECONDS', '30'))
+CACHE_LOCK_WAIT_SECONDS = float(os.getenv('CACHE_LOCK_WAIT_SECONDS', '2'))
+CACHE_STATS_ENABLED = os.getenv('CACHE_STATS_ENABLED', 'True').lower() == 'true'
+# Hit/miss counts are summed per process and added to the shared counters this often
+CACHE_STATS_FLUSH_INTERVAL_SECONDS = float(os.getenv('CACHE_STATS_FLUSH_INTERVAL_SECONDS', '10'))
+# Browser max-age for /api/bank-conditions/all/ (0 = always revalidate via ETag)
+BANK_CONDITIONS_MAX_AGE_SECONDS = int(os.getenv('BANK_CONDITIONS_MAX_AGE_SECONDS', '0'))
+# Shared/browser max-age for public SEO page payloads (0 = always revalidate via ETag)
+SEO_PAGE_MAX_AGE_SECONDS = int(os.getenv('SEO_PAGE_MAX_AGE_SECONDS', '0'))
+
+# Static sitemaps / prerender manifest (apps/seo/sitemap_builder.py, build_sitemaps command)
+SITEMAP_ROOT = os.getenv('SITEMAP_ROOT', str(MEDIA_ROOT / 'sitemaps'))
+SITEMAP_SITE_URL = os.getenv('SITEMAP_SITE_URL', 'https://lider-garant.ru')
+SITEMAP_PUBLIC_URL = os.getenv('SITEMAP_PUBLIC_URL', '')  # default: <SITEMAP_SITE_URL>/sitemaps/
+SITEMAP_SHARD_SIZE = int(os.getenv('SITEMAP_SHARD_SIZE', '50000'))
+# Public news detail path, e.g. '/novosti/{slug}'; empty = news left out of the sitemap
+SITEMAP_NEWS_PATH = os.getenv('SITEMAP_NEWS_PATH', '')
+SITEMAP_WORKER_SLEEP_SECONDS = int(os.getenv('SITEMAP_WORKER_SLEEP_SECONDS', '60'))
+
+# Admin table protocol (apps/core/tables.py): keep returning full lists to
+# clients that send no limit/cursor; exact counts stop at the limit below
+ADMIN_TABLE_LEGACY_FULL_LIST = os.getenv('ADMIN_TABLE_LEGACY_FULL_LIST', 'True').lower() == 'true'
+ADMIN_TABLE_COUNT_LIMIT = int(os.getenv('ADMIN_TABLE_COUNT_LIMIT', '10000'))
+
+# Buffered counters (apps.core.counters): news views etc. are accumulated in
+# Redis (or in-process) and applied in bulk by the flush_counters command.
+COUNTER_BUFFER_ENABLED = os.getenv('COUNTER_BUFFER_ENABLED', 'True').lower() == 'true'
+COUNTER_BUFFER_BACKEND = os.getenv('COUNTER_BUFFER_BACKEND', 'auto')  # auto | redis | local
+COUNTER_FLUSH_INTERVAL_SECONDS = int(os.getenv('COUNTER_FLUSH_INTERVAL_SECONDS', '10'))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',  # Development only
+        'LOCATION': 'lider-default',
+        'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+    }
+}
+
+# Process-local snapshots (dictionaries, bank matching index, ...):
+# how often workers check the shared version for changes
+REFERENCE_CACHE_CHECK_INTERVAL_SECONDS = float(os.getenv('REFERENCE_CACHE_CHECK_INTERVAL_SECONDS', '5'))
+SNAPSHOT_CHECK_INTERVAL_SECONDS = float(os.getenv('SNAPSHOT_CHECK_INTERVAL_SECONDS', '5'))
+
 
 # Django Channels (WebSocket)
 CHANNEL_LAYERS = {
@@ -269,6 +336,22 @@ CHANNEL_LAYERS = {
     }
 }
 
+# Chat consumer: messages from one connection arriving within the window are
+# inserted and broadcast as one batch (0 = write every message immediately)
+CHAT_MESSAGE_BATCH_WINDOW_MS = int(os.getenv('CHAT_MESSAGE_BATCH_WINDOW_MS', '20'))
+CHAT_MESSAGE_BATCH_MAX_SIZE = int(os.getenv('CHAT_MESSAGE_BATCH_MAX_SIZE', '50'))
+# Ephemeral events (typing, presence): at most one group_send per kind per
+# connection per interval, latest state wins, retried after sends in progress
+CHAT_EPHEMERAL_MIN_INTERVAL_MS = int(os.getenv('CHAT_EPHEMERAL_MIN_INTERVAL_MS', '1000'))
+# Presence registry (apps.chat.presence): connections refresh every HEARTBEAT
+# seconds and expire after TTL; chat notifications skip users online in the room
+CHAT_PRESENCE_ENABLED = os.getenv('CHAT_PRESENCE_ENABLED', 'True').lower() == 'true'
+CHAT_PRESENCE_TTL_SECONDS = int(os.getenv('CHAT_PRESENCE_TTL_SECONDS', '60'))
+CHAT_PRESENCE_HEARTBEAT_SECONDS = int(os.getenv('CHAT_PRESENCE_HEARTBEAT_SECONDS', '20'))
+# Chat history API (messages/history/): default page and cap (also the since gap limit)
+CHAT_HISTORY_PAGE_SIZE = int(os.getenv('CHAT_HISTORY_PAGE_SIZE', '50'))
+CHAT_HISTORY_MAX_PAGE_SIZE = int(os.getenv('CHAT_HISTORY_MAX_PAGE_SIZE', '200'))
+
 
 # DRF Spectacular (OpenAPI/Swagger)
 SPECTACULAR_SETTINGS = {
@@ -132,6 +132,21 @@ CHANNEL_LAYERS = {
     }
 }
 
+# =============================================================================
+# CACHE - REDIS IN PRODUCTION (shared by all gunicorn workers)
+# =============================================================================
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': (
+            f"redis://{os.getenv('REDIS_HOST', 'redis')}:{os.getenv('REDIS_PORT', '6379')}"
+            f"/{os.getenv('REDIS_CACHE_DB', '1')}"
+        ),
+        'KEY_PREFIX': 'lider',
+        'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+    }
+}
+
 # =============================================================================
 # STATIC FILES - USE WHITENOISE FOR PRODUCTION
 # =============================================================================
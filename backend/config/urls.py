@@ -34,6 +34,7 @@ urlpatterns = [
     path('api/bank-conditions/', include('apps.bank_conditions.urls')),
     path('api/seo/', include('apps.seo.urls')),
     path('api/notifications/', include('apps.notifications.urls')),
+    path('api/core/', include('apps.core.urls')),
 ]
 
 
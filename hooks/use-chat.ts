@@ -244,6 +244,20 @@ export interface MessageListItem {
     created_at: string;
 }
 
+// Compact history response (/chat/history/): sender details come once in `senders`
+interface ChatHistoryResponse {
+    messages: {
+        id: number;
+        sender_id: number | null;
+        content: string;
+        file_url: string | null;
+        is_read: boolean;
+        created_at: string;
+    }[];
+    senders: Record<string, { email: string; name: string; role: string }>;
+    has_more: boolean;
+}
+
 interface LegacyChatMessage {
     id: number;
     sender: {
@@ -292,13 +306,54 @@ export function useChat(applicationId: number | null) {
     const [error, setError] = useState<string | null>(null);
     const [isConnected, setIsConnected] = useState(false);
     const [typingUsers, setTypingUsers] = useState<string[]>([]);
+    const [hasMoreHistory, setHasMoreHistory] = useState(false);
+    const [isLoadingOlder, setIsLoadingOlder] = useState(false);
 
     const wsRef = useRef<WebSocket | null>(null);
     const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null);
     const typingTimeoutRef = useRef<NodeJS.Timeout | null>(null);
     const reconnectAttemptsRef = useRef(0);
 
-    // Load message history via REST
+    const lastMessageIdRef = useRef<number>(0);
+
+    // One page of /chat/history/; `hasMore` tells whether older (or, with since=, newer) messages remain
+    const fetchHistory = useCallback(async (
+        params: Record<string, string>,
+    ): Promise<{ messages: LegacyChatMessage[]; hasMore: boolean }> => {
+        const response = await api.get<ChatHistoryResponse>('/chat/history/', {
+            application_id: String(applicationId),
+            ...params,
+        });
+        const messages = response.messages.map(msg => {
+            const sender = msg.sender_id !== null ? response.senders[String(msg.sender_id)] : undefined;
+            return {
+                id: msg.id,
+                sender: {
+                    id: msg.sender_id ?? 0,
+                    email: sender?.email ?? '',
+                    name: sender?.name ?? '',
+                    role: sender?.role ?? '',
+                },
+                text: msg.content,
+                attachment_url: msg.file_url ?? undefined,
+                is_read: msg.is_read,
+                created_at: msg.created_at,
+            };
+        });
+        return { messages, hasMore: response.has_more };
+    }, [applicationId]);
+
+    const appendMessages = useCallback((incoming: LegacyChatMessage[]) => {
+        if (incoming.length === 0) return;
+        // Pages come in chat order (created_at, id): the last one is the `since` cursor
+        lastMessageIdRef.current = incoming[incoming.length - 1].id;
+        setMessages(prev => {
+            const known = new Set(prev.map(msg => msg.id));
+            return [...prev, ...incoming.filter(msg => !known.has(msg.id))];
+        });
+    }, []);
+
+    // Load the latest page of message history via REST; older pages via loadOlder
     const loadHistory = useCallback(async () => {
         if (!applicationId) return;
 
@@ -306,31 +361,51 @@ export function useChat(applicationId: number | null) {
         setError(null);
 
         try {
-            const response = await api.get<MessageListItem[]>('/chat/by_application/', {
-                application_id: applicationId.toString(),
-            });
+            const page = await fetchHistory({});
+            lastMessageIdRef.current = page.messages.length > 0 ? page.messages[page.messages.length - 1].id : 0;
+            setMessages(page.messages);
+            setHasMoreHistory(page.hasMore);
+        } catch (err) {
+            const apiError = err as ApiError;
+            setError(apiError.message || 'Ошибка загрузки сообщений');
+        } finally {
+            setIsLoading(false);
+        }
+    }, [applicationId, fetchHistory]);
 
-            const chatMessages: LegacyChatMessage[] = response.map(msg => ({
-                id: msg.id,
-                sender: {
-                    id: 0,
-                    email: msg.sender_email,
-                    name: msg.sender_name,
-                    role: msg.sender_role,
-                },
-                text: msg.text,
-                is_read: msg.is_read,
-                created_at: msg.created_at,
-            }));
+    // Prepend the page before the oldest loaded message (scroll-up / "show earlier")
+    const loadOlder = useCallback(async () => {
+        if (!applicationId || !hasMoreHistory || isLoadingOlder || messages.length === 0) return;
 
-            setMessages(chatMessages);
+        setIsLoadingOlder(true);
+        try {
+            const page = await fetchHistory({ before: String(messages[0].id) });
+            setMessages(prev => {
+                const known = new Set(prev.map(msg => msg.id));
+                return [...page.messages.filter(msg => !known.has(msg.id)), ...prev];
+            });
+            setHasMoreHistory(page.hasMore);
         } catch (err) {
             const apiError = err as ApiError;
             setError(apiError.message || 'Ошибка загрузки сообщений');
         } finally {
-            setIsLoading(false);
+            setIsLoadingOlder(false);
         }
-    }, [applicationId]);
+    }, [applicationId, fetchHistory, hasMoreHistory, isLoadingOlder, messages]);
+
+    // After a reconnect fetch only the messages missed while disconnected
+    const loadGap = useCallback(async () => {
+        if (!applicationId || lastMessageIdRef.current === 0) return;
+        try {
+            let page: { messages: LegacyChatMessage[]; hasMore: boolean };
+            do {
+                page = await fetchHistory({ since: String(lastMessageIdRef.current) });
+                appendMessages(page.messages);
+            } while (page.hasMore && page.messages.length > 0);
+        } catch (_) {
+            // Next reconnect or manual refetch will retry
+        }
+    }, [applicationId, fetchHistory, appendMessages]);
 
     // Connect to WebSocket
     const connect = useCallback(() => {
@@ -353,9 +428,13 @@ export function useChat(applicationId: number | null) {
             wsRef.current = ws;
 
             ws.onopen = () => {
+                const isReconnect = reconnectAttemptsRef.current > 0;
                 reconnectAttemptsRef.current = 0;
                 setIsConnected(true);
                 setError(null);
+                if (isReconnect) {
+                    loadGap();
+                }
             };
 
             ws.onmessage = (event) => {
@@ -372,7 +451,7 @@ export function useChat(applicationId: number | null) {
                                     is_read: false,
                                     created_at: data.created_at,
                                 };
-                                setMessages(prev => [...prev, newMessage]);
+                                appendMessages([newMessage]);
                             }
                             break;
 
@@ -415,7 +494,7 @@ export function useChat(applicationId: number | null) {
         } catch (e) {
             setError('Не удалось подключиться к чату');
         }
-    }, [applicationId]);
+    }, [applicationId, loadGap, appendMessages]);
 
     const disconnect = useCallback(() => {
         if (reconnectTimeoutRef.current) {
@@ -486,6 +565,9 @@ export function useChat(applicationId: number | null) {
         error,
         isConnected,
         typingUsers,
+        hasMoreHistory,
+        isLoadingOlder,
+        loadOlder,
         sendMessage,
         sendTyping,
         markAsRead,
@@ -5,7 +5,54 @@ interface SeoPageSlug {
   updated_at?: string;
 }
 
+interface ManifestShard {
+  kind: string;
+  manifest: string;
+}
+
+interface ManifestEntry {
+  slug: string;
+  lastmod?: string | null;
+}
+
+// Static manifest written by `manage.py build_sitemaps` (see backend apps/seo/sitemap_builder.py)
+async function fetchSeoPagesFromManifest(): Promise<SeoPageSlug[] | null> {
+  const manifestUrl = process.env.SITEMAP_MANIFEST_URL;
+  if (!manifestUrl) {
+    return null;
+  }
+
+  try {
+    const response = await fetch(manifestUrl, { next: { revalidate: 3600 } });
+    if (!response.ok) {
+      return null;
+    }
+    const manifest = await response.json();
+    const shards: ManifestShard[] = (manifest?.shards || []).filter(
+      (shard: ManifestShard) => shard.kind === "seo"
+    );
+    const pages = await Promise.all(
+      shards.map(async (shard) => {
+        const shardResponse = await fetch(shard.manifest, { next: { revalidate: 3600 } });
+        if (!shardResponse.ok) {
+          throw new Error(`manifest shard ${shard.manifest}: ${shardResponse.status}`);
+        }
+        const entries: ManifestEntry[] = await shardResponse.json();
+        return entries.map((entry) => ({ slug: entry.slug, updated_at: entry.lastmod || undefined }));
+      })
+    );
+    return pages.flat();
+  } catch (error) {
+    return null;
+  }
+}
+
 async function fetchSeoPages(): Promise<SeoPageSlug[]> {
+  const fromManifest = await fetchSeoPagesFromManifest();
+  if (fromManifest) {
+    return fromManifest;
+  }
+
   const apiUrl = process.env.INTERNAL_API_URL || process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000/api";
   
   try {